@@ -0,0 +1,299 @@
+# Maquina virtual por lotes (vectorizada).
+# Ejecuta una sola fila de cuadruplos sobre N carriles a la vez: cada casilla
+# de memoria es un arreglo de NumPy con un valor por carril, la aritmetica y
+# las comparaciones se hacen sobre el arreglo completo y GOTOF divide los
+# carriles con mascaras. El costo crece con el numero de cuadruplos
+# ejecutados, no con cuadruplos x entradas.
+
+from typing import Any, BinaryIO, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from compiled_program import link_calls
+from input_reader import BufferedNumberReader
+from intermediate import NO_OPERAND, QuadStore
+from memory import SegmentLayout, memory_manager
+from tabla_symbolos import FunctionDirectory, VariableTable
+from VM_Patito import PatitoRuntimeError, read_number
+
+
+ARITH_OPS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.true_divide,
+    '>': np.greater,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '!=': np.not_equal,
+    '==': np.equal,
+}
+
+# Tipo de NumPy de los arreglos Patito (una fila por casilla, una columna por carril)
+ARRAY_DTYPES = {"entero": np.int64, "flotante": np.float64}
+
+
+class BatchVirtualMachine:
+    def __init__(
+        self,
+        quads: List[Tuple[Any, Any, Any, Any]],
+        const_table_map: Dict[Tuple[str, Any], int],
+        func_dir: FunctionDirectory,
+        lanes: int,
+        inputs: Dict[Any, Sequence[Any]] | None = None,
+        global_vars: VariableTable | None = None,
+        layout: SegmentLayout | None = None,
+        input_stream: BinaryIO | None = None,
+    ):
+        if lanes < 1:
+            raise ValueError("Se necesita al menos un carril")
+        self.quads = quads
+        # Parámetros y saltos de RETURN resueltos al cargar, como en la VM escalar (ver link_calls)
+        code = quads if isinstance(quads, QuadStore) else QuadStore.from_quads(quads)
+        self.links = link_calls(code, func_dir.all_functions())
+        self.layout = layout or memory_manager.layout
+        self.lanes = lanes
+        self.func_dir = func_dir
+        self.const_by_addr: Dict[int, Any] = {addr: val for (typ, val), addr in const_table_map.items()}
+        # Memoria global: direccion -> arreglo (o escalar si todos los carriles coinciden)
+        self.global_mem: Dict[int, Any] = {}
+        # Pila de marcos compartida; cada marco guarda arreglos por carril
+        self.frames: List[Dict[int, Any]] = [{}]
+        # Pila de llamadas: (return_ip, func_name)
+        self.call_stack: List[Tuple[int, str]] = []
+        # Marco de la llamada en preparación: ERA lo crea, PARAMETER escribe en él
+        self.next_frame: Dict[int, Any] = {}
+        # Registro de retorno por carril: RETURN lo escribe y el RETVAL tras el GOSUB lo lee
+        self.ret_value: Any = None
+        # Salida de cada carril, en orden
+        self.output: List[List[Any]] = [[] for _ in range(lanes)]
+        self._lane_ids = np.arange(lanes)
+        # Entrada de 'lee', compartida por todos los carriles
+        self.input_stream = input_stream
+        self._reader: BufferedNumberReader | None = None
+
+        for key, values in (inputs or {}).items():
+            addr = key
+            if isinstance(key, str):
+                info = global_vars.lookup(key) if global_vars is not None else None
+                if info is None:
+                    raise KeyError(f"Variable global '{key}' no declarada")
+                addr = info.address
+            column = np.asarray(values)
+            if column.shape != (lanes,):
+                raise ValueError(f"Se esperaban {lanes} valores para '{key}', se recibieron {column.shape}")
+            self.global_mem[addr] = column
+
+    def _which_mem(self, addr: int) -> Dict[int, Any]:
+        if addr >= self.layout.local_min:
+            return self.frames[-1]
+        return self.global_mem
+
+    def _get_val(self, operand: Any) -> Any:
+        if operand is None:
+            return None
+        if operand >= self.layout.const_min:
+            return self.const_by_addr[operand]
+        return self._which_mem(operand).get(operand, 0)
+
+    def _write(self, addr: int, value: Any, mask: np.ndarray, full: bool) -> None:
+        mem = self._which_mem(addr)
+        if full:
+            mem[addr] = value
+        else:
+            # Los carriles inactivos conservan su valor (0 si nunca se escribió)
+            mem[addr] = np.where(mask, value, mem.get(addr, 0))
+
+    def _emit_output(self, value: Any, mask: np.ndarray) -> None:
+        active = np.flatnonzero(mask)
+        if np.ndim(value) == 0:
+            item = value.item() if isinstance(value, np.generic) else value
+            for lane in active:
+                self.output[lane].append(item)
+        else:
+            for lane, item in zip(active, value[active].tolist()):
+                self.output[lane].append(item)
+
+    def run(self):
+        quads = self.quads
+        links = self.links
+        n_quads = len(quads)
+        lanes = self.lanes
+        # Grupos de carriles detenidos: (profundidad, ip) -> mascara
+        waiting: Dict[Tuple[int, int], np.ndarray] = {}
+        mask = np.ones(lanes, dtype=bool)
+        full = True
+        depth = 0
+        ip = 0
+
+        def reschedule(depth: int, ip: int, mask: np.ndarray):
+            # Se ejecuta primero el grupo más profundo y, dentro de él, el de menor ip,
+            # así los carriles vuelven a juntarse en el punto de reconvergencia.
+            key = (depth, ip)
+            prev = waiting.get(key)
+            waiting[key] = mask if prev is None else (prev | mask)
+            best = max(waiting, key=lambda k: (k[0], -k[1]))
+            return best[0], best[1], waiting.pop(best)
+
+        with np.errstate(all="ignore"):
+            while True:
+                if waiting:
+                    other = waiting.pop((depth, ip), None)
+                    if other is not None:
+                        mask = mask | other
+                        full = bool(mask.all())
+
+                if not 0 <= ip < n_quads or quads[ip][0] == 'END':
+                    # Este grupo terminó; seguir con el siguiente detenido
+                    if not waiting:
+                        break
+                    best = max(waiting, key=lambda k: (k[0], -k[1]))
+                    depth, ip = best
+                    mask = waiting.pop(best)
+                    full = bool(mask.all())
+                    continue
+
+                op, a1, a2, res = quads[ip]
+
+                if op in ARITH_OPS:
+                    v1 = self._get_val(a1)
+                    v2 = self._get_val(a2)
+                    if op == '/' and np.any(np.logical_and(np.equal(v2, 0), mask)):
+                        raise ZeroDivisionError("division entre cero")
+                    self._write(res, ARITH_OPS[op](v1, v2), mask, full)
+                    ip += 1
+
+                elif op == 'UMINUS':
+                    self._write(res, np.negative(self._get_val(a1)), mask, full)
+                    ip += 1
+
+                elif op == '=':
+                    self._write(res, self._get_val(a1), mask, full)
+                    ip += 1
+
+                elif op == 'PRINT':
+                    self._emit_output(self._get_val(a1), mask)
+                    ip += 1
+
+                elif op == 'READ':
+                    # Cada carril activo lee su propio valor, en orden de carril
+                    if self._reader is None:
+                        self._reader = BufferedNumberReader(self.input_stream)
+                    tipo = self.layout.type_of(res)
+                    column = np.zeros(lanes, dtype=ARRAY_DTYPES[tipo])
+                    for lane in np.flatnonzero(mask):
+                        column[lane] = read_number(self._reader, tipo)
+                    self._write(res, column, mask, full)
+                    ip += 1
+
+                elif op == 'ALLOC':
+                    dtype = ARRAY_DTYPES[self.layout.type_of(res)]
+                    self._which_mem(res)[res] = np.zeros((a1, lanes), dtype=dtype)
+                    ip += 1
+
+                elif op == 'VER':
+                    idx = np.broadcast_to(self._get_val(a1), (lanes,))
+                    bad = mask & ((idx < 0) | (idx >= res))
+                    if bad.any():
+                        lane = int(np.flatnonzero(bad)[0])
+                        raise PatitoRuntimeError(
+                            f"Indice {idx[lane]} fuera de rango (0..{res - 1}) en el carril {lane}"
+                        )
+                    ip += 1
+
+                elif op == 'LOADIDX':
+                    buf = self._which_mem(a1)[a1]
+                    # Los carriles inactivos leen la casilla 0 (su valor no se escribe)
+                    idx = np.where(mask, self._get_val(a2), 0)
+                    self._write(res, buf[idx, self._lane_ids], mask, full)
+                    ip += 1
+
+                elif op == 'STOREIDX':
+                    buf = self._which_mem(res)[res]
+                    idx = np.broadcast_to(self._get_val(a2), (lanes,))
+                    val = np.broadcast_to(self._get_val(a1), (lanes,))
+                    buf[idx[mask], self._lane_ids[mask]] = val[mask]
+                    ip += 1
+
+                elif op == 'GOTOF':
+                    cond = np.asarray(self._get_val(a1), dtype=bool)
+                    taken = mask & ~cond
+                    target = int(res) if res is not None else ip + 1
+                    if not taken.any():
+                        ip += 1
+                    elif not (mask & cond).any():
+                        ip = target
+                    else:
+                        # Divergencia: los carriles falsos esperan en el destino
+                        waiting[(depth, target)] = taken if (depth, target) not in waiting \
+                            else (waiting[(depth, target)] | taken)
+                        mask = mask & cond
+                        full = False
+                        ip += 1
+                    if waiting:
+                        depth, ip, mask = reschedule(depth, ip, mask)
+                        full = bool(mask.all())
+
+                elif op == 'GOTO':
+                    ip = int(res) if res is not None else ip + 1
+                    if waiting:
+                        depth, ip, mask = reschedule(depth, ip, mask)
+                        full = bool(mask.all())
+
+                elif op == 'ERA':
+                    self.next_frame = {}
+                    ip += 1
+
+                elif op == 'PARAMETER':
+                    paddr = links[ip]
+                    if paddr != NO_OPERAND:
+                        self.next_frame[paddr] = self._get_val(a1)
+                    ip += 1
+
+                elif op == 'GOSUB':
+                    func_name = a1 if isinstance(a1, str) else ''
+                    self.call_stack.append((ip + 1, func_name))
+                    self.frames.append(self.next_frame)
+                    self.next_frame = {}
+                    depth += 1
+                    ip = int(res) if res is not None else ip + 1
+
+                elif op == 'RETURN':
+                    if self.call_stack:
+                        # Los carriles de otro grupo conservan su valor hasta su propio RETVAL
+                        ret_val = self._get_val(a1)
+                        prev = self.ret_value
+                        self.ret_value = ret_val if full or prev is None else np.where(mask, ret_val, prev)
+                    ip = links[ip]
+                    if waiting:
+                        depth, ip, mask = reschedule(depth, ip, mask)
+                        full = bool(mask.all())
+
+                elif op == 'RETVAL':
+                    self._write(res, self.ret_value, mask, full)
+                    ip += 1
+
+                elif op == 'ENDFUNC':
+                    # Todos los carriles de la llamada ya llegaron aquí (menor ip primero)
+                    if self.call_stack:
+                        return_ip, _fname = self.call_stack.pop()
+                        if len(self.frames) > 1:
+                            self.frames.pop()
+                        depth -= 1
+                        ip = return_ip
+                    else:
+                        ip += 1
+
+                else:
+                    # Operador desconocido
+                    ip += 1
+
+        return {
+            # Escalares: un valor por carril; arreglos: (casillas, carriles)
+            "global": {
+                addr: val.copy() if np.ndim(val) == 2 else np.broadcast_to(val, (lanes,)).copy()
+                for addr, val in self.global_mem.items()
+            },
+            "output": self.output,
+        }
@@ -1,44 +1,184 @@
-from typing import Any, Dict, List, Tuple
+import operator
+import sys
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Sequence, Tuple
 
-from intermediate import quads as ir_quads, const_table
+from compiled_program import CompiledProgram
+from input_reader import BufferedNumberReader
+from intermediate import quads as ir_quads, const_table, NO_OPERAND, OPCODE_OF, QuadStore
+from memory import ARRAY_TYPECODES, SEGMENTS, SegmentLayout, memory_manager
 from tabla_symbolos import FunctionDirectory
+from tracing_jit import DEFAULT_THRESHOLD, TracingJit
+from vm_hooks import HookSet, Hooks
 
+if TYPE_CHECKING:
+    import threading
 
-# Rangos de memoria según memory.py
-GLOBAL_MIN = 10000
-LOCAL_MIN = 20000
-TEMP_MIN = 30000
-CONST_MIN = 40000
+    from sandbox import SandboxLimits
+
+
+# Opcodes numéricos (ver intermediate.OPCODES)
+OP_LAST_BINARY = OPCODE_OF['==']
+OP_UMINUS = OPCODE_OF['UMINUS']
+OP_ASSIGN = OPCODE_OF['=']
+OP_PRINT = OPCODE_OF['PRINT']
+OP_GOTOF = OPCODE_OF['GOTOF']
+OP_GOTO = OPCODE_OF['GOTO']
+OP_ERA = OPCODE_OF['ERA']
+OP_PARAMETER = OPCODE_OF['PARAMETER']
+OP_GOSUB = OPCODE_OF['GOSUB']
+OP_RETURN = OPCODE_OF['RETURN']
+OP_RETVAL = OPCODE_OF['RETVAL']
+OP_ENDFUNC = OPCODE_OF['ENDFUNC']
+OP_END = OPCODE_OF['END']
+OP_ALLOC = OPCODE_OF['ALLOC']
+OP_VER = OPCODE_OF['VER']
+OP_LOADIDX = OPCODE_OF['LOADIDX']
+OP_STOREIDX = OPCODE_OF['STOREIDX']
+OP_READ = OPCODE_OF['READ']
+# Superinstrucciones de pgo.py (comparación + GOTOF); son los últimos opcodes
+OP_FIRST_FUSED = OPCODE_OF['GOTOF>']
+
+# Operadores binarios indexados por opcode ('+' ... '==')
+BINARY_FUNCS = (
+    operator.add, operator.sub, operator.mul, operator.truediv,
+    operator.gt, operator.lt, operator.ge, operator.le, operator.ne, operator.eq,
+)
+# Comparación de cada superinstrucción, indexada por opcode igual que BINARY_FUNCS
+BRANCH_FUNCS = (None,) * OP_FIRST_FUSED + BINARY_FUNCS[OPCODE_OF['>']:]
+
+
+class PatitoRuntimeError(RuntimeError):
+    """Error al ejecutar el programa (p.ej. indice fuera de rango)."""
+
+    # Cuádruplo y línea del código donde ocurrió; los pone VirtualMachine.run
+    ip: int | None = None
+    line: int | None = None
+
+    def __str__(self) -> str:
+        text = super().__str__()
+        return f"{text} (linea {self.line})" if self.line else text
+
+
+class LimitExceeded(PatitoRuntimeError):
+    """El programa rebasó un límite del sandbox (ver sandbox.SandboxLimits)."""
+
+
+class StepLimitExceeded(LimitExceeded):
+    """El programa ejecutó más cuádruplos de los permitidos (max_steps)."""
+
+
+class DepthLimitExceeded(LimitExceeded):
+    """Demasiadas llamadas anidadas (max_depth)."""
+
+
+class MemoryLimitExceeded(LimitExceeded):
+    """Demasiada memoria reservada en marcos y arreglos (max_slots)."""
+
+
+class OutputLimitExceeded(LimitExceeded):
+    """El programa escribió más bytes de los permitidos (max_output_bytes)."""
+
+
+def read_number(reader: BufferedNumberReader, tipo: str) -> int | float:
+    # Lectura de 'lee'; los errores de la entrada se reportan como errores del programa
+    try:
+        return reader.read_number(tipo)
+    except EOFError:
+        raise PatitoRuntimeError("lee: ya no hay datos en la entrada") from None
+    except ValueError:
+        raise PatitoRuntimeError(f"lee: se esperaba un valor {tipo} en la entrada") from None
 
 
 class VirtualMachine:
     def __init__(
         self,
-        quads: List[Tuple[Any, Any, Any, Any]],
+        quads: QuadStore | List[Tuple[Any, Any, Any, Any]],
         const_table_map: Dict[Tuple[str, Any], int],
         func_dir: FunctionDirectory,
+        jit_threshold: int | None = DEFAULT_THRESHOLD,
+        layout: SegmentLayout | None = None,
+        input_stream: BinaryIO | None = None,
+        sample_interval_ms: float | None = None,
+        limits: "SandboxLimits | None" = None,
+        hooks: Sequence[Hooks] = (),
     ):
-        self.quads = quads
+        # Distribución de memoria con la que se compiló el programa
+        program = CompiledProgram.build(quads, const_table_map, func_dir, layout or memory_manager.layout)
+        self._start(program, jit_threshold, input_stream, sample_interval_ms, limits, hooks)
+
+    @classmethod
+    def from_program(
+        cls,
+        program: CompiledProgram,
+        jit_threshold: int | None = DEFAULT_THRESHOLD,
+        input_stream: BinaryIO | None = None,
+        sample_interval_ms: float | None = None,
+        limits: "SandboxLimits | None" = None,
+        hooks: Sequence[Hooks] = (),
+    ) -> "VirtualMachine":
+        # Para muchas corridas del mismo programa: no copia ni resuelve nada, solo crea la memoria
+        vm = cls.__new__(cls)
+        vm._start(program, jit_threshold, input_stream, sample_interval_ms, limits, hooks)
+        return vm
+
+    def _start(
+        self,
+        program: CompiledProgram,
+        jit_threshold: int | None,
+        input_stream: BinaryIO | None,
+        sample_interval_ms: float | None,
+        limits: "SandboxLimits | None" = None,
+        hooks: Sequence[Hooks] = (),
+    ) -> None:
+        # Lo del programa se comparte (solo lectura); lo demás es de esta corrida
+        self.program = program
+        self.quads = program.quads
+        self.layout = program.layout
+        # Copia propia en un dict: el ciclo la consulta en cada operando constante
+        # y es más rápida que el MappingProxyType del programa
+        self.const_by_addr: Dict[int, Any] = dict(program.const_by_addr)
+        # Datos de cada llamada resueltos al cargar (ver compiled_program.link_calls)
+        self.links = program.links
         self.ip = 0  # instruction pointer
         # Memoria global: direccion -> valor
         self.global_mem: Dict[int, Any] = {}
         # Pila de marcos (locals + temps)
         self.frames: List[Dict[int, Any]] = [{}]  # marco base
-        # Constantes: addr -> valor
-        self.const_by_addr: Dict[int, Any] = {addr: val for (typ, val), addr in const_table_map.items()}
         # Pila de llamadas: (return_ip, func_name)
         self.call_stack: List[Tuple[int, str]] = []
-        # Valores de retorno por función
-        self.return_values: Dict[str, Any] = {}
-        # Parámetros pendientes (se escriben al hacer GOSUB)
-        self.pending_params: List[Any] = []
-        # Directorio de funciones (para direcciones de parámetros)
-        self.func_dir = func_dir
+        # Límites del sandbox (None = sin límites)
+        self.limits = limits
+        # Ganchos para observar la corrida (ver vm_hooks.py); None = ninguno
+        self.hooks = HookSet(hooks) if hooks else None
+        # Con límites o con ganchos del ciclo se usa el ciclo instrumentado
+        # (_execute_checked), que cuenta pasos y no usa el JIT
+        self.checked = limits is not None or (self.hooks is not None and self.hooks.instrumented)
+        self.steps = 0
+        self.output_bytes = 0
+        # JIT de trazas para ciclos calientes (None = desactivado)
+        use_jit = jit_threshold and not self.checked
+        self.jit = TracingJit(self.quads, self.const_by_addr, self.layout, jit_threshold) if use_jit else None
+        # Entrada de 'lee' (stdin si no se indica); el lector se crea en la primera lectura
+        self.input_stream = input_stream
+        self._reader: BufferedNumberReader | None = None
+        # Telemetría de memoria: solo se actualiza en GOSUB/ENDFUNC, el resto del ciclo no paga nada
+        self.calls = 0
+        self.peak_depth = 0
+        self.peak_frames = 1
+        # Argumentos que recibió el marco de una llamada (lo que PARAMETER escribió antes del GOSUB)
+        self.peak_args = 0
+        # Marco más grande que se ha cerrado (se clasifica por segmento al final)
+        self._largest_frame: Dict[Any, Any] = {}
+        # Muestreo periódico desde otro hilo (None = desactivado)
+        self.sample_interval_ms = sample_interval_ms
+        self.samples: List[Dict[str, Any]] = []
 
     def _which_mem(self, addr: int) -> Dict[int, Any]:
-        if addr >= CONST_MIN:
+        if addr >= self.layout.const_min:
             return self.const_by_addr  # lectura únicamente
-        if addr >= LOCAL_MIN:
+        if addr >= self.layout.local_min:
             return self.frames[-1] if self.frames else {}
         return self.global_mem
 
@@ -51,9 +191,6 @@ class VirtualMachine:
             mem = self._which_mem(operand)
             return mem.get(operand, 0)
         if isinstance(operand, str):
-            # Slot simbólico de retorno
-            if operand in self.return_values:
-                return self.return_values[operand]
             # Si se usa como "address" simbólico en frame o global
             if self.frames and operand in self.frames[-1]:
                 return self.frames[-1].get(operand)
@@ -73,130 +210,592 @@ class VirtualMachine:
             if self.frames:
                 self.frames[-1][addr] = value
 
-    def _jump_to_endfunc(self) -> None:
-        # Busca el siguiente ENDFUNC y salta ahí
-        for i in range(self.ip + 1, len(self.quads)):
-            if self.quads[i][0] == "ENDFUNC":
-                self.ip = i
-                return
-        # Si no se encuentra, terminar
-        self.ip = len(self.quads)
+    def _read_value(self, addr: int) -> int | float:
+        if self._reader is None:
+            self._reader = BufferedNumberReader(self.input_stream)
+        return read_number(self._reader, self.layout.type_of(addr))
 
     def run(self):
-        while 0 <= self.ip < len(self.quads):
-            op, a1, a2, res = self.quads[self.ip]
-
-            if op in ('+', '-', '*', '/', '>', '<', '>=', '<=', '!=', '=='):
-                v1 = self._get_val(a1)
-                v2 = self._get_val(a2)
-                if op == '+':
-                    out = v1 + v2
-                elif op == '-':
-                    out = v1 - v2
-                elif op == '*':
-                    out = v1 * v2
-                elif op == '/':
-                    out = v1 / v2
-                elif op == '>':
-                    out = v1 > v2
-                elif op == '<':
-                    out = v1 < v2
-                elif op == '>=':
-                    out = v1 >= v2
-                elif op == '<=':
-                    out = v1 <= v2
-                elif op == '!=':
-                    out = v1 != v2
-                elif op == '==':
-                    out = v1 == v2
-                else:
-                    out = None
-                self._write(res, out)
-                self.ip += 1
-
-            elif op == 'UMINUS':
-                v1 = self._get_val(a1)
-                self._write(res, -v1)
-                self.ip += 1
-
-            elif op == '=':
-                v1 = self._get_val(a1)
-                self._write(res, v1)
-                self.ip += 1
-
-            elif op == 'PRINT':
-                v = self._get_val(a1)
-                print(v)
-                self.ip += 1
-
-            elif op == 'GOTOF':
-                cond = self._get_val(a1)
-                if not cond:
-                    self.ip = int(res) if res is not None else self.ip + 1
+        execute = self._execute_checked if self.checked else self._execute
+        hooks = self.hooks
+        if hooks is not None and hooks.on_start is not None:
+            hooks.on_start(self)
+        try:
+            if not self.sample_interval_ms:
+                execute()
+            else:
+                # El hilo de muestreo es opcional; threading no se carga al arrancar
+                import threading
+
+                stop = threading.Event()
+                sampler = threading.Thread(target=self._sample_loop, args=(stop,), daemon=True)
+                sampler.start()
+                try:
+                    execute()
+                finally:
+                    stop.set()
+                    sampler.join()
+        except BaseException as e:
+            # El ciclo deja en self.ip el cuádruplo que falló; la línea se
+            # busca solo aquí, sin costo mientras el programa corre bien
+            if isinstance(e, PatitoRuntimeError) and e.ip is None:
+                e.ip = self.ip
+                e.line = self.quads.lines.line_of(self.ip)
+            if hooks is not None and hooks.on_error is not None:
+                hooks.on_error(self, e)
+            raise
+        finally:
+            if hooks is not None and hooks.on_finish is not None:
+                hooks.on_finish(self)
+        return {
+            "global": dict(self.global_mem),
+            "top_frame": dict(self.frames[-1]) if self.frames else {},
+            "telemetry": self.telemetry(),
+        }
+
+    def _execute(self) -> None:
+        # Ciclo sin revisiones: no cuenta pasos, no revisa límites ni llama
+        # ganchos. run() lo usa cuando no hay límites ni ganchos del ciclo; si
+        # los hay usa _execute_checked. Un cambio a un cuádruplo va en los dos.
+        code = self.quads
+        ops, arg1, arg2, results = code.ops, code.arg1, code.arg2, code.res
+        n_quads = len(ops)
+        links, symbols = self.links, code.symbols
+        binary, branch = BINARY_FUNCS, BRANCH_FUNCS
+        # Los cuádruplos más frecuentes leen y escriben sin pasar por
+        # _get_val/_write: constante, marco actual o global según la dirección.
+        # 'frame' es el marco activo y solo cambia en GOSUB y ENDFUNC.
+        consts, glob, frames = self.const_by_addr, self.global_mem, self.frames
+        const_min, local_min = self.layout.const_min, self.layout.local_min
+        frame = frames[-1]
+        # El ip vive en una variable local; self.ip se actualiza en llamadas,
+        # regresos y saltos hacia atrás (lo lee el muestreo) y al terminar
+        ip = self.ip
+        call_stack = self.call_stack
+        # Marco de la llamada en preparación: ERA lo crea, PARAMETER escribe
+        # directo en las direcciones de los parámetros y GOSUB lo apila
+        next_frame: Dict[int, Any] = {}
+        # Registro de retorno: RETURN lo escribe y el RETVAL que sigue al GOSUB lo lee
+        ret_value = None
+        calls, peak_depth = self.calls, self.peak_depth
+        # Telemetría de las llamadas en locales; se guarda al terminar
+        peak_args, largest_slots = self.peak_args, len(self._largest_frame)
+        jit = self.jit
+        try:
+            while 0 <= ip < n_quads:
+                op = ops[ip]
+
+                if op <= OP_LAST_BINARY:
+                    a = arg1[ip]
+                    v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = arg2[ip]
+                    v2 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = results[ip]
+                    if a >= local_min:
+                        frame[a] = binary[op](v1, v2)
+                    else:
+                        glob[a] = binary[op](v1, v2)
+                    ip += 1
+
+                elif op == OP_ASSIGN:
+                    a = arg1[ip]
+                    v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = results[ip]
+                    if a >= local_min:
+                        frame[a] = v1
+                    else:
+                        glob[a] = v1
+                    ip += 1
+
+                elif op >= OP_FIRST_FUSED:
+                    # Comparación + GOTOF (ver pgo.py); hacia atrás es el regreso de un ciclo rotado
+                    a = arg1[ip]
+                    v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = arg2[ip]
+                    v2 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    if branch[op](v1, v2):
+                        ip += 1
+                    else:
+                        target = results[ip]
+                        if target < ip:
+                            self.ip = target
+                            if jit is not None:
+                                target = jit.back_edge(self, target)
+                        ip = target
+
+                elif op == OP_GOTOF:
+                    a = arg1[ip]
+                    cond = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    target = results[ip]
+                    ip = target if not cond and target != NO_OPERAND else ip + 1
+
+                elif op == OP_GOTO:
+                    target = results[ip]
+                    if target == NO_OPERAND:
+                        target = ip + 1
+                    if target < ip:
+                        self.ip = target
+                        if jit is not None:
+                            # Regreso de ciclo: el JIT decide si ejecuta una traza compilada
+                            target = jit.back_edge(self, target)
+                    ip = target
+
+                elif op == OP_ERA:
+                    # Marco nuevo para la función que se va a llamar
+                    next_frame = {}
+                    ip += 1
+
+                elif op == OP_PARAMETER:
+                    paddr = links[ip]
+                    if paddr != NO_OPERAND:
+                        a = arg1[ip]
+                        next_frame[paddr] = (consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min
+                                             else glob.get(a, 0))
+                    ip += 1
+
+                elif op == OP_GOSUB:
+                    # Guardar retorno y activar el marco que ya trae los parámetros
+                    call_stack.append((ip + 1, symbols[-2 - arg1[ip]]))
+                    frame = next_frame
+                    frames.append(frame)
+                    calls += 1
+                    if len(call_stack) > peak_depth:
+                        peak_depth = len(call_stack)
+                        self.peak_frames = max(self.peak_frames, len(frames))
+                    if len(frame) > peak_args:
+                        peak_args = len(frame)
+                    # Una función que termina sin 'return' no deja valor
+                    ret_value = None
+                    # Saltar a inicio de función
+                    target = results[ip]
+                    ip = self.ip = target if target != NO_OPERAND else ip + 1
+
+                elif op == OP_RETVAL:
+                    a = results[ip]
+                    if a >= local_min:
+                        frame[a] = ret_value
+                    else:
+                        glob[a] = ret_value
+                    ip += 1
+
+                elif op == OP_RETURN or op == OP_ENDFUNC:
+                    if op == OP_RETURN:
+                        a = arg1[ip]
+                        if a == NO_OPERAND:
+                            ret_value = None
+                        else:
+                            ret_value = (consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min
+                                         else glob.get(a, 0))
+                        if not call_stack:
+                            # Fuera de una llamada solo salta al ENDFUNC siguiente
+                            ip = links[ip]
+                            continue
+                    # RETURN regresa de una vez, sin despachar su ENDFUNC
+                    if call_stack:
+                        return_ip, _fname = call_stack.pop()
+                        if len(frames) > 1:
+                            # Al cerrarse, el marco tiene todas las direcciones que usó la llamada
+                            if len(frame) > largest_slots:
+                                largest_slots = len(frame)
+                                self._largest_frame = frame
+                            frames.pop()
+                            frame = frames[-1]
+                        ip = self.ip = return_ip
+                    else:
+                        ip += 1
+
+                elif op == OP_PRINT:
+                    print(self._get_val(arg1[ip]))
+                    ip += 1
+
+                elif op == OP_UMINUS:
+                    self._write(results[ip], -self._get_val(arg1[ip]))
+                    ip += 1
+
+                elif op == OP_LOADIDX:
+                    base = arg1[ip]
+                    buf = self._which_mem(base)[base]
+                    self._write(results[ip], buf[self._get_val(arg2[ip])])
+                    ip += 1
+
+                elif op == OP_STOREIDX:
+                    base = results[ip]
+                    buf = self._which_mem(base)[base]
+                    val = self._get_val(arg1[ip])
+                    buf[self._get_val(arg2[ip])] = val if buf.typecode == 'd' else int(val)
+                    ip += 1
+
+                elif op == OP_VER:
+                    idx = self._get_val(arg1[ip])
+                    size = results[ip]
+                    if not 0 <= idx < size:
+                        raise PatitoRuntimeError(f"Indice {idx} fuera de rango (0..{size - 1})")
+                    ip += 1
+
+                elif op == OP_ALLOC:
+                    # Un solo buffer tipado por arreglo, en ceros
+                    base = results[ip]
+                    typecode = ARRAY_TYPECODES[self.layout.type_of(base)]
+                    self._which_mem(base)[base] = array(typecode, bytes(8 * arg1[ip]))
+                    ip += 1
+
+                elif op == OP_READ:
+                    addr = results[ip]
+                    self._write(addr, self._read_value(addr))
+                    ip += 1
+
+                elif op == OP_END:
+                    break
+
                 else:
-                    self.ip += 1
-
-            elif op == 'GOTO':
-                self.ip = int(res) if res is not None else self.ip + 1
-
-            elif op == 'ERA':
-                # Preparar parámetros
-                self.pending_params = []
-                self.ip += 1
-
-            elif op == 'PARAMETER':
-                val = self._get_val(a1)
-                self.pending_params.append(val)
-                self.ip += 1
-
-            elif op == 'GOSUB':
-                func_name = a1 if isinstance(a1, str) else ''
-                # Guardar retorno
-                self.call_stack.append((self.ip + 1, func_name))
-                # Crear nuevo frame
-                self.frames.append({})
-                # Escribir parámetros según direcciones de la firma
-                finfo = self.func_dir.get_function(func_name)
-                if finfo:
-                    for idx, val in enumerate(self.pending_params):
-                        if idx < len(finfo.parameters):
-                            _pname, _ptype, paddr = finfo.parameters[idx]
-                            self._write(paddr, val)
-                self.pending_params = []
-                # Saltar a inicio de función
-                self.ip = int(res) if res is not None else self.ip + 1
-
-            elif op == 'RETURN':
-                ret_val = self._get_val(a1)
-                func_name = self.call_stack[-1][1] if self.call_stack else ''
-                if func_name:
-                    self.return_values[func_name] = ret_val
-                # Saltar al ENDFUNC siguiente
-                self._jump_to_endfunc()
-
-            elif op == 'RETVAL':
-                func_name = a1 if isinstance(a1, str) else ''
-                val = self.return_values.get(func_name)
-                self._write(res, val)
-                self.ip += 1
-
-            elif op == 'ENDFUNC':
-                if self.call_stack:
-                    return_ip, _fname = self.call_stack.pop()
-                    if len(self.frames) > 1:
-                        self.frames.pop()
-                    self.ip = return_ip
+                    # Operador desconocido
+                    ip += 1
+        finally:
+            self.ip = ip
+            self.calls, self.peak_depth, self.peak_args = calls, peak_depth, peak_args
+
+    def _execute_checked(self) -> None:
+        # Igual que _execute, pero cuenta pasos, revisa los límites del sandbox
+        # (ver sandbox.py) y llama a los ganchos (ver vm_hooks.py). Es otra
+        # copia del ciclo para que las corridas sin límites ni ganchos no paguen
+        # las revisiones; no usa el JIT (las trazas no cuentan pasos ni avisan).
+        code = self.quads
+        ops, arg1, arg2, results = code.ops, code.arg1, code.arg2, code.res
+        n_quads = len(ops)
+        links, symbols = self.links, code.symbols
+        binary, branch = BINARY_FUNCS, BRANCH_FUNCS
+        # Los cuádruplos más frecuentes leen y escriben sin pasar por
+        # _get_val/_write: constante, marco actual o global según la dirección.
+        # 'frame' es el marco activo y solo cambia en GOSUB y ENDFUNC.
+        consts, glob, frames = self.const_by_addr, self.global_mem, self.frames
+        const_min, local_min = self.layout.const_min, self.layout.local_min
+        frame = frames[-1]
+        # El ip vive en una variable local; self.ip se actualiza en llamadas,
+        # regresos y saltos hacia atrás (lo lee el muestreo) y al terminar
+        ip = self.ip
+        call_stack = self.call_stack
+        # Marco de la llamada en preparación: ERA lo crea, PARAMETER escribe
+        # directo en las direcciones de los parámetros y GOSUB lo apila
+        next_frame: Dict[int, Any] = {}
+        # Registro de retorno: RETURN lo escribe y el RETVAL que sigue al GOSUB lo lee
+        ret_value = None
+        calls, peak_depth = self.calls, self.peak_depth
+        # Telemetría de las llamadas en locales; se guarda al terminar
+        peak_args, largest_slots = self.peak_args, len(self._largest_frame)
+        # Un límite en None nunca se alcanza
+        limits = self.limits
+        unlimited = sys.maxsize
+        max_steps = max_depth = max_slots = max_output = unlimited
+        if limits is not None:
+            max_steps = limits.max_steps if limits.max_steps is not None else unlimited
+            max_depth = limits.max_depth if limits.max_depth is not None else unlimited
+            max_slots = limits.max_slots if limits.max_slots is not None else unlimited
+            max_output = limits.max_output_bytes if limits.max_output_bytes is not None else unlimited
+        steps, output_bytes = self.steps, self.output_bytes
+        # Ganchos (None = no se llama); on_quad se revisa junto con el límite
+        # de pasos, así el ciclo sigue haciendo una sola comparación por cuádruplo
+        hooks = self.hooks
+        on_quad = on_call = on_return = on_print = on_write = None
+        every = unlimited
+        if hooks is not None:
+            on_quad, on_call, on_return = hooks.on_quad, hooks.on_call, hooks.on_return
+            on_print, on_write = hooks.on_print, hooks.on_memory_write
+            if on_quad is not None:
+                every = hooks.quad_every
+        # Próximo paso en que hay algo que revisar: el límite o el siguiente on_quad
+        next_check = min(max_steps, steps + every - 1)
+        # Memoria reservada: locales y temporales de cada llamada activa (según
+        # el directorio de funciones) más los elementos de arreglos. 'reserved'
+        # tiene lo de cada llamada activa para devolverlo en ENDFUNC.
+        frame_sizes = {
+            name: sum(info.locals_size.values()) + sum(info.temps_size.values())
+            for name, info in self.program.functions.items()
+        }
+        live_slots = 0
+        reserved: List[int] = []
+        try:
+            while 0 <= ip < n_quads:
+                if steps >= next_check:
+                    if steps >= max_steps:
+                        raise StepLimitExceeded(f"Se alcanzo el limite de {max_steps} cuadruplos ejecutados")
+                    on_quad(self, ip)
+                    next_check = min(max_steps, steps + every)
+                steps += 1
+                op = ops[ip]
+
+                if op <= OP_LAST_BINARY:
+                    a = arg1[ip]
+                    v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = arg2[ip]
+                    v2 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = results[ip]
+                    v = binary[op](v1, v2)
+                    if a >= local_min:
+                        frame[a] = v
+                    else:
+                        glob[a] = v
+                    if on_write is not None:
+                        on_write(self, a, v)
+                    ip += 1
+
+                elif op == OP_ASSIGN:
+                    a = arg1[ip]
+                    v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = results[ip]
+                    if a >= local_min:
+                        frame[a] = v1
+                    else:
+                        glob[a] = v1
+                    if on_write is not None:
+                        on_write(self, a, v1)
+                    ip += 1
+
+                elif op >= OP_FIRST_FUSED:
+                    a = arg1[ip]
+                    v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    a = arg2[ip]
+                    v2 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    if branch[op](v1, v2):
+                        ip += 1
+                    else:
+                        target = results[ip]
+                        if target < ip:
+                            self.ip = target
+                        ip = target
+
+                elif op == OP_GOTOF:
+                    a = arg1[ip]
+                    cond = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                    target = results[ip]
+                    ip = target if not cond and target != NO_OPERAND else ip + 1
+
+                elif op == OP_GOTO:
+                    target = results[ip]
+                    if target == NO_OPERAND:
+                        target = ip + 1
+                    if target < ip:
+                        self.ip = target
+                    ip = target
+
+                elif op == OP_ERA:
+                    # Marco nuevo para la función que se va a llamar
+                    next_frame = {}
+                    ip += 1
+
+                elif op == OP_PARAMETER:
+                    paddr = links[ip]
+                    if paddr != NO_OPERAND:
+                        a = arg1[ip]
+                        v1 = consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min else glob.get(a, 0)
+                        next_frame[paddr] = v1
+                        if on_write is not None:
+                            on_write(self, paddr, v1)
+                    ip += 1
+
+                elif op == OP_GOSUB:
+                    fname = symbols[-2 - arg1[ip]]
+                    if len(call_stack) >= max_depth:
+                        raise DepthLimitExceeded(f"Se alcanzo el limite de {max_depth} llamadas anidadas ({fname})")
+                    size = frame_sizes.get(fname, 0)
+                    live_slots += size
+                    if live_slots > max_slots:
+                        raise MemoryLimitExceeded(f"Se alcanzo el limite de {max_slots} casillas de memoria")
+                    reserved.append(size)
+                    # Guardar retorno y activar el marco que ya trae los parámetros
+                    call_stack.append((ip + 1, fname))
+                    frame = next_frame
+                    frames.append(frame)
+                    calls += 1
+                    if len(call_stack) > peak_depth:
+                        peak_depth = len(call_stack)
+                        self.peak_frames = max(self.peak_frames, len(frames))
+                    if len(frame) > peak_args:
+                        peak_args = len(frame)
+                    # Una función que termina sin 'return' no deja valor
+                    ret_value = None
+                    if on_call is not None:
+                        on_call(self, fname, ip)
+                    # Saltar a inicio de función
+                    target = results[ip]
+                    ip = self.ip = target if target != NO_OPERAND else ip + 1
+
+                elif op == OP_RETVAL:
+                    a = results[ip]
+                    if a >= local_min:
+                        frame[a] = ret_value
+                    else:
+                        glob[a] = ret_value
+                    if on_write is not None:
+                        on_write(self, a, ret_value)
+                    ip += 1
+
+                elif op == OP_RETURN:
+                    a = arg1[ip]
+                    if a == NO_OPERAND:
+                        ret_value = None
+                    else:
+                        ret_value = (consts[a] if a >= const_min else frame.get(a, 0) if a >= local_min
+                                     else glob.get(a, 0))
+                    # Se pasa por el ENDFUNC siguiente: cuenta como paso y lo ven
+                    # on_quad, la cobertura y la traza
+                    ip = links[ip]
+
+                elif op == OP_ENDFUNC:
+                    if call_stack:
+                        return_ip, fname = call_stack.pop()
+                        live_slots -= reserved.pop()
+                        if len(frames) > 1:
+                            # Al cerrarse, el marco tiene todas las direcciones que usó la llamada
+                            if len(frame) > largest_slots:
+                                largest_slots = len(frame)
+                                self._largest_frame = frame
+                            frames.pop()
+                            frame = frames[-1]
+                        if on_return is not None:
+                            on_return(self, fname, ret_value)
+                        ip = self.ip = return_ip
+                    else:
+                        ip += 1
+
+                elif op == OP_PRINT:
+                    v = self._get_val(arg1[ip])
+                    text = str(v)
+                    output_bytes += len(text.encode("utf-8")) + 1
+                    if output_bytes > max_output:
+                        raise OutputLimitExceeded(f"Se alcanzo el limite de {max_output} bytes de salida")
+                    print(text)
+                    if on_print is not None:
+                        on_print(self, v)
+                    ip += 1
+
+                elif op == OP_UMINUS:
+                    v1 = -self._get_val(arg1[ip])
+                    self._write(results[ip], v1)
+                    if on_write is not None:
+                        on_write(self, results[ip], v1)
+                    ip += 1
+
+                elif op == OP_LOADIDX:
+                    base = arg1[ip]
+                    buf = self._which_mem(base)[base]
+                    v = buf[self._get_val(arg2[ip])]
+                    self._write(results[ip], v)
+                    if on_write is not None:
+                        on_write(self, results[ip], v)
+                    ip += 1
+
+                elif op == OP_STOREIDX:
+                    base = results[ip]
+                    buf = self._which_mem(base)[base]
+                    val = self._get_val(arg1[ip])
+                    idx = self._get_val(arg2[ip])
+                    buf[idx] = val if buf.typecode == 'd' else int(val)
+                    if on_write is not None:
+                        on_write(self, base + idx, buf[idx])
+                    ip += 1
+
+                elif op == OP_VER:
+                    idx = self._get_val(arg1[ip])
+                    size = results[ip]
+                    if not 0 <= idx < size:
+                        raise PatitoRuntimeError(f"Indice {idx} fuera de rango (0..{size - 1})")
+                    ip += 1
+
+                elif op == OP_ALLOC:
+                    # Un solo buffer tipado por arreglo, en ceros
+                    base = results[ip]
+                    live_slots += arg1[ip]
+                    if live_slots > max_slots:
+                        raise MemoryLimitExceeded(f"Se alcanzo el limite de {max_slots} casillas de memoria")
+                    if reserved and base >= local_min:
+                        # Los arreglos locales se liberan con su llamada
+                        reserved[-1] += arg1[ip]
+                    typecode = ARRAY_TYPECODES[self.layout.type_of(base)]
+                    self._which_mem(base)[base] = array(typecode, bytes(8 * arg1[ip]))
+                    ip += 1
+
+                elif op == OP_READ:
+                    addr = results[ip]
+                    v = self._read_value(addr)
+                    self._write(addr, v)
+                    if on_write is not None:
+                        on_write(self, addr, v)
+                    ip += 1
+
+                elif op == OP_END:
+                    break
+
                 else:
-                    self.ip += 1
+                    # Operador desconocido
+                    ip += 1
+        finally:
+            self.ip = ip
+            self.calls, self.peak_depth, self.peak_args = calls, peak_depth, peak_args
+            self.steps, self.output_bytes = steps, output_bytes
 
-            elif op == 'END':
-                break
+    #  Telemetría
 
-            else:
-                # Operador desconocido
-                self.ip += 1
+    def _sample_loop(self, stop: "threading.Event") -> None:
+        # Lee el estado de la VM sin detenerla; los len() son atómicos con el GIL.
+        # El ip es el de la última llamada, regreso o salto hacia atrás.
+        start = time.perf_counter()
+        interval = self.sample_interval_ms / 1e3
+        while not stop.wait(interval):
+            self.samples.append({
+                "t_ms": round((time.perf_counter() - start) * 1e3, 3),
+                "ip": self.ip,
+                "depth": len(self.call_stack),
+                "frames": len(self.frames),
+                "top_frame_slots": len(self.frames[-1]) if self.frames else 0,
+                "global_slots": len(self.global_mem),
+            })
+
+    def _slots_by_segment(self, mem: Dict[Any, Any]) -> Dict[str, int]:
+        # El segmento sale de addr // span (ver SegmentLayout); un arreglo cuenta
+        # como un slot y sus elementos van aparte en "array_elements"
+        span = self.layout.span
+        slots: Dict[str, int] = {}
+        elements = 0
+        for addr, value in mem.items():
+            idx = addr // span - 1 if type(addr) is int else -1
+            key = SEGMENTS[idx] if 0 <= idx < len(SEGMENTS) else "simbolico"
+            slots[key] = slots.get(key, 0) + 1
+            if type(value) is array:
+                elements += len(value)
+        if elements:
+            slots["array_elements"] = elements
+        return slots
 
+    def telemetry(self) -> Dict[str, Any]:
+        # El marco más grande entre los ya cerrados y el actual (el del main si no hubo llamadas)
+        frame = self._largest_frame
+        if self.frames and len(self.frames[-1]) > len(frame):
+            frame = self.frames[-1]
+        frame_bytes = approx_bytes(frame)
         return {
-            "global": dict(self.global_mem),
-            "top_frame": dict(self.frames[-1]) if self.frames else {},
+            "calls": self.calls,
+            # Solo se cuentan en el ciclo que cuenta pasos
+            "steps": self.steps if self.checked else None,
+            "output_bytes": self.output_bytes if self.checked else None,
+            "peak_call_depth": self.peak_depth,
+            "peak_live_frames": self.peak_frames,
+            "peak_call_args": self.peak_args,
+            "global_slots": self._slots_by_segment(self.global_mem),
+            "frame_slots": self._slots_by_segment(frame),
+            "global_bytes": approx_bytes(self.global_mem),
+            "frame_bytes": frame_bytes,
+            # Cota aproximada: todos los marcos vivos del tamaño del más grande
+            "peak_stack_bytes": frame_bytes * self.peak_frames,
+            "samples": list(self.samples),
         }
+
+
+# Código de los dos ciclos de ejecución: quien interrumpe la corrida (p.ej.
+# la señal de profiler.Profiler) busca en la pila el marco de uno de ellos
+# para leer su variable local 'ip'
+LOOP_CODES = (VirtualMachine._execute.__code__, VirtualMachine._execute_checked.__code__)
+
+
+def approx_bytes(mem: Dict[Any, Any]) -> int:
+    # Tamaño del dict más el de cada valor (los arreglos incluyen su buffer)
+    return sys.getsizeof(mem) + sum(map(sys.getsizeof, mem.values()))
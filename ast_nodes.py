@@ -0,0 +1,190 @@
+# Árbol de sintaxis abstracta de Patito.
+# Los parsers (PLY y descendente recursivo) solo construyen estos nodos; el
+# análisis semántico (semantic.py) resuelve nombres y llena los tipos, y el
+# generador de código (codegen.py) recorre el árbol ya tipado y emite los
+# cuádruplos. Un árbol se puede guardar, transformar y compilar varias veces.
+
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+from tabla_symbolos import FunctionInfo, VariableInfo
+
+
+#  Expresiones
+# 'tipo' lo llena el análisis semántico (salvo en constantes, que ya lo traen)
+
+@dataclass(slots=True)
+class Const:
+    value: int | float
+    tipo: str
+
+
+@dataclass(slots=True)
+class Letrero:
+    # Solo aparece como elemento de 'escribe'
+    text: str
+
+
+@dataclass(slots=True)
+class Var:
+    name: str
+    info: VariableInfo | None = None
+    tipo: str | None = None
+
+
+@dataclass(slots=True)
+class Index:
+    name: str
+    index: "Expr"
+    info: VariableInfo | None = None
+    tipo: str | None = None
+
+
+@dataclass(slots=True)
+class Call:
+    name: str
+    args: List["Expr"]
+    line: int = 0
+    func: FunctionInfo | None = None
+    tipo: str | None = None  # tipo de retorno ('nula' si no regresa valor)
+
+
+@dataclass(slots=True)
+class Unary:
+    op: str  # '+' o '-'
+    operand: "Expr"
+    tipo: str | None = None
+
+
+@dataclass(slots=True)
+class Binary:
+    op: str
+    left: "Expr"
+    right: "Expr"
+    tipo: str | None = None
+
+
+Expr = Const | Var | Index | Call | Unary | Binary
+
+
+#  Estatutos (line = línea del primer token)
+
+@dataclass(slots=True)
+class Assign:
+    name: str
+    value: Expr
+    line: int = 0
+    info: VariableInfo | None = None
+
+
+@dataclass(slots=True)
+class AssignIndex:
+    name: str
+    index: Expr
+    value: Expr
+    line: int = 0
+    info: VariableInfo | None = None
+
+
+@dataclass(slots=True)
+class If:
+    cond: Expr
+    then: List["Stmt"]
+    orelse: List["Stmt"] | None = None
+    line: int = 0
+
+
+@dataclass(slots=True)
+class While:
+    cond: Expr
+    body: List["Stmt"]
+    line: int = 0
+
+
+@dataclass(slots=True)
+class Print:
+    items: List[Expr | Letrero]
+    line: int = 0
+
+
+@dataclass(slots=True)
+class Read:
+    targets: List[Var | Index]
+    line: int = 0
+
+
+@dataclass(slots=True)
+class Return:
+    value: Expr | None
+    line: int = 0
+
+
+@dataclass(slots=True)
+class CallStmt:
+    call: Call
+    line: int = 0
+
+
+@dataclass(slots=True)
+class Block:
+    # [ estatutos ]
+    body: List["Stmt"]
+    line: int = 0
+
+
+Stmt = Assign | AssignIndex | If | While | Print | Read | Return | CallStmt | Block
+
+
+#  Declaraciones
+
+@dataclass(slots=True)
+class VarGroup:
+    # a, v[10] : entero;  -> names = [("a", None), ("v", 10)]
+    names: List[Tuple[str, int | None]]
+    tipo: str
+    line: int = 0
+
+
+@dataclass(slots=True)
+class Function:
+    name: str
+    return_type: str
+    params: List[Tuple[str, str]]
+    vars: List[VarGroup]
+    body: List[Stmt]
+    line: int = 0
+    # Llenados por el análisis semántico
+    info: FunctionInfo | None = None
+    arrays: List[VariableInfo] = field(default_factory=list)
+    locals_usage: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Program:
+    name: str
+    vars: List[VarGroup]
+    functions: List[Function]
+    body: List[Stmt]
+    lines: int = 0  # líneas del código fuente
+    # Llenado por el análisis semántico
+    arrays: List[VariableInfo] = field(default_factory=list)
+
+
+# Los estatutos anidados se recorren con recursión (parser descendente,
+# análisis y generación). Desde Python 3.11 esas llamadas no usan la pila de
+# C, así que basta con subir el límite durante el recorrido para aceptar
+# anidamientos de miles de niveles.
+NESTING_RECURSION_LIMIT = 100_000
+
+
+@contextmanager
+def deep_nesting() -> Iterator[None]:
+    old = sys.getrecursionlimit()
+    if sys.version_info >= (3, 11) and old < NESTING_RECURSION_LIMIT:
+        sys.setrecursionlimit(NESTING_RECURSION_LIMIT)
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(old)
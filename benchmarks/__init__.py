@@ -0,0 +1,3 @@
+# Mediciones de rendimiento del compilador y la máquina virtual.
+# Cada módulo se ejecuta desde la raíz del repositorio con
+# python -m benchmarks.<modulo>
@@ -0,0 +1,73 @@
+# Muchas corridas cortas del mismo programa: costo de preparar cada VM
+# construyéndola desde los cuádruplos (como main.py) contra
+# VirtualMachine.from_program con un CompiledProgram compartido, en
+# secuencia y en hilos. Revisa que todas las corridas den las mismas globales.
+#   python -m benchmarks.many_runs --runs 2000 --threads 4
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import intermediate as ir
+import parser as patito_parser
+from VM_Patito import VirtualMachine
+
+PROGRAM = """programa corto;
+vars i, s : entero;
+entero doble(x: entero) { { return x * 2; } };
+inicio {
+  i = 0; s = 0;
+  mientras (i < 5) haz { s = s + doble(i); i = i + 1; };
+} fin
+"""
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Corridas cortas repetidas de un programa ya compilado")
+    argp.add_argument("--runs", type=int, default=2000)
+    argp.add_argument("--threads", type=int, default=4)
+    args = argp.parse_args(argv)
+
+    program = patito_parser.compile_program(PROGRAM)
+    func_dir = patito_parser.get_function_directory()
+    expected = VirtualMachine.from_program(program, jit_threshold=None).run()["global"]
+
+    def rebuilt() -> dict:
+        return VirtualMachine(ir.quads, ir.const_table, func_dir, jit_threshold=None).run()["global"]
+
+    def shared() -> dict:
+        return VirtualMachine.from_program(program, jit_threshold=None).run()["global"]
+
+    def setup_only() -> None:
+        VirtualMachine.from_program(program, jit_threshold=None)
+
+    def setup_rebuilt() -> None:
+        VirtualMachine(ir.quads, ir.const_table, func_dir, jit_threshold=None)
+
+    failed = False
+    print(f"{'modo':>28} {'us/corrida':>11}")
+    for name, fn in (("preparar (desde cuadruplos)", setup_rebuilt), ("preparar (from_program)", setup_only),
+                     ("correr (desde cuadruplos)", rebuilt), ("correr (from_program)", shared)):
+        start = time.perf_counter()
+        results = [fn() for _ in range(args.runs)]
+        elapsed = time.perf_counter() - start
+        print(f"{name:>28} {elapsed / args.runs * 1e6:11.1f}")
+        failed |= any(r is not None and r != expected for r in results)
+
+    # Los hilos comparten el programa; cada VM tiene su propia memoria
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        results = list(pool.map(lambda _: shared(), range(args.runs)))
+    elapsed = time.perf_counter() - start
+    print(f"{f'correr ({args.threads} hilos)':>28} {elapsed / args.runs * 1e6:11.1f}")
+    failed |= any(r != expected for r in results)
+
+    if failed:
+        print("\nAlguna corrida dio otro resultado")
+        sys.exit(1)
+    print(f"\n{args.runs} corridas por modo, mismas globales: {expected}")
+
+
+if __name__ == "__main__":
+    main()
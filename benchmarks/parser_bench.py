@@ -0,0 +1,45 @@
+# Tiempo de compilación (análisis léxico + sintáctico + cuádruplos) con el
+# parser de PLY y con el descendente recursivo, sobre programas generados.
+#   python -m benchmarks.parser_bench --statements 1000 10000 --repeat 3
+
+import argparse
+import time
+from typing import Callable
+
+import parser as patito_parser
+from benchmarks.sources import straight_line
+from fast_scanner import FastLexer
+
+FRONTENDS = {
+    "ply": lambda code: patito_parser.parse(code),
+    "rd": lambda code: patito_parser.parse(code, frontend="rd"),
+    "rd+regex": lambda code: patito_parser.parse(code, lexer=FastLexer(), frontend="rd"),
+}
+
+
+def best_time(compile_fn: Callable[[str], object], code: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compile_fn(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Compara la velocidad de los parsers")
+    argp.add_argument("--statements", type=int, nargs="+", default=[1000, 10000, 50000])
+    argp.add_argument("--repeat", type=int, default=3)
+    args = argp.parse_args(argv)
+
+    header = f"{'estatutos':>10}" + "".join(f" {name + ' ms':>12}" for name in FRONTENDS) + f" {'aceleracion':>11}"
+    print(header)
+    for statements in args.statements:
+        code = straight_line(statements)
+        times = {name: best_time(fn, code, args.repeat) for name, fn in FRONTENDS.items()}
+        row = f"{statements:>10}" + "".join(f" {t * 1000:>12.1f}" for t in times.values())
+        print(row + f" {times['ply'] / min(times.values()):>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
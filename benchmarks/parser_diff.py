@@ -0,0 +1,92 @@
+# Prueba diferencial: el parser descendente recursivo debe generar exactamente
+# lo mismo que el de PLY (el árbol, cuádruplos, constantes, directorio de
+# funciones, variables globales y errores) en tests/*.txt y en programas generados.
+#   python -m benchmarks.parser_diff [archivos...]
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import intermediate as ir
+import parser as patito_parser
+from benchmarks.sources import straight_line
+from fast_scanner import FastLexer
+
+
+def tree_snapshot(code: str, frontend: str, lexer=None) -> Any:
+    # Árbol recién parseado (sin anotar), comparable con ==
+    try:
+        return patito_parser.parse_ast(code, lexer=lexer, frontend=frontend)
+    except Exception as e:
+        return ("error", type(e).__name__, str(e))
+
+
+def compile_snapshot(code: str, frontend: str, lexer=None) -> Any:
+    # Todo lo que produce la compilación, en estructuras comparables con ==
+    try:
+        patito_parser.parse(code, lexer=lexer, frontend=frontend)
+    except Exception as e:
+        return ("error", type(e).__name__, str(e))
+    functions = {
+        name: (f.return_type, f.parameters, f.start_quad, f.locals_size, f.temps_size,
+               {k: vars(v) for k, v in f.var_table.all_variables().items()})
+        for name, f in patito_parser.get_function_directory().all_functions().items()
+    }
+    global_vars = {k: vars(v) for k, v in patito_parser.get_global_var_table().all_variables().items()}
+    return (list(ir.quads), list(ir.const_table.items()), functions, global_vars,
+            patito_parser.get_memory_layout(), ir.quads.lines.runs_list())
+
+
+def first_difference(ref: Any, got: Any) -> str:
+    if ref[0] == "error" or got[0] == "error":
+        return f"ply={ref if ref[0] == 'error' else 'ok'} rd={got if got[0] == 'error' else 'ok'}"
+    names = ("cuadruplos", "constantes", "funciones", "globales", "memoria", "lineas")
+    for name, a, b in zip(names, ref, got):
+        if a == b:
+            continue
+        if name == "cuadruplos":
+            for i, (qa, qb) in enumerate(zip(a, b)):
+                if qa != qb:
+                    return f"cuadruplo {i}: ply={qa} rd={qb}"
+            return f"cuadruplos: ply={len(a)} rd={len(b)}"
+        return f"{name} distintos"
+    return ""
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Compara el parser de PLY con el descendente recursivo")
+    argp.add_argument("files", nargs="*", help="Programas Patito (por omision tests/*.txt)")
+    args = argp.parse_args(argv)
+
+    programs: Dict[str, str] = {}
+    paths = [Path(f) for f in args.files] or sorted(Path("tests").glob("*.txt"))
+    for path in paths:
+        programs[str(path)] = path.read_text(encoding="utf-8")
+    if not args.files:
+        programs["<generado 2000>"] = straight_line(2000)
+
+    failures = 0
+    for name, code in programs.items():
+        ref_tree = tree_snapshot(code, "ply")
+        ref = compile_snapshot(code, "ply")
+        for label, lexer in (("rd", None), ("rd+regex", FastLexer())):
+            if tree_snapshot(code, "rd", lexer) != ref_tree:
+                failures += 1
+                print(f"DIFERENTE {name} [{label}]: arbol distinto")
+            got = compile_snapshot(code, "rd", lexer)
+            if got != ref:
+                failures += 1
+                print(f"DIFERENTE {name} [{label}]: {first_difference(ref, got)}")
+        if ref[0] != "error":
+            print(f"ok {name}: {len(ref[0])} cuadruplos")
+        else:
+            print(f"ok {name}: mismo error ({ref[2]})")
+
+    if failures:
+        sys.exit(1)
+    print(f"{len(programs)} programas iguales")
+
+
+if __name__ == "__main__":
+    main()
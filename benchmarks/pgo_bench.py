@@ -0,0 +1,78 @@
+# Optimización guiada por perfil (pgo.py): tiempo de cada programa compilado
+# sin perfil y con el perfil de una corrida anterior, con y sin el JIT.
+# Revisa que las globales y la salida no cambien (código 1 si cambian).
+#   python -m benchmarks.pgo_bench --repeat 5
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import parser as patito_parser
+import pgo
+from benchmarks.sources import deep_loops, deep_recursion, hot_calls
+from VM_Patito import VirtualMachine
+
+FIB = "\n".join([
+    "programa fibrec;",
+    "vars n, res: entero;",
+    "entero fib(n: entero) {",
+    "  { si (n < 2) { return n; } sino { return fib(n - 1) + fib(n - 2); }; }",
+    "};",
+    "inicio { n = 18; res = fib(n); escribe(\"fib\", n, res); } fin",
+    "",
+])
+
+PROGRAMS = {
+    "llamadas": hot_calls(20000),
+    "ciclos": deep_loops(2, iterations=100000),
+    "recursion": deep_recursion(200, calls=100),
+    "fib": FIB,
+}
+
+
+def run_ms(program, jit_threshold, hooks=()):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        result = VirtualMachine.from_program(program, jit_threshold=jit_threshold, hooks=hooks).run()["global"]
+    return (time.perf_counter() - start) * 1e3, (result, out.getvalue())
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Velocidad con y sin optimizacion guiada por perfil")
+    argp.add_argument("--repeat", type=int, default=5)
+    argp.add_argument("--min-count", type=int, default=pgo.HOT_COUNT,
+                      help="Ejecuciones para considerar caliente un cuadruplo")
+    args = argp.parse_args(argv)
+
+    failed = False
+    print(f"{'programa':>10} {'modo':>7} {'sin perfil':>11} {'con perfil':>11} {'mejora':>7}  (ms)")
+    for name, code in PROGRAMS.items():
+        program = patito_parser.compile_program(code)
+        recorder = pgo.ProfileRecorder()
+        run_ms(program, None, [recorder])
+        optimizer = pgo.Optimizer(program, recorder.profile(), min_count=args.min_count)
+        optimized = optimizer.run()
+        for mode, threshold in (("sin JIT", None), ("JIT", 50)):
+            base, tuned = [], []
+            expected = run_ms(program, threshold)[1]
+            # Se alternan para que el ruido de la máquina les toque por igual
+            for _ in range(args.repeat):
+                ms, _result = run_ms(program, threshold)
+                base.append(ms)
+                ms, result = run_ms(optimized, threshold)
+                tuned.append(ms)
+                failed |= result != expected
+            print(f"{name:>10} {mode:>7} {min(base):11.1f} {min(tuned):11.1f} {min(base) / min(tuned):6.2f}x")
+        print(f"{'':>10} {optimizer.report()}")
+
+    if failed:
+        print("\nEl programa optimizado dio otro resultado")
+        sys.exit(1)
+    print("\nMismas globales y salida con y sin perfil")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Costo por tarea de llevar un programa ya compilado a procesos trabajadores:
+# recompilar el código fuente, mandar la imagen copiada en cada tarea o mandar
+# solo el nombre de la imagen en memoria compartida (program_image). Con la
+# memoria compartida el costo por tarea no depende del tamaño del programa.
+#   python -m benchmarks.pool_runs --functions 100 2000 --tasks 40 --workers 4
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import parser as patito_parser
+import program_image
+from benchmarks.sources import many_functions
+from VM_Patito import VirtualMachine
+
+
+def _prepare(program) -> int:
+    VirtualMachine.from_program(program, jit_threshold=None)
+    return len(program.quads)
+
+
+def from_source(code: str) -> int:
+    return _prepare(patito_parser.compile_program(code))
+
+
+def from_bytes(data: bytes) -> int:
+    return _prepare(program_image.decode(data))
+
+
+def from_shared(name: str) -> int:
+    return _prepare(program_image.attach(name))
+
+
+def run_shared(name: str):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        result = program_image.run_attached(name, jit=False)
+    return result["global"], out.getvalue()
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Costo por tarea de compartir un programa con procesos")
+    argp.add_argument("--functions", type=int, nargs="+", default=[100, 2000])
+    argp.add_argument("--tasks", type=int, default=40)
+    argp.add_argument("--workers", type=int, default=4)
+    args = argp.parse_args(argv)
+
+    failed = False
+    print(f"{'funciones':>10} {'cuadruplos':>11} {'KiB':>8} {'recompilar':>11} {'copia':>9} {'compartida':>11}  (us/tarea)")
+    for count in args.functions:
+        code = many_functions(count)
+        program = patito_parser.compile_program(code)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            expected = VirtualMachine.from_program(program, jit_threshold=None).run()["global"], out.getvalue()
+        data = program_image.encode(program)
+
+        with program_image.publish(program) as image:
+            # Cada trabajador adjunta la imagen al arrancar; las tareas solo llevan el nombre
+            with ProcessPoolExecutor(args.workers, initializer=program_image.attach,
+                                     initargs=(image.name,)) as pool:
+                timings = []
+                for fn, arg in ((from_source, code), (from_bytes, data), (from_shared, image.name)):
+                    list(pool.map(fn, [arg] * args.workers))
+                    start = time.perf_counter()
+                    sizes = list(pool.map(fn, [arg] * args.tasks))
+                    timings.append((time.perf_counter() - start) / args.tasks * 1e6)
+                    failed |= any(size != len(program.quads) for size in sizes)
+                results = list(pool.map(run_shared, [image.name] * args.workers))
+                failed |= any(r != expected for r in results)
+
+        print(f"{count:>10} {len(program.quads):>11} {len(data) / 1024:>8.1f} "
+              f"{timings[0]:>11.1f} {timings[1]:>9.1f} {timings[2]:>11.1f}")
+
+    if failed:
+        print("\nAlgún trabajador dio otro resultado")
+        sys.exit(1)
+    print(f"\n{args.tasks} tareas por modo en {args.workers} procesos; mismas globales y salida en todos")
+
+
+if __name__ == "__main__":
+    main()
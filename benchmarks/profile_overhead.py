@@ -0,0 +1,102 @@
+# Costo del perfilador por muestreo: tiempo de la misma corrida sin perfilar,
+# con Profiler(interval_ms) (señal SIGPROF sobre el ciclo normal y el JIT) y
+# con Profiler(every_steps) (ciclo instrumentado, sin JIT). Revisa que las
+# globales no cambien y falla (código 1) si el muestreo por tiempo se pasa
+# del presupuesto. Se mide tiempo de CPU del proceso (el manejador de la señal
+# corre dentro de él, así que su costo cuenta), no de reloj: en una máquina
+# compartida el reloj mide sobre todo a los demás procesos. Los ms son el
+# mínimo de las repeticiones; el % es la mediana, entre repeticiones, de cada
+# corrida perfilada contra la corrida sin perfil de la misma vuelta.
+#   python -m benchmarks.profile_overhead --repeat 15 --interval-ms 1 --budget-pct 5
+
+import argparse
+import contextlib
+import gc
+import io
+import statistics
+import sys
+import time
+
+import parser as patito_parser
+from benchmarks.sources import deep_loops, deep_recursion
+from profiler import Profiler
+from VM_Patito import VirtualMachine
+
+PROGRAMS = {
+    "recursion": deep_recursion(200, calls=300),
+    "ciclos": deep_loops(2, iterations=300000),
+}
+
+
+def run_ms(program, profiler):
+    # Sin el recolector de basura, como timeit: sus pausas caen en cualquier corrida
+    out = io.StringIO()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.process_time()
+        with contextlib.redirect_stdout(out):
+            hooks = [profiler] if profiler is not None else ()
+            result = VirtualMachine.from_program(program, hooks=hooks).run()["global"]
+        elapsed = time.process_time() - start
+    finally:
+        gc.enable()
+    return elapsed * 1e3, result
+
+
+def overhead_pct(base, profiled):
+    # Cada corrida contra la sin perfil de su misma vuelta: el ruido lento de
+    # la máquina les toca a las dos y se cancela
+    return 100 * statistics.median((p - b) / b for b, p in zip(base, profiled))
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Costo del perfilador por muestreo")
+    argp.add_argument("--repeat", type=int, default=15)
+    argp.add_argument("--interval-ms", type=float, default=1.0)
+    argp.add_argument("--every-steps", type=int, default=1000)
+    argp.add_argument("--budget-pct", type=float, default=5.0,
+                      help="Maximo costo del muestreo por tiempo sobre la corrida sin perfilar")
+    args = argp.parse_args(argv)
+
+    modes = {
+        "sin perfil": lambda: None,
+        "tiempo": lambda: Profiler(interval_ms=args.interval_ms),
+        "pasos": lambda: Profiler(every_steps=args.every_steps),
+    }
+    failed = False
+    print(f"{'programa':>10} {'sin perfil':>11} {'tiempo':>9} {'%':>6} {'muestras':>9} "
+          f"{'pasos':>9} {'%':>6} {'muestras':>9}  (ms de CPU)")
+    for name, code in PROGRAMS.items():
+        program = patito_parser.compile_program(code)
+        times = {mode: [] for mode in modes}
+        samples = {}
+        expected = run_ms(program, None)[1]
+        # Los modos se alternan en cada repetición, y el orden se invierte en
+        # las impares, para que el ruido de la máquina y el correr primero les
+        # toquen por igual
+        order = list(modes)
+        for _ in range(args.repeat):
+            for mode in order:
+                profiler = modes[mode]()
+                ms, result = run_ms(program, profiler)
+                times[mode].append(ms)
+                failed |= result != expected
+                if profiler is not None:
+                    samples[mode] = profiler.samples
+            order.reverse()
+        base, timed, stepped = (min(times[mode]) for mode in modes)
+        over_time, over_steps = (overhead_pct(times["sin perfil"], times[mode]) for mode in ("tiempo", "pasos"))
+        print(f"{name:>10} {base:11.1f} {timed:9.1f} {over_time:6.1f} {samples['tiempo']:9} "
+              f"{stepped:9.1f} {over_steps:6.1f} {samples['pasos']:9}")
+        if over_time > args.budget_pct:
+            print(f"  muestreo por tiempo fuera de presupuesto: {over_time:.1f}% > {args.budget_pct:g}%")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+    print(f"\nMismas globales con y sin perfil; muestreo cada {args.interval_ms:g} ms dentro de {args.budget_pct:g}%")
+
+
+if __name__ == "__main__":
+    main()
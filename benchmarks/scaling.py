@@ -0,0 +1,37 @@
+# Escalamiento del tiempo de compilación con el tamaño del programa.
+# Si la construcción de listas es lineal, el tiempo por estatuto se mantiene
+# constante de 1k a 1M estatutos.
+#   python -m benchmarks.scaling --parser rd --scanner regex --statements 1000 10000 100000 1000000
+
+import argparse
+import time
+
+import intermediate as ir
+import parser as patito_parser
+from benchmarks.sources import straight_line
+from fast_scanner import FastLexer
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Tiempo de compilacion contra numero de estatutos")
+    argp.add_argument("--statements", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    argp.add_argument("--parser", choices=("ply", "rd"), default="rd")
+    argp.add_argument("--scanner", choices=("ply", "regex"), default="regex")
+    args = argp.parse_args(argv)
+
+    print(f"{'estatutos':>10} {'cuadruplos':>11} {'ms':>10} {'us/estatuto':>12} {'relativo':>9}")
+    base = None
+    for statements in args.statements:
+        code = straight_line(statements)
+        lexer = FastLexer() if args.scanner == "regex" else None
+        start = time.perf_counter()
+        patito_parser.parse(code, lexer=lexer, frontend=args.parser)
+        elapsed = time.perf_counter() - start
+        per_statement = elapsed / statements * 1e6
+        base = base or per_statement
+        print(f"{statements:>10} {len(ir.quads):>11} {elapsed * 1000:>10.0f} {per_statement:>12.1f} "
+              f"{per_statement / base:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
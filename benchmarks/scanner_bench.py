@@ -0,0 +1,60 @@
+# Tokens por segundo del lexer de PLY contra fast_scanner.FastLexer.
+#   python -m benchmarks.scanner_bench --statements 20000 --repeat 3
+
+import argparse
+import time
+from typing import Callable, Tuple
+
+from benchmarks.sources import straight_line
+from fast_scanner import FastLexer
+from scanner import lexer as ply_lexer
+
+
+def count_ply(code: str) -> int:
+    lx = ply_lexer.clone()
+    lx.lineno = 1
+    lx.input(code)
+    n = 0
+    while lx.token() is not None:
+        n += 1
+    return n
+
+
+def count_fast(code: str) -> int:
+    lx = FastLexer()
+    lx.input(code)
+    n = 0
+    while lx.token() is not None:
+        n += 1
+    return n
+
+
+def best_time(scan: Callable[[str], int], code: str, repeat: int) -> Tuple[int, float]:
+    # Se toma la mejor de varias corridas para reducir el ruido
+    best = float("inf")
+    n = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n = scan(code)
+        best = min(best, time.perf_counter() - start)
+    return n, best
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Compara la velocidad de los analizadores lexicos")
+    argp.add_argument("--statements", type=int, nargs="+", default=[1000, 10000, 100000])
+    argp.add_argument("--repeat", type=int, default=3)
+    args = argp.parse_args(argv)
+
+    print(f"{'estatutos':>10} {'tokens':>9} {'ply tok/s':>12} {'regex tok/s':>12} {'aceleracion':>11}")
+    for statements in args.statements:
+        code = straight_line(statements)
+        n_ply, t_ply = best_time(count_ply, code, args.repeat)
+        n_fast, t_fast = best_time(count_fast, code, args.repeat)
+        if n_ply != n_fast:
+            raise SystemExit(f"Los lexers no coinciden: {n_ply} contra {n_fast} tokens")
+        print(f"{statements:>10} {n_ply:>9} {n_ply / t_ply:>12.0f} {n_fast / t_fast:>12.0f} {t_ply / t_fast:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Generadores de programas Patito grandes para las mediciones.
+
+from typing import List
+
+
+def straight_line(statements: int) -> str:
+    # Asignaciones, condiciones, ciclos y escrituras repetidas; todo en un solo
+    # bloque 'inicio' para que el tamaño crezca sin cambiar la forma
+    body: List[str] = []
+    patterns = (
+        "  a = b + {i} * (c - 3);",
+        "  b = (a + 2.5) / 4 - {i};",
+        "  si (a > b) {{ c = a - b; }} sino {{ c = b - a; }};",
+        '  escribe("paso", {i}, c);',
+        "  mientras (c > 1000) haz {{ c = c / 2; }};",
+    )
+    for i in range(statements):
+        body.append(patterns[i % len(patterns)].format(i=i))
+    return "\n".join(
+        ["programa grande;", "vars a, b, c : flotante;", "inicio {", "  a = 0;", "  b = 1;", "  c = 0;"]
+        + body
+        + ["} fin", ""]
+    )
+
+
+def deep_loops(depth: int, iterations: int = 1000, width: int = 1) -> str:
+    # 'depth' ciclos anidados; cada nivel da 'width' vueltas y el más interno
+    # 'iterations', así la profundidad crece sin que el trabajo explote
+    counters = [f"i{k}" for k in range(depth)]
+    lines: List[str] = []
+    # La sangría se limita para que el texto no crezca cuadráticamente
+    for k, var in enumerate(counters):
+        pad = "  " * min(k + 1, 8)
+        bound = iterations if k == depth - 1 else width
+        lines.append(f"{pad}{var} = 0;")
+        lines.append(f"{pad}mientras ({var} < {bound}) haz {{")
+    lines.append("  " * min(depth + 1, 8) + f"s = s + {counters[-1]};")
+    for k in range(depth - 1, -1, -1):
+        pad = "  " * min(k + 1, 8)
+        lines.append(f"{pad}  {counters[k]} = {counters[k]} + 1;")
+        lines.append(f"{pad}}};")
+    return "\n".join(
+        ["programa ciclos;", f"vars {', '.join(counters)}, s : entero;", "inicio {", "  s = 0;"]
+        + lines
+        + ['  escribe("suma", s);', "} fin", ""]
+    )
+
+
+def many_functions(count: int) -> str:
+    # 'count' funciones con parámetros, locales y una condición; main llama a cada una
+    funcs: List[str] = []
+    calls: List[str] = []
+    for k in range(count):
+        funcs.append(
+            f"entero f{k}(x: entero, y: entero) {{ vars t : entero; {{ t = x + y * 2; "
+            f"si (t > 1000) {{ t = t - 1000; }}; return t; }} }};"
+        )
+        calls.append(f"  s = f{k}(s, {k});")
+    return "\n".join(
+        ["programa funciones;", "vars s : entero;"]
+        + funcs
+        + ["inicio {", "  s = 1;"]
+        + calls
+        + ['  escribe("s", s);', "} fin", ""]
+    )
+
+
+def deep_recursion(depth: int, calls: int = 10) -> str:
+    # Recursión de profundidad 'depth', repetida 'calls' veces
+    return "\n".join([
+        "programa recursion;",
+        "vars i, s : entero;",
+        "entero baja(n: entero) {",
+        "  { si (n < 1) { return 0; }; return baja(n - 1) + 1; }",
+        "};",
+        "inicio {",
+        "  i = 0; s = 0;",
+        f"  mientras (i < {calls}) haz {{ s = s + baja({depth}); i = i + 1; }};",
+        '  escribe("s", s);',
+        "} fin",
+        "",
+    ])
+
+
+def heavy_output(lines: int) -> str:
+    # Un ciclo que escribe 'lines' renglones de tres valores
+    return "\n".join([
+        "programa salida;",
+        "vars i : entero;",
+        "inicio {",
+        "  i = 0;",
+        f'  mientras (i < {lines}) haz {{ escribe("linea", i, i * 2); i = i + 1; }};',
+        "} fin",
+        "",
+    ])
+
+
+def hot_calls(iterations: int) -> str:
+    # Un ciclo que llama funciones pequeñas y tiene un si/sino casi siempre
+    # por el mismo lado (para la optimización guiada por perfil, ver pgo.py)
+    return "\n".join([
+        "programa llamadas;",
+        "vars i, s, t : entero;",
+        "entero suma3(a: entero, b: entero) {",
+        "  vars r : entero;",
+        "  { r = a + b * 3; return r; }",
+        "};",
+        "entero menor(a: entero, b: entero) {",
+        "  { si (a < b) { return a; } sino { return b; }; }",
+        "};",
+        "inicio {",
+        "  i = 0; s = 0; t = 0;",
+        f"  mientras (i < {iterations}) haz {{",
+        "    t = t + 1;",
+        "    si (t < 10) { s = s + suma3(t, i); } sino { t = 0; s = s - 1; };",
+        "    s = menor(s, 1000000);",
+        "    i = i + 1;",
+        "  };",
+        '  escribe("s", s);',
+        "} fin",
+        "",
+    ])
+
+
+# Forma -> (generador, tamaños por omisión)
+SHAPES = {
+    "straight_line": (straight_line, [1000, 10000]),
+    "deep_loops": (deep_loops, [10, 1000]),
+    "many_functions": (many_functions, [100, 1000]),
+    "deep_recursion": (deep_recursion, [100, 1000]),
+    "heavy_output": (heavy_output, [1000, 10000]),
+}
@@ -0,0 +1,105 @@
+# Tiempo de arranque: cuánto tarda un proceso nuevo en importar y en compilar
+# y ejecutar un programa corto, descontando el arranque del intérprete.
+# Falla (código 1) si se pasa del presupuesto, si las tablas precompiladas no
+# corresponden a la gramática o si arrancar escribió archivos de tablas
+# (parsetab.py, parser.out, lextab.py).
+#   python -m benchmarks.startup_bench --runs 20 --budget-ms 65 --detail
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import parser as patito_parser
+
+ROOT = Path(__file__).resolve().parent.parent
+TABLE_FILES = ("parsetab.py", "parser.out", "lextab.py")
+PROGRAM = "tests/valido.txt"
+
+
+def commands(program: str) -> Dict[str, List[str]]:
+    py = sys.executable
+    return {
+        "interprete": [py, "-c", "pass"],
+        "import main": [py, "-c", "import main"],
+        "import parser": [py, "-c", "import parser"],
+        "main (ply)": [py, "main.py", "--test", program],
+        "main (rd+regex)": [py, "main.py", "--test", program, "--parser", "rd", "--scanner", "regex"],
+    }
+
+
+def wall_ms(cmd: List[str], runs: int) -> List[float]:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append((time.perf_counter() - start) * 1e3)
+    return times
+
+
+def table_mtimes() -> Dict[str, float]:
+    return {name: os.stat(ROOT / name).st_mtime_ns for name in TABLE_FILES if (ROOT / name).exists()}
+
+
+def slowest_imports(cmd: List[str], top: int) -> List[str]:
+    # -X importtime: "import time: propio | acumulado | modulo" por stderr
+    proc = subprocess.run(cmd[:1] + ["-X", "importtime"] + cmd[1:], cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    rows.sort(reverse=True)
+    return [f"{s / 1e3:8.2f} {c / 1e3:9.2f}  {m}" for s, c, m in rows[:top]]
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Tiempo de arranque del compilador Patito")
+    argp.add_argument("--runs", type=int, default=15)
+    argp.add_argument("--program", default=PROGRAM)
+    argp.add_argument("--budget-ms", type=float, default=65.0,
+                      help="Maximo para 'main (ply)' descontando el interprete (mejor de --runs)")
+    argp.add_argument("--detail", action="store_true", help="Muestra los modulos que mas tardan en importarse")
+    args = argp.parse_args(argv)
+
+    before = table_mtimes()
+    cmds = commands(args.program)
+    results = {name: wall_ms(cmd, args.runs) for name, cmd in cmds.items()}
+    written = [name for name, mtime in table_mtimes().items() if before.get(name) != mtime]
+
+    # El mínimo es lo más estable: el ruido de la máquina solo suma tiempo
+    base = min(results["interprete"])
+    print(f"{'comando':>18} {'min ms':>8} {'mediana':>8} {'- interprete':>13}")
+    for name, times in results.items():
+        print(f"{name:>18} {min(times):8.1f} {statistics.median(times):8.1f} {min(times) - base:13.1f}")
+
+    if args.detail:
+        print("\npropio ms  acumulado  modulo   (main (ply))")
+        for row in slowest_imports(cmds["main (ply)"], 15):
+            print(row)
+
+    failed = False
+    if not patito_parser.tables_current():
+        print("\nTablas desactualizadas: cada arranque las reconstruye (regenerar con: python parser.py)")
+        failed = True
+    if written:
+        print(f"\nEl arranque reescribio: {', '.join(written)} (regenerar con: python parser.py)")
+        failed = True
+    overhead = min(results["main (ply)"]) - base
+    if overhead > args.budget_ms:
+        print(f"\nFuera de presupuesto: {overhead:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    else:
+        print(f"\nDentro del presupuesto: {overhead:.1f} ms <= {args.budget_ms:.1f} ms")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
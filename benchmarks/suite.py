@@ -0,0 +1,185 @@
+# Suite de escalamiento: genera programas de varias formas y tamaños
+# (benchmarks.sources.SHAPES) y mide por separado cada fase: análisis léxico,
+# sintáctico, semántico, generación de cuádruplos y ejecución en la VM.
+#   python -m benchmarks.suite run --out base.json
+#   python -m benchmarks.suite run --shapes deep_loops many_functions --sizes 50 500 --out nuevo.json
+#   python -m benchmarks.suite compare base.json nuevo.json --tolerance 0.15
+# compare termina con código 1 si alguna fase se volvió más lenta que la tolerancia.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import intermediate as ir
+import parser as patito_parser
+from benchmarks.sources import SHAPES
+from codegen import CodeGenerator
+from compile_stats import ReplayLexer, tokenize
+from fast_scanner import FastLexer
+from memory import memory_manager
+from scanner import lexer as ply_lexer
+from semantic import SemanticAnalyzer
+from tracing_jit import DEFAULT_THRESHOLD
+from VM_Patito import VirtualMachine
+
+PHASES = ("lex", "parse", "semantic", "codegen", "vm")
+
+
+def lexer_for(scanner: str):
+    return FastLexer() if scanner == "regex" else ply_lexer.clone()
+
+
+def timed(fn: Callable[[], Any], repeat: int):
+    # (mejor tiempo en ms, resultado de la última corrida)
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1e3)
+    return best, result
+
+
+def measure(code: str, scanner: str, frontend: str, repeat: int, jit: bool) -> Dict[str, Any]:
+    lex_ms, tokens = timed(lambda: tokenize(code, lexer_for(scanner)), repeat)
+    replay = ReplayLexer(tokens)
+    parse_ms, program = timed(lambda: patito_parser.parse_ast(code, lexer=replay, frontend=frontend), repeat)
+
+    # Primero se compila una vez para conocer la distribución de memoria final
+    # (puede crecer); las fases se miden ya con ella
+    patito_parser.compile_ast(program)
+    layout = memory_manager.layout
+
+    def analyze() -> SemanticAnalyzer:
+        memory_manager.set_layout(layout)
+        ir.reset_ir()
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(program)
+        return analyzer
+
+    def generate() -> None:
+        analyze()
+        CodeGenerator().generate(program)
+
+    semantic_ms, analyzer = timed(analyze, repeat)
+    # La generación necesita el análisis recién hecho; se descuenta su tiempo
+    compile_ms, _ = timed(generate, repeat)
+    codegen_ms = max(compile_ms - semantic_ms, 0.0)
+
+    def run_vm() -> None:
+        vm = VirtualMachine(ir.quads, ir.const_table, analyzer.func_dir, layout=layout,
+                            jit_threshold=DEFAULT_THRESHOLD if jit else None)
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            vm.run()
+
+    vm_ms, _ = timed(run_vm, repeat)
+    return {
+        "tokens": len(tokens),
+        "quads": len(ir.quads),
+        "constants": len(ir.const_table),
+        "functions": len(program.functions),
+        "lex_ms": round(lex_ms, 3),
+        "parse_ms": round(parse_ms, 3),
+        "semantic_ms": round(semantic_ms, 3),
+        "codegen_ms": round(codegen_ms, 3),
+        "vm_ms": round(vm_ms, 3),
+    }
+
+
+def run(args) -> None:
+    shapes = args.shapes or list(SHAPES)
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'programa':>22} {'tokens':>8} {'quads':>7} " + " ".join(f"{p + ' ms':>10}" for p in PHASES))
+    for shape in shapes:
+        generator, default_sizes = SHAPES[shape]
+        for size in args.sizes or default_sizes:
+            key = f"{shape}/{size}"
+            row = measure(generator(size), args.scanner, args.parser, args.repeat, not args.no_jit)
+            results[key] = row
+            print(f"{key:>22} {row['tokens']:>8} {row['quads']:>7} "
+                  + " ".join(f"{row[p + '_ms']:>10.2f}" for p in PHASES))
+
+    report = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "maquina": platform.machine(),
+            "scanner": args.scanner,
+            "parser": args.parser,
+            "jit": not args.no_jit,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados en {args.out}")
+
+
+def compare(args) -> None:
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)["results"]
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'programa':>22} {'fase':>9} {'base ms':>10} {'actual ms':>10} {'cambio':>8}")
+    for key in sorted(base.keys() & current.keys()):
+        old, new = base[key], current[key]
+        if old["quads"] != new["quads"]:
+            print(f"{key:>22} {'quads':>9} {old['quads']:>10} {new['quads']:>10}   (distinto)")
+        for phase in PHASES:
+            a, b = old[f"{phase}_ms"], new[f"{phase}_ms"]
+            change = (b - a) / a if a > 0 else 0.0
+            # Las fases muy cortas son puro ruido
+            slower = b - a > args.min_ms and change > args.tolerance
+            if slower or args.verbose:
+                mark = "  REGRESION" if slower else ""
+                print(f"{key:>22} {phase:>9} {a:>10.2f} {b:>10.2f} {change:>+7.0%}{mark}")
+            regressions += slower
+    missing = sorted(base.keys() - current.keys())
+    if missing:
+        print(f"Sin medir en la corrida actual: {', '.join(missing)}")
+
+    if regressions:
+        print(f"\n{regressions} regresiones (tolerancia {args.tolerance:.0%}, minimo {args.min_ms} ms)")
+        sys.exit(1)
+    print("\nSin regresiones")
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Tiempos por fase sobre programas generados")
+    sub = argp.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Mide y opcionalmente guarda un JSON")
+    run_p.add_argument("--shapes", nargs="+", choices=list(SHAPES), help="Formas de programa (por omision todas)")
+    run_p.add_argument("--sizes", type=int, nargs="+", help="Tamaños para todas las formas elegidas")
+    run_p.add_argument("--scanner", choices=("ply", "regex"), default="regex")
+    run_p.add_argument("--parser", choices=("ply", "rd"), default="rd")
+    run_p.add_argument("--repeat", type=int, default=3, help="Se guarda el mejor tiempo de N corridas")
+    run_p.add_argument("--no-jit", action="store_true", help="Ejecuta la VM sin el JIT de trazas")
+    run_p.add_argument("--out", help="Archivo JSON de resultados")
+
+    cmp_p = sub.add_parser("compare", help="Compara dos JSON y marca regresiones")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--tolerance", type=float, default=0.15, help="Aumento relativo permitido")
+    cmp_p.add_argument("--min-ms", type=float, default=1.0, help="Ignora diferencias menores a esto")
+    cmp_p.add_argument("--verbose", action="store_true", help="Muestra todas las fases, no solo regresiones")
+
+    args = argp.parse_args(argv)
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# Generación de cuádruplos a partir del AST ya revisado por semantic.py.
+# Cada nodo se visita en el orden en que el parser ejecutaba sus acciones
+# (operandos de izquierda a derecha, la operación más a la derecha primero),
+# por lo que los cuádruplos, temporales y constantes salen idénticos a los que
+# se generaban durante el parseo.
+
+import intermediate as ir
+from ast_nodes import (
+    Assign, AssignIndex, Binary, Block, Call, CallStmt, Const, Function, If, Index,
+    Letrero, Print, Program, Read, Return, Unary, Var, While, deep_nesting,
+)
+from cube_semantic import TIPO_LETRERO
+from intermediate import emit_quad, fill_quad, intern_const, mark_line, new_temp
+from memory import SEG_TEMP, memory_manager
+
+
+class CodeGenerator:
+    def __init__(self, check_bounds: bool = True) -> None:
+        # Verificación de límites en accesos a arreglos (cuádruplo VER)
+        self.check_bounds = check_bounds
+        # Línea del último estatuto generado
+        self.line = 0
+        # Salto inicial para brincar funciones y entrar a main
+        self.main_goto: int | None = None
+        self.main_start: int | None = None
+        self._stmt = {
+            Assign: self._assign,
+            AssignIndex: self._assign_index,
+            If: self._if,
+            While: self._while,
+            Print: self._print,
+            Read: self._read,
+            Return: self._return,
+            CallStmt: self._call_stmt,
+            Block: self._block,
+        }
+        self._expr = {
+            Const: self._const,
+            Var: self._var,
+            Index: self._index,
+            Call: self._call,
+            Unary: self._unary,
+            Binary: self._binary,
+        }
+
+    def generate(self, program: Program) -> None:
+        self.main_goto = emit_quad('GOTO', None, None, None)
+        with deep_nesting():
+            for fn in program.functions:
+                self._function(fn)
+
+            # Rellenar salto al main justo al entrar a INICIO
+            self.main_start = ir.next_quad
+            fill_quad(self.main_goto, ir.next_quad)
+            # Las reservas de arreglos globales y el END no tienen línea propia
+            mark_line(0)
+            # Arreglos globales: se reservan (ALLOC) al entrar a 'inicio'
+            for info in program.arrays:
+                emit_quad('ALLOC', info.dim, None, info.address)
+            self._statements(program.body)
+        mark_line(0)
+        emit_quad('END', None, None, None)
+
+    def _function(self, fn: Function) -> None:
+        self.line = fn.line
+        mark_line(fn.line)
+        # Los temporales empiezan de cero en cada función
+        memory_manager.reset_temps()
+        func_info = fn.info
+        func_info.start_quad = ir.next_quad
+
+        # Los arreglos locales se reservan al inicio de la función
+        for info in fn.arrays:
+            emit_quad('ALLOC', info.dim, None, info.address)
+        self._statements(fn.body)
+
+        # Registrar tama?os de activaci?n (hasta aquí: las llamadas recursivas
+        # dentro del cuerpo ven el tamaño vacío, igual que antes)
+        func_info.locals_size = fn.locals_usage
+        func_info.temps_size = memory_manager.get_usage(SEG_TEMP)
+        mark_line(fn.line)
+        emit_quad('ENDFUNC', None, None, None)
+
+    #  Estatutos
+
+    def _statements(self, body) -> None:
+        for stmt in body:
+            self.line = stmt.line
+            mark_line(stmt.line)
+            self._stmt[type(stmt)](stmt)
+
+    def _assign(self, s: Assign) -> None:
+        place = self._expr[type(s.value)](s.value)
+        emit_quad('=', place, None, s.info.address)
+
+    def _assign_index(self, s: AssignIndex) -> None:
+        index_place = self._expr[type(s.index)](s.index)
+        place = self._expr[type(s.value)](s.value)
+        if self.check_bounds:
+            emit_quad('VER', index_place, None, s.info.dim)
+        # (STOREIDX, valor, indice, base)
+        emit_quad('STOREIDX', place, index_place, s.info.address)
+
+    def _if(self, s: If) -> None:
+        cond_place = self._expr[type(s.cond)](s.cond)
+        # Emitir GOTOF inmediatamente despues de evaluar la condicion
+        false_jump = emit_quad('GOTOF', cond_place, None, None)
+        self._statements(s.then)
+        if s.orelse is None:
+            # Sin else: el GOTOF apunta al final del if
+            fill_quad(false_jump, ir.next_quad)
+            return
+        # El salto sobre el 'sino' es del 'si', no del último estatuto del bloque
+        mark_line(s.line)
+        goto_end = emit_quad('GOTO', None, None, None)
+        fill_quad(false_jump, ir.next_quad)
+        self._statements(s.orelse)
+        fill_quad(goto_end, ir.next_quad)
+
+    def _while(self, s: While) -> None:
+        loop_start = ir.next_quad
+        cond_place = self._expr[type(s.cond)](s.cond)
+        # GOTOF para salir del ciclo si la condici?n es falsa
+        false_jump = emit_quad('GOTOF', cond_place, None, None)
+        self._statements(s.body)
+        # Al final del cuerpo, regresar al inicio (el salto es de la línea del ciclo)
+        mark_line(s.line)
+        emit_quad('GOTO', None, None, loop_start)
+        fill_quad(false_jump, ir.next_quad)
+
+    def _print(self, s: Print) -> None:
+        # Primero se evalúan todos los elementos y luego se imprimen
+        places = [
+            intern_const(item.text, TIPO_LETRERO) if type(item) is Letrero else self._expr[type(item)](item)
+            for item in s.items
+        ]
+        for place in places:
+            emit_quad('PRINT', place, None, None)
+
+    def _read(self, s: Read) -> None:
+        for target in s.targets:
+            info = target.info
+            if type(target) is Var:
+                # (READ, -, -, destino): el tipo del destino decide cómo se interpreta el valor
+                emit_quad('READ', None, None, info.address)
+                continue
+            index_place = self._expr[type(target.index)](target.index)
+            if self.check_bounds:
+                emit_quad('VER', index_place, None, info.dim)
+            temp = new_temp(info.var_type)
+            emit_quad('READ', None, None, temp)
+            emit_quad('STOREIDX', temp, index_place, info.address)
+
+    def _return(self, s: Return) -> None:
+        place = self._expr[type(s.value)](s.value) if s.value is not None else None
+        emit_quad('RETURN', place, None, None)
+
+    def _call_stmt(self, s: CallStmt) -> None:
+        self._call(s.call)
+
+    def _block(self, s: Block) -> None:
+        self._statements(s.body)
+
+    #  Expresiones (cada una regresa la dirección de su resultado)
+
+    def _const(self, e: Const) -> int:
+        return intern_const(e.value, e.tipo)
+
+    def _var(self, e: Var) -> int:
+        return e.info.address
+
+    def _index(self, e: Index) -> int:
+        index_place = self._expr[type(e.index)](e.index)
+        if self.check_bounds:
+            emit_quad('VER', index_place, None, e.info.dim)
+        temp = new_temp(e.tipo)
+        # (LOADIDX, base, indice, temporal)
+        emit_quad('LOADIDX', e.info.address, index_place, temp)
+        return temp
+
+    def _call(self, c: Call) -> int | None:
+        arg_places = [self._expr[type(arg)](arg) for arg in c.args]
+        func_info = c.func
+        total_size = sum(func_info.locals_size.values()) + sum(func_info.temps_size.values())
+        emit_quad('ERA', total_size, None, c.name)
+        for idx, place in enumerate(arg_places, start=1):
+            emit_quad('PARAMETER', place, None, idx)
+        emit_quad('GOSUB', c.name, None, func_info.start_quad)
+
+        if c.tipo == 'nula':
+            return None
+        ret_place = new_temp(c.tipo)
+        emit_quad('RETVAL', c.name, None, ret_place)
+        return ret_place
+
+    def _unary(self, e: Unary) -> int:
+        place = self._expr[type(e.operand)](e.operand)
+        if e.op == '+':
+            # +x no cambia el valor
+            return place
+        temp = new_temp(e.tipo)
+        emit_quad('UMINUS', place, None, temp)
+        return temp
+
+    def _binary(self, e: Binary) -> int:
+        # Igual que en semantic.py: la cadena derecha se recorre sin recursión
+        chain = []
+        left_places = []
+        node = e
+        while type(node) is Binary:
+            chain.append(node)
+            left_places.append(self._expr[type(node.left)](node.left))
+            node = node.right
+        right_place = self._expr[type(node)](node)
+        for node, left_place in zip(reversed(chain), reversed(left_places)):
+            temp = new_temp(node.tipo)
+            emit_quad(node.op, left_place, right_place, temp)
+            right_place = temp
+        return right_place
@@ -0,0 +1,152 @@
+# Instrumentación de la compilación: tiempo y memoria pico por fase (léxico,
+# sintáctico, semántico, generación de cuádruplos) y tamaño de lo generado.
+#   stats = CompileStats()
+#   parser.parse(code, stats=stats)
+#   print(stats.report())   # o stats.as_dict()
+# La memoria se mide con tracemalloc, que hace más lenta la compilación
+# (~2-3x); con track_memory=False solo se toman tiempos.
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List
+
+# Cada cuántos tokens el lexer y el parser llaman a CompileStats.progress_check
+CHECK_EVERY = 1024
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    ms: float = 0.0
+    # Bytes reservados por encima de lo que ya estaba vivo al empezar la fase
+    peak_bytes: int | None = None
+    # Veces que se corrió (semántico/generación se repiten si crece la memoria)
+    runs: int = 0
+
+
+class ReplayLexer:
+    # Entrega tokens ya producidos, para medir el parser sin el scanner
+    # check: se llama con "parse" cada CHECK_EVERY tokens entregados
+    def __init__(self, tokens: List[Any], check: Callable[[str], None] | None = None) -> None:
+        self.tokens = tokens
+        self.lineno = 1
+        self.check = check
+        self._next = iter(())
+
+    def input(self, data: str) -> None:
+        self._next = iter(self.tokens) if self.check is None else _in_blocks(self.tokens, self.check)
+
+    def token(self):
+        return next(self._next, None)
+
+
+def _in_blocks(tokens: List[Any], check: Callable[[str], None]) -> Iterator[Any]:
+    for start in range(0, len(tokens), CHECK_EVERY):
+        if start:
+            check("parse")
+        yield from tokens[start:start + CHECK_EVERY]
+
+
+def tokenize(code: str, lexer, check: Callable[[str], None] | None = None) -> List[Any]:
+    # check: se llama con "lex" cada CHECK_EVERY tokens leídos
+    lexer.lineno = 1
+    lexer.input(code)
+    pending = iter(lexer.token, None)
+    if check is None:
+        return list(pending)
+    tokens: List[Any] = []
+    while True:
+        block = list(islice(pending, CHECK_EVERY))
+        tokens += block
+        if len(block) < CHECK_EVERY:
+            return tokens
+        check("lex")
+
+
+@dataclass
+class CompileStats:
+    track_memory: bool = True
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    tokens: int = 0
+    quads: int = 0
+    constants: int = 0
+    functions: int = 0
+    # Temporales por tipo sumando todas las funciones y el main
+    temps: Dict[str, int] = field(default_factory=dict)
+    # Intentos de compilación (más de 1 si hubo que agrandar la memoria)
+    layouts: int = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stats = self.phases.setdefault(name, PhaseStats(name))
+        if self.track_memory:
+            # Se importa solo aquí: cuesta ~4 ms y el compilador no lo necesita sin --stats
+            import tracemalloc
+        started = self.track_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if self.track_memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.ms += (time.perf_counter() - start) * 1e3
+            stats.runs += 1
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                stats.peak_bytes = max(stats.peak_bytes or 0, peak)
+            if started:
+                tracemalloc.stop()
+
+    def progress_check(self) -> Callable[[str], None] | None:
+        # Qué llamar a media fase (ver CHECK_EVERY); None = nada, y el lexer y
+        # el parser corren sin revisiones
+        return None
+
+    def record_output(self, quads: int, constants: int, func_dir, main_temps: Dict[str, int]) -> None:
+        self.quads = quads
+        self.constants = constants
+        functions = list(func_dir.all_functions().values())
+        self.functions = len(functions)
+        temps = dict(main_temps)
+        for info in functions:
+            for tipo, count in info.temps_size.items():
+                temps[tipo] = temps.get(tipo, 0) + count
+        self.temps = temps
+
+    @property
+    def total_ms(self) -> float:
+        return sum(p.ms for p in self.phases.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": {
+                p.name: {"ms": round(p.ms, 3), "peak_bytes": p.peak_bytes, "runs": p.runs}
+                for p in self.phases.values()
+            },
+            "total_ms": round(self.total_ms, 3),
+            "tokens": self.tokens,
+            "quads": self.quads,
+            "constants": self.constants,
+            "functions": self.functions,
+            "temps": dict(self.temps),
+            "layouts": self.layouts,
+        }
+
+    def report(self) -> str:
+        lines = ["ESTADISTICAS DE COMPILACION", f"  {'fase':<10} {'ms':>9} {'pico KiB':>10} {'veces':>6}"]
+        for p in self.phases.values():
+            peak = f"{p.peak_bytes / 1024:10.1f}" if p.peak_bytes is not None else f"{'-':>10}"
+            lines.append(f"  {p.name:<10} {p.ms:9.2f} {peak} {p.runs:>6}")
+        lines.append(f"  {'total':<10} {self.total_ms:9.2f}")
+        temps = ", ".join(f"{tipo} {n}" for tipo, n in self.temps.items() if n) or "0"
+        lines.append(f"  tokens {self.tokens}, cuadruplos {self.quads}, constantes {self.constants}, "
+                     f"funciones {self.functions}")
+        lines.append(f"  temporales: {temps}")
+        if self.layouts > 1:
+            lines.append(f"  memoria agrandada: {self.layouts - 1} veces")
+        return "\n".join(lines)
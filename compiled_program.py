@@ -0,0 +1,81 @@
+# Programa compilado e inmutable: cuádruplos, constantes, funciones y
+# distribución de memoria, más las llamadas ya resueltas para la VM.
+# Se construye una vez y lo comparten todas las VirtualMachine que lo
+# ejecuten (en hilos o una tras otra); cada VM solo crea su propia memoria.
+#   program = parser.compile_program(code)
+#   VirtualMachine.from_program(program).run()
+
+from array import array
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+from intermediate import NO_OPERAND, OPCODE_OF, QuadStore
+from memory import SegmentLayout
+from tabla_symbolos import FunctionDirectory, FunctionInfo
+
+OP_ERA = OPCODE_OF['ERA']
+OP_PARAMETER = OPCODE_OF['PARAMETER']
+OP_RETURN = OPCODE_OF['RETURN']
+OP_ENDFUNC = OPCODE_OF['ENDFUNC']
+
+
+@dataclass(frozen=True)
+class CompiledProgram:
+    # Las columnas (array o memoryview de una imagen) las leen todas las VMs
+    # que comparten el programa y no se deben modificar: para cambiar el código
+    # se construye otro CompiledProgram (como hace pgo.Optimizer). No se
+    # envuelven en vistas de solo lectura porque indexarlas hace más lento el ciclo.
+    quads: QuadStore
+    # Dirección -> valor (MappingProxyType); cada VM se hace su propio dict
+    const_by_addr: Mapping[int, Any]
+    functions: Mapping[str, FunctionInfo]
+    layout: SegmentLayout
+    # Datos de cada llamada resueltos al cargar (ver link_calls); tampoco se modifican
+    links: array
+
+    @classmethod
+    def build(
+        cls,
+        quads: QuadStore | List[Tuple[Any, Any, Any, Any]],
+        const_table_map: Dict[Tuple[str, Any], int],
+        func_dir: FunctionDirectory,
+        layout: SegmentLayout,
+    ) -> "CompiledProgram":
+        # Se copian los cuádruplos: los de intermediate se reutilizan en la siguiente compilación
+        quads = quads.copy() if isinstance(quads, QuadStore) else QuadStore.from_quads(quads)
+        functions = func_dir.all_functions()
+        return cls(
+            quads=quads,
+            const_by_addr=MappingProxyType({addr: val for (_typ, val), addr in const_table_map.items()}),
+            functions=MappingProxyType(functions),
+            layout=layout,
+            links=link_calls(quads, functions),
+        )
+
+
+def link_calls(code: QuadStore, functions: Mapping[str, FunctionInfo]) -> array:
+    # Por cuádruplo, lo que antes se buscaba en cada llamada (NO_OPERAND en los demás):
+    #   PARAMETER -> dirección del parámetro en el marco de la función (NO_OPERAND si sobra)
+    #   RETURN    -> ip del ENDFUNC que le sigue (o el final del programa)
+    # Son enteros para que quepan en la imagen compartida (ver program_image)
+    ops = code.ops
+    links = array('i', [NO_OPERAND]) * len(ops)
+    params: List[Tuple[str, str, int]] = []
+    end_ip = len(ops)
+    # De atrás hacia adelante para conocer el siguiente ENDFUNC
+    for ip in range(len(ops) - 1, -1, -1):
+        op = ops[ip]
+        if op == OP_ENDFUNC:
+            end_ip = ip
+        elif op == OP_RETURN:
+            links[ip] = end_ip
+    for ip, op in enumerate(ops):
+        if op == OP_ERA:
+            finfo = functions.get(code.decode(code.res[ip]))
+            params = finfo.parameters if finfo else []
+        elif op == OP_PARAMETER:
+            idx = code.res[ip] - 1
+            if 0 <= idx < len(params):
+                links[ip] = params[idx][2]
+    return links
@@ -0,0 +1,96 @@
+# Scanner alterno de una sola expresión regular.
+# Todas las reglas de scanner.py se juntan en una expresión maestra con grupos
+# con nombre y los tokens se generan de forma perezosa: los espacios se
+# consumen dentro del mismo match, los operadores y delimitadores comparten un
+# grupo (el tipo sale de un diccionario) y el número de línea se calcula
+# contando saltos solo entre tokens. Se puede pasar al parser como
+# lexer=FastLexer().
+
+import re
+from typing import Dict, Iterator
+
+import scanner
+from scanner import reserved
+
+# Operadores y delimitadores tomados de las reglas t_<TOKEN> de scanner.py
+SYMBOLS: Dict[str, str] = {
+    getattr(scanner, f"t_{name}").replace("\\", ""): name
+    for name in scanner.tokens
+    if isinstance(getattr(scanner, f"t_{name}", None), str)
+}
+
+# Los símbolos de dos caracteres van primero (máxima voracidad)
+_symbols = "|".join(re.escape(s) for s in sorted(SYMBOLS, key=len, reverse=True))
+_spaces = "[" + re.escape(scanner.t_ignore) + r"\n]"
+
+MASTER_RE = re.compile(
+    f"{_spaces}*(?:"
+    rf"(?P<ID>{scanner.t_ID.__doc__})"
+    f"|(?P<SIMBOLO>{_symbols})"
+    rf"|(?P<CTE_FLOT>{scanner.t_CTE_FLOT.__doc__})"
+    rf"|(?P<CTE_ENT>{scanner.t_CTE_ENT.__doc__})"
+    rf"|(?P<LETRERO>{scanner.t_LETRERO.__doc__})"
+    f"|(?P<ILEGAL>(?!{_spaces}).))",
+    re.DOTALL,
+)
+
+
+class Token:
+    # Mismos atributos que LexToken de PLY, sin el resto de la maquinaria
+    __slots__ = ("type", "value", "lineno", "lexpos")
+
+    def __init__(self, type: str, value, lineno: int, lexpos: int) -> None:
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self) -> str:
+        return f"Token({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class FastLexer:
+    def __init__(self) -> None:
+        self.lineno = 1
+        self._tokens: Iterator[Token] = iter(())
+
+    def input(self, data: str) -> None:
+        self._tokens = self.tokenize(data)
+
+    def token(self) -> Token | None:
+        return next(self._tokens, None)
+
+    def __iter__(self) -> Iterator[Token]:
+        return self._tokens
+
+    def tokenize(self, data: str) -> Iterator[Token]:
+        # El número de línea empieza donde lo dejó quien llamó (el parser lo pone en 1)
+        lineno = self.lineno
+        last = 0
+        count_lines = data.count
+        get_reserved = reserved.get
+        symbols = SYMBOLS
+        for m in MASTER_RE.finditer(data):
+            kind = m.lastgroup
+            start = m.start(kind)
+            value = m.group(kind)
+            if kind == 'ID':
+                kind = get_reserved(value, 'ID')
+            elif kind == 'SIMBOLO':
+                kind = symbols[value]
+            elif kind == 'CTE_ENT':
+                value = int(value)
+            elif kind == 'CTE_FLOT':
+                value = float(value)
+            if start != last:
+                lineno += count_lines('\n', last, start)
+                self.lineno = lineno
+                last = start
+            if kind == 'ILEGAL':
+                raise SyntaxError(f"Carácter ilegal '{value}' en línea {lineno}")
+            yield Token(kind, value, lineno, start)
+        self.lineno = lineno + count_lines('\n', last)
+
+
+def tokenize(data: str) -> Iterator[Token]:
+    return FastLexer().tokenize(data)
@@ -0,0 +1,54 @@
+# Lector de entrada con buffer para la instrucción 'lee'.
+# Lee la entrada (stdin o un archivo) en bloques de tamaño fijo y la parte en
+# tokens separados por espacios; cada lectura solo avanza un índice en la
+# lista de tokens del bloque actual, sin cargar todo el archivo a memoria.
+
+import sys
+from typing import BinaryIO, List
+
+CHUNK_SIZE = 1 << 16
+
+
+class BufferedNumberReader:
+    def __init__(self, stream: BinaryIO | None = None, chunk_size: int = CHUNK_SIZE) -> None:
+        self._stream = stream if stream is not None else sys.stdin.buffer
+        self._chunk_size = chunk_size
+        self._tokens: List[bytes] = []
+        self._pos = 0
+        # Pedazo de token que quedó cortado al final del bloque anterior
+        self._tail = b""
+        self._eof = False
+
+    def _refill(self) -> None:
+        while self._pos >= len(self._tokens):
+            if self._eof:
+                raise EOFError("Fin de la entrada")
+            chunk = self._stream.read(self._chunk_size)
+            data = self._tail + chunk
+            if not chunk:
+                self._eof = True
+                self._tail = b""
+                self._tokens = data.split()
+            else:
+                # Lo que está después del último espacio puede seguir en el siguiente bloque
+                cut = max(data.rfind(b" "), data.rfind(b"\n"), data.rfind(b"\t"), data.rfind(b"\r"))
+                self._tokens = data[:cut + 1].split()
+                self._tail = data[cut + 1:]
+            self._pos = 0
+
+    def next_token(self) -> bytes:
+        if self._pos >= len(self._tokens):
+            self._refill()
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def read_int(self) -> int:
+        return int(self.next_token())
+
+    def read_float(self) -> float:
+        return float(self.next_token())
+
+    def read_number(self, tipo: str) -> int | float:
+        # El tipo de la variable destino decide la conversión
+        return self.read_float() if tipo == "flotante" else self.read_int()
@@ -1,6 +1,9 @@
 # Cuádruplos
 
-from typing import Any, Dict, List, Tuple
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple
+
+from line_table import LineTable
 from memory import (
     SEG_CONST,
     SEG_GLOBAL,
@@ -28,7 +31,123 @@ PJumps: List[int] = []
 # Cada cuadruplo es una tupla: (op, arg1, arg2, result)
 Quadruple = Tuple[str, Any, Any, Any]
 
-quads: List[Quadruple] = []
+# Códigos de operación (el índice es el opcode numérico)
+OPCODES = (
+    '+', '-', '*', '/', '>', '<', '>=', '<=', '!=', '==',
+    'UMINUS', '=', 'PRINT', 'GOTOF', 'GOTO',
+    'ERA', 'PARAMETER', 'GOSUB', 'RETURN', 'RETVAL', 'ENDFUNC', 'END',
+    'ALLOC', 'VER', 'LOADIDX', 'STOREIDX', 'READ',
+)
+# Superinstrucciones que elige pgo.py: comparación y GOTOF en un cuádruplo.
+# ('GOTOF<', a, b, destino) salta a destino si no se cumple a < b. Van al
+# final para que los opcodes de arriba no cambien.
+FUSED_BRANCHES: Dict[str, str] = {f"GOTOF{op}": op for op in ('>', '<', '>=', '<=', '!=', '==')}
+OPCODES += tuple(FUSED_BRANCHES)
+OPCODE_OF: Dict[str, int] = {name: code for code, name in enumerate(OPCODES)}
+
+# Operando vacío (None); los simbólicos se guardan como -2 - índice en la tabla
+NO_OPERAND = -1
+
+
+class QuadStore:
+    #Fila de cuádruplos en columnas: opcode en array('B') y operandos en array('i').
+    #Los operandos simbólicos (nombres de función) van en una tabla aparte.
+    #La línea de código de cada cuádruplo va en 'lines' (ver line_table).
+
+    def __init__(self) -> None:
+        self.ops = array('B')
+        self.arg1 = array('i')
+        self.arg2 = array('i')
+        self.res = array('i')
+        self.symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self.lines = LineTable()
+
+    @classmethod
+    def from_quads(cls, quad_list) -> "QuadStore":
+        store = cls()
+        for op, arg1, arg2, result in quad_list:
+            store.emit(op, arg1, arg2, result)
+        return store
+
+    @classmethod
+    def from_columns(cls, ops, arg1, arg2, res, symbols: List[str], lines: LineTable | None = None) -> "QuadStore":
+        # Columnas ya codificadas; pueden ser memoryview sobre memoria compartida (ver program_image)
+        store = cls()
+        store.ops, store.arg1, store.arg2, store.res = ops, arg1, arg2, res
+        store.symbols = list(symbols)
+        store._symbol_ids = {name: i for i, name in enumerate(store.symbols)}
+        if lines is not None:
+            store.lines = lines
+        return store
+
+    def copy(self) -> "QuadStore":
+        store = QuadStore()
+        store.ops, store.arg1, store.arg2, store.res = self.ops[:], self.arg1[:], self.arg2[:], self.res[:]
+        store.symbols = list(self.symbols)
+        store._symbol_ids = dict(self._symbol_ids)
+        store.lines = self.lines.copy()
+        return store
+
+    def encode(self, operand: Any) -> int:
+        if operand is None:
+            return NO_OPERAND
+        if isinstance(operand, str):
+            sym = self._symbol_ids.get(operand)
+            if sym is None:
+                sym = len(self.symbols)
+                self.symbols.append(operand)
+                self._symbol_ids[operand] = sym
+            return -2 - sym
+        if operand < 0:
+            raise ValueError(f"Operando negativo no soportado: {operand}")
+        return operand
+
+    def decode(self, code: int) -> Any:
+        if code >= 0:
+            return code
+        if code == NO_OPERAND:
+            return None
+        return self.symbols[-2 - code]
+
+    def emit(self, op: str, arg1: Any, arg2: Any, result: Any) -> int:
+        self.ops.append(OPCODE_OF[op])
+        self.arg1.append(self.encode(arg1))
+        self.arg2.append(self.encode(arg2))
+        self.res.append(self.encode(result))
+        return len(self.ops) - 1
+
+    def append(self, quad: Quadruple) -> None:
+        self.emit(*quad)
+
+    def set_result(self, index: int, result: Any) -> None:
+        self.res[index] = self.encode(result)
+
+    def clear(self) -> None:
+        del self.ops[:], self.arg1[:], self.arg2[:], self.res[:]
+        self.symbols.clear()
+        self._symbol_ids.clear()
+        self.lines.clear()
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __getitem__(self, index: int) -> Quadruple:
+        if index < 0:
+            index += len(self.ops)
+        return (
+            OPCODES[self.ops[index]],
+            self.decode(self.arg1[index]),
+            self.decode(self.arg2[index]),
+            self.decode(self.res[index]),
+        )
+
+    def __iter__(self) -> Iterator[Quadruple]:
+        for i in range(len(self.ops)):
+            yield self[i]
+
+
+quads: QuadStore = QuadStore()
 
 # Apuntador al siguiente cuadruplo (índice)
 next_quad: int = 0
@@ -55,12 +174,12 @@ def release_temp(tipo: str, address: int) -> None:
     memory_manager.free_temp(tipo, address)
 
 
-def alloc_global(tipo: str) -> int:
-    return memory_manager.allocate(SEG_GLOBAL, tipo)
+def alloc_global(tipo: str, count: int = 1) -> int:
+    return memory_manager.allocate(SEG_GLOBAL, tipo, count)
 
 
-def alloc_local(tipo: str) -> int:
-    return memory_manager.allocate(SEG_LOCAL, tipo)
+def alloc_local(tipo: str, count: int = 1) -> int:
+    return memory_manager.allocate(SEG_LOCAL, tipo, count)
 
 
 def intern_const(value: Any, tipo: str) -> int:
@@ -78,17 +197,20 @@ def intern_const(value: Any, tipo: str) -> int:
 def emit_quad(op: str, arg1: Any, arg2: Any, result: Any) -> int:
     #Agrega un cuadruplo a la fila de cuádruplos y regresa su índice.
     global next_quad
-    quad = (op, arg1, arg2, result)
-    quads.append(quad)
+    quads.emit(op, arg1, arg2, result)
     idx = next_quad
     next_quad += 1
     return idx
 
 
+def mark_line(line: int) -> None:
+    #Los cuádruplos que se emitan desde aquí son de esta línea del código.
+    quads.lines.mark(next_quad, line)
+
+
 def fill_quad(index: int, result: Any) -> None:
 #Cuadruplo existente.
-    op, arg1, arg2, _ = quads[index]
-    quads[index] = (op, arg1, arg2, result)
+    quads.set_result(index, result)
 
 
 def reset_ir() -> None:
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('COMA', 'CORA_ABRE', 'CORA_CIERRA', 'CTE_ENT', 'CTE_FLOT', 'DOS_PUNTOS', 'ENTERO', 'ESCRIBE', 'FIN', 'FLOTANTE', 'HAZ', 'ID', 'INICIO', 'LEE', 'LETRERO', 'LLAVE_ABRE', 'LLAVE_CIERRA', 'MIENTRAS', 'NULA', 'OP_ASIG', 'OP_DIF', 'OP_DIV', 'OP_IGUAL', 'OP_MAYOR', 'OP_MAYORIGUAL', 'OP_MENOR', 'OP_MENORIGUAL', 'OP_MULT', 'OP_RESTA', 'OP_SUMA', 'PAR_ABRE', 'PAR_CIERRA', 'PROGRAMA', 'PUNTO_Y_COMA', 'RETURN', 'SI', 'SINO', 'VARS'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_LETRERO>"([^\\\\\\n]|(\\\\.))*?")|(?P<t_CTE_FLOT>[0-9]+\\.[0-9]+)|(?P<t_CTE_ENT>[0-9]+)|(?P<t_ID>[A-Za-z][A-Za-z0-9_]*)|(?P<t_newline>\\n+)|(?P<t_CORA_ABRE>\\[)|(?P<t_CORA_CIERRA>\\])|(?P<t_LLAVE_ABRE>\\{)|(?P<t_LLAVE_CIERRA>\\})|(?P<t_OP_DIF>!=)|(?P<t_OP_IGUAL>==)|(?P<t_OP_MAYORIGUAL>>=)|(?P<t_OP_MENORIGUAL><=)|(?P<t_OP_MULT>\\*)|(?P<t_OP_SUMA>\\+)|(?P<t_PAR_ABRE>\\()|(?P<t_PAR_CIERRA>\\))|(?P<t_COMA>,)|(?P<t_DOS_PUNTOS>:)|(?P<t_OP_ASIG>=)|(?P<t_OP_DIV>/)|(?P<t_OP_MAYOR>>)|(?P<t_OP_MENOR><)|(?P<t_OP_RESTA>-)|(?P<t_PUNTO_Y_COMA>;)', [None, ('t_LETRERO', 'LETRERO'), None, None, ('t_CTE_FLOT', 'CTE_FLOT'), ('t_CTE_ENT', 'CTE_ENT'), ('t_ID', 'ID'), ('t_newline', 'newline'), (None, 'CORA_ABRE'), (None, 'CORA_CIERRA'), (None, 'LLAVE_ABRE'), (None, 'LLAVE_CIERRA'), (None, 'OP_DIF'), (None, 'OP_IGUAL'), (None, 'OP_MAYORIGUAL'), (None, 'OP_MENORIGUAL'), (None, 'OP_MULT'), (None, 'OP_SUMA'), (None, 'PAR_ABRE'), (None, 'PAR_CIERRA'), (None, 'COMA'), (None, 'DOS_PUNTOS'), (None, 'OP_ASIG'), (None, 'OP_DIV'), (None, 'OP_MAYOR'), (None, 'OP_MENOR'), (None, 'OP_RESTA'), (None, 'PUNTO_Y_COMA')])]}
+_lexstateignore = {'INITIAL': ' \t\r'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
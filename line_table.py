@@ -0,0 +1,172 @@
+# Tabla de líneas: a qué línea del código fuente pertenece cada cuádruplo.
+# Se guardan tramos (primer ip, línea) de cuádruplos seguidos con la misma
+# línea, codificados como diferencias contra el tramo anterior en varints
+# (el ip siempre avanza; la línea puede bajar y va en zigzag). Cada
+# CHECKPOINT tramos se guarda el tramo en absoluto: line_of() busca el punto
+# con bisect y decodifica a lo más CHECKPOINT tramos, O(log n).
+#   table.mark(ip, line)        # al generar: desde ip, los cuádruplos son de 'line'
+#   table.line_of(ip)           # en ejecución (perfiles, errores, trazas)
+# Línea 0 = sin línea (salto inicial al main, END).
+
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Sequence, Tuple
+
+CHECKPOINT = 64
+
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(data, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+class LineTable:
+    def __init__(self) -> None:
+        self.data = bytearray()
+        # Por cada punto de control: ip y línea de su tramo y dónde empieza en 'data'
+        self.cp_ip = array('i')
+        self.cp_line = array('i')
+        self.cp_offset = array('i')
+        self.runs = 0
+        # Último tramo (para codificar el siguiente) y dónde empieza en 'data'
+        self._ip = 0
+        self._line = 0
+        self._start = 0
+
+    @classmethod
+    def from_columns(cls, data, cp_ip, cp_line, cp_offset, runs: int) -> "LineTable":
+        # Columnas ya codificadas, solo para consultar; pueden ser memoryview
+        # de solo lectura (ver program_image)
+        table = cls()
+        table.data, table.cp_ip, table.cp_line, table.cp_offset = data, cp_ip, cp_line, cp_offset
+        table.runs = runs
+        return table
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[int]) -> "LineTable":
+        # Desde la línea de cada cuádruplo; para pasadas que reordenan o
+        # reemplazan cuádruplos: LineTable.from_lines(linea_de_cada_ip_nuevo)
+        table = cls()
+        for ip, line in enumerate(lines):
+            table.mark(ip, line)
+        return table
+
+    def copy(self) -> "LineTable":
+        table = LineTable()
+        table.data = bytearray(self.data)
+        table.cp_ip = array('i', self.cp_ip)
+        table.cp_line = array('i', self.cp_line)
+        table.cp_offset = array('i', self.cp_offset)
+        table.runs, table._ip, table._line, table._start = self.runs, self._ip, self._line, self._start
+        return table
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def mark(self, ip: int, line: int) -> None:
+        # Los ip llegan en orden; repetir la línea del tramo actual no agrega nada
+        if self.runs:
+            if line == self._line:
+                return
+            if ip == self._ip:
+                # El tramo actual quedó sin cuádruplos (p.ej. un bloque vacío): se reemplaza
+                self._drop_last()
+                if self.runs and line == self._line:
+                    return
+        start = len(self.data)
+        if self.runs % CHECKPOINT == 0:
+            self.cp_ip.append(ip)
+            self.cp_line.append(line)
+            self.cp_offset.append(start)
+        _put_varint(self.data, ip - self._ip)
+        delta = line - self._line
+        _put_varint(self.data, delta << 1 if delta >= 0 else (-delta << 1) - 1)
+        self.runs += 1
+        self._ip, self._line, self._start = ip, line, start
+
+    def _drop_last(self) -> None:
+        del self.data[self._start:]
+        self.runs -= 1
+        if self.runs % CHECKPOINT == 0:
+            del self.cp_ip[-1], self.cp_line[-1], self.cp_offset[-1]
+        self._ip = self._line = self._start = 0
+        if self.runs:
+            # El nuevo último tramo se decodifica desde su punto de control
+            k = len(self.cp_ip) - 1
+            ip, line, start = self.cp_ip[k], self.cp_line[k], self.cp_offset[k]
+            pos = self._skip_run(start)
+            while pos < len(self.data):
+                start = pos
+                d_ip, pos = _get_varint(self.data, pos)
+                d_line, pos = _get_varint(self.data, pos)
+                ip += d_ip
+                line += _unzigzag(d_line)
+            self._ip, self._line, self._start = ip, line, start
+
+    def _skip_run(self, pos: int) -> int:
+        _, pos = _get_varint(self.data, pos)
+        _, pos = _get_varint(self.data, pos)
+        return pos
+
+    def line_of(self, ip: int) -> int:
+        # Línea del cuádruplo ip (0 si la tabla está vacía)
+        k = bisect_right(self.cp_ip, ip) - 1
+        if k < 0:
+            return 0
+        cur, line = self.cp_ip[k], self.cp_line[k]
+        data = self.data
+        pos = self._skip_run(self.cp_offset[k])
+        end = self.cp_offset[k + 1] if k + 1 < len(self.cp_offset) else len(data)
+        while pos < end:
+            d_ip, pos = _get_varint(data, pos)
+            if cur + d_ip > ip:
+                break
+            d_line, pos = _get_varint(data, pos)
+            cur += d_ip
+            line += _unzigzag(d_line)
+        return line
+
+    def runs_list(self) -> List[Tuple[int, int]]:
+        # Todos los tramos (primer ip, línea), en orden
+        out: List[Tuple[int, int]] = []
+        data = self.data
+        ip = line = pos = 0
+        while pos < len(data):
+            d_ip, pos = _get_varint(data, pos)
+            d_line, pos = _get_varint(data, pos)
+            ip += d_ip
+            line += _unzigzag(d_line)
+            out.append((ip, line))
+        return out
+
+    def expand(self, n_quads: int) -> List[int]:
+        # Línea de cada uno de los n_quads cuádruplos
+        lines = [0] * n_quads
+        runs = self.runs_list()
+        for i, (ip, line) in enumerate(runs):
+            end = min(runs[i + 1][0] if i + 1 < len(runs) else n_quads, n_quads)
+            if ip < end:
+                lines[ip:end] = [line] * (end - ip)
+        return lines
+
+    def reorder(self, order: Sequence[int]) -> "LineTable":
+        # Para pasadas que mueven o duplican cuádruplos: order[ip_nuevo] = ip original
+        lines = self.expand(max(order) + 1 if order else 0)
+        return LineTable.from_lines(lines[ip] for ip in order)
@@ -1,11 +1,13 @@
 import argparse
-from pathlib import Path
+import os
 import sys
+from typing import TYPE_CHECKING
 
-from parser import parse, get_function_directory
 from intermediate import quads, const_table
-from tabla_symbolos import SemanticError
-from VM_Patito import VirtualMachine
+
+# La VM, el programa compilado y la tabla de símbolos (dataclasses) se cargan en run_file; ver startup_bench
+if TYPE_CHECKING:
+    from compiled_program import CompiledProgram
 
 def print_const_table() -> None:
     print("TABLA DE CONSTANTES")
@@ -28,34 +30,222 @@ def print_quads() -> None:
         print(f"  {i}: ({op}, {op1_str}, {op2_str}, {res_str})")
 
 
-def run_file(src_path: Path) -> None:
+def print_vm_stats(telemetry: dict) -> None:
+    print("ESTADISTICAS DE LA VM")
+    print(f"  llamadas {telemetry['calls']}, profundidad maxima {telemetry['peak_call_depth']}, "
+          f"marcos vivos maximo {telemetry['peak_live_frames']}")
+    print(f"  argumentos por llamada maximo {telemetry['peak_call_args']}")
+    if telemetry["steps"] is not None:
+        print(f"  cuadruplos ejecutados {telemetry['steps']}, bytes escritos {telemetry['output_bytes']}")
+    for name in ("global_slots", "frame_slots"):
+        slots = ", ".join(f"{seg} {n}" for seg, n in telemetry[name].items()) or "0"
+        print(f"  {name}: {slots}")
+    print(f"  bytes aprox.: globales {telemetry['global_bytes']}, marco mayor {telemetry['frame_bytes']}, "
+          f"pila maxima {telemetry['peak_stack_bytes']}")
+    if telemetry["samples"]:
+        print(f"  muestras: {len(telemetry['samples'])}")
+
+
+def optimize_with_profile(program: "CompiledProgram", profile_path: str) -> "CompiledProgram":
+    # PGO con el perfil de una corrida anterior (ver pgo.py); si no sirve se ejecuta sin optimizar
+    from pgo import Optimizer, load_profile
+
+    try:
+        profile = load_profile(profile_path, program)
+    except (OSError, ValueError) as e:
+        print(f"No se pudo usar el perfil '{profile_path}': {e}; se ejecuta sin PGO", file=sys.stderr)
+        return program
+    optimizer = Optimizer(program, profile)
+    program = optimizer.run()
+    print(optimizer.report())
+    return program
+
+
+def run_lanes(lanes: int, lane_vars: list[str], input_stream=None) -> None:
+    # Modo por lotes: cada variable de lane_vars recibe el indice del carril
+    from parser import get_function_directory, get_global_var_table
+    from VM_Lotes import BatchVirtualMachine
+
+    inputs = {name: range(lanes) for name in lane_vars}
+    vm = BatchVirtualMachine(
+        quads, const_table, get_function_directory(), lanes,
+        inputs=inputs, global_vars=get_global_var_table(), input_stream=input_stream,
+    )
+    result = vm.run()
+    for lane, lines in enumerate(result["output"]):
+        print(f"[carril {lane}]")
+        for value in lines:
+            print(value)
+
+
+def run_python_backend(input_stream=None) -> None:
+    # Motor alterno: traduce los cuadruplos a Python; si no tienen forma estructurada usa la VM
+    from parser import get_function_directory
+    from transpiler import PythonTranspiler, TranspileError
+    from VM_Patito import VirtualMachine
+
+    try:
+        backend = PythonTranspiler(quads, const_table, get_function_directory(), input_stream=input_stream)
+    except TranspileError as e:
+        print(f"No se pudo traducir a Python ({e}); se usa la VM", file=sys.stderr)
+        VirtualMachine(quads, const_table, get_function_directory(), input_stream=input_stream).run()
+        return
+    backend.run()
+
+
+def run_file(
+    src_path: str,
+    *,
+    lanes: int = 0,
+    lane_vars: list[str] | None = None,
+    engine: str = "vm",
+    jit: bool = True,
+    check_bounds: bool = True,
+    input_path: str | None = None,
+    scanner: str = "ply",
+    frontend: str = "ply",
+    stats: bool = False,
+    sandbox: bool = False,
+    profile_ms: float | None = None,
+    profile_steps: int | None = None,
+    profile_out: str | None = None,
+    coverage: bool = False,
+    coverage_out: str | None = None,
+    trace_out: str | None = None,
+    trace_size: int = 4096,
+    pgo_record: str | None = None,
+    pgo_use: str | None = None,
+) -> None:
     print(f"\n=== COMPILANDO Y EJECUTANDO {src_path} ===")
-    if not src_path.exists():
+    if not os.path.exists(src_path):
         print(f"No se encontro el archivo: {src_path}", file=sys.stderr)
         return
     try:
-        code = src_path.read_text(encoding="utf-8")
+        with open(src_path, encoding="utf-8") as f:
+            code = f.read()
     except Exception as e:
         print(f"No se pudo leer '{src_path}': {e}", file=sys.stderr)
         return
 
+    # Fuera del try: sus errores se atrapan abajo
+    from tabla_symbolos import SemanticError
+    from VM_Patito import PatitoRuntimeError, VirtualMachine
+
+    # Entrada de 'lee': el archivo indicado o stdin
+    input_stream = None
+    if input_path is not None:
+        try:
+            input_stream = open(input_path, "rb")
+        except OSError as e:
+            print(f"No se pudo abrir la entrada '{input_path}': {e}", file=sys.stderr)
+            return
+
+    limits = None
     try:
-        parse(code)
+        # El parser (tablas LALR, AST, análisis semántico) se importa hasta que hay algo que compilar
+        from parser import parse, get_function_directory
+
+        lexer = None
+        if scanner == "regex":
+            from fast_scanner import FastLexer
+            lexer = FastLexer()
+        compile_stats = None
+        if sandbox:
+            # Límites para código que no es de confianza (ver sandbox.py)
+            from sandbox import CompileDeadline, SandboxLimits, compile_program
+            limits = SandboxLimits.strict()
+            compile_stats = CompileDeadline() if stats else None
+            compile_program(code, limits, check_bounds, lexer, frontend, stats=compile_stats)
+        else:
+            if stats:
+                from compile_stats import CompileStats
+                compile_stats = CompileStats()
+            parse(code, check_bounds=check_bounds, lexer=lexer, frontend=frontend, stats=compile_stats)
+        if compile_stats is not None:
+            print(compile_stats.report())
         print("RESULTADOS")
         print_const_table()
         print_quads()
         print("-" * 42)
         print("Maquina Virtual")
-        vm = VirtualMachine(quads, const_table, get_function_directory())
-        vm.run()
-    except (SemanticError, SyntaxError) as e:
+        if lanes > 0:
+            run_lanes(lanes, lane_vars or [], input_stream)
+        elif engine == "python":
+            run_python_backend(input_stream)
+        else:
+            # Observadores de la corrida (ver vm_hooks.py)
+            hooks = []
+            profiler = cover = None
+            if profile_ms is not None or profile_steps is not None:
+                from profiler import Profiler
+                profiler = Profiler(interval_ms=profile_ms, every_steps=profile_steps)
+                hooks.append(profiler)
+            if coverage:
+                from quad_coverage import Coverage
+                cover = Coverage()
+                hooks.append(cover)
+            tracer = None
+            if trace_out is not None:
+                import signal
+                from vm_trace import Tracer
+                tracer = Tracer(trace_size, trace_out, getattr(signal, "SIGUSR1", None))
+                hooks.append(tracer)
+            recorder = None
+            if pgo_record is not None:
+                from pgo import ProfileRecorder
+                recorder = ProfileRecorder()
+                hooks.append(recorder)
+            from compiled_program import CompiledProgram
+            from memory import memory_manager
+            from tracing_jit import DEFAULT_THRESHOLD
+            program = CompiledProgram.build(quads, const_table, get_function_directory(), memory_manager.layout)
+            if pgo_use is not None:
+                program = optimize_with_profile(program, pgo_use)
+            vm = VirtualMachine.from_program(
+                program,
+                jit_threshold=DEFAULT_THRESHOLD if jit else None,
+                input_stream=input_stream,
+                limits=limits,
+                hooks=hooks,
+            )
+            try:
+                result = vm.run()
+            finally:
+                # También se reporta lo que se alcanzó a ver antes de un error
+                if profiler is not None:
+                    print(profiler.report())
+                    if profile_out is not None:
+                        profiler.write_collapsed(profile_out)
+                if cover is not None:
+                    print(cover.report())
+                    if coverage_out is not None:
+                        with open(coverage_out, "w", encoding="utf-8") as f:
+                            f.write(cover.annotate(code))
+                if tracer is not None and tracer.dumped is not None:
+                    print(f"Traza de los ultimos {min(tracer.total, tracer.capacity)} cuadruplos en {tracer.dumped} "
+                          f"(python vm_trace.py {tracer.dumped})", file=sys.stderr)
+                if recorder is not None and recorder.program is not None:
+                    recorder.save(pgo_record)
+                    print(f"Perfil de PGO en {pgo_record} (usalo con --pgo-use {pgo_record})", file=sys.stderr)
+            if stats:
+                print_vm_stats(result["telemetry"])
+    except (SemanticError, SyntaxError, PatitoRuntimeError) as e:
         print("ERROR")
         print(e, file=sys.stderr)
     except Exception as e:
+        if limits is not None:
+            from sandbox import CompileLimitExceeded
+            if isinstance(e, CompileLimitExceeded):
+                print("ERROR")
+                print(e, file=sys.stderr)
+                return
         import traceback
         print("\n--- ERROR INESPERADO ---")
         print(e, file=sys.stderr)
         traceback.print_exc()
+    finally:
+        if input_stream is not None:
+            input_stream.close()
 
 
 def main(argv=None) -> None:
@@ -65,8 +255,151 @@ def main(argv=None) -> None:
         default="tests/fibonacci_recursivo.txt",
         help="Ruta al archivo Patito a compilar/ejecutar",
     )
+    argp.add_argument(
+        "--lanes",
+        type=int,
+        default=0,
+        help="Ejecuta el programa sobre N carriles a la vez (VM vectorizada con NumPy)",
+    )
+    argp.add_argument(
+        "--lane-var",
+        action="append",
+        default=[],
+        help="Variable global que recibe el indice de su carril (0..N-1); se puede repetir",
+    )
+    argp.add_argument(
+        "--engine",
+        choices=("vm", "python"),
+        default="vm",
+        help="Motor de ejecucion: la maquina virtual o el traductor a Python",
+    )
+    argp.add_argument(
+        "--no-jit",
+        action="store_true",
+        help="Desactiva el JIT de trazas para ciclos calientes de la VM",
+    )
+    argp.add_argument(
+        "--no-bounds-check",
+        action="store_true",
+        help="No genera la verificacion de limites (VER) en accesos a arreglos",
+    )
+    argp.add_argument(
+        "--input",
+        default=None,
+        help="Archivo con los datos que lee 'lee' (por omision, la entrada estandar)",
+    )
+    argp.add_argument(
+        "--scanner",
+        choices=("ply", "regex"),
+        default="ply",
+        help="Analizador lexico: el de PLY o el de una sola expresion regular",
+    )
+    argp.add_argument(
+        "--parser",
+        choices=("ply", "rd"),
+        default="ply",
+        help="Analizador sintactico: tablas LALR de PLY o descendente recursivo",
+    )
+    argp.add_argument(
+        "--stats",
+        action="store_true",
+        help="Muestra tiempo, memoria pico y conteos de cada fase de la compilacion y el uso de memoria de la VM",
+    )
+    argp.add_argument(
+        "--sandbox",
+        action="store_true",
+        help="Limita pasos, llamadas anidadas, memoria, salida y compilacion (para codigo que no es de confianza)",
+    )
+    argp.add_argument(
+        "--profile",
+        type=float,
+        nargs="?",
+        const=1.0,
+        default=None,
+        metavar="MS",
+        help="Perfila por muestreo cada MS ms de CPU (1 por omision) y muestra el resumen por funcion y linea",
+    )
+    argp.add_argument(
+        "--profile-steps",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Perfila con una muestra cada N cuadruplos ejecutados (reproducible, sin JIT)",
+    )
+    argp.add_argument(
+        "--profile-out",
+        default=None,
+        help="Archivo donde escribir las pilas del perfil en formato 'collapsed' (flame graphs)",
+    )
+    argp.add_argument(
+        "--coverage",
+        action="store_true",
+        help="Muestra que lineas, cuadruplos y saltos se ejecutaron (sin JIT)",
+    )
+    argp.add_argument(
+        "--coverage-out",
+        default=None,
+        help="Archivo donde escribir el codigo con las veces que se ejecuto cada linea",
+    )
+    argp.add_argument(
+        "--trace",
+        default=None,
+        metavar="ARCHIVO",
+        help="Guarda los ultimos cuadruplos ejecutados y lo que escribieron; se vacia al archivo si hay "
+             "error o con la senal SIGUSR1 (sin JIT)",
+    )
+    argp.add_argument(
+        "--trace-size",
+        type=int,
+        default=4096,
+        help="Cuadruplos que guarda --trace (los mas recientes)",
+    )
+    argp.add_argument(
+        "--pgo-record",
+        default=None,
+        metavar="ARCHIVO",
+        help="Guarda en el archivo los saltos, vueltas de ciclos y llamadas de la corrida para --pgo-use (sin JIT)",
+    )
+    argp.add_argument(
+        "--pgo-use",
+        default=None,
+        metavar="ARCHIVO",
+        help="Optimiza con el perfil de --pgo-record: copia en linea, superinstrucciones y acomodo de bloques",
+    )
     args = argp.parse_args(argv)
-    run_file(Path(args.test))
+    if args.coverage_out is not None:
+        args.coverage = True
+    if args.sandbox and (args.lanes or args.engine != "vm"):
+        argp.error("--sandbox solo se puede usar con la VM (sin --lanes ni --engine python)")
+    profiling = args.profile is not None or args.profile_steps is not None
+    if (profiling or args.coverage or args.trace) and (args.lanes or args.engine != "vm"):
+        argp.error("--profile, --coverage y --trace solo se pueden usar con la VM (sin --lanes ni --engine python)")
+    if (args.pgo_record or args.pgo_use) and (args.lanes or args.engine != "vm"):
+        argp.error("--pgo-record y --pgo-use solo se pueden usar con la VM (sin --lanes ni --engine python)")
+    if args.profile_out is not None and not profiling:
+        args.profile = 1.0
+    run_file(
+        args.test,
+        lanes=args.lanes,
+        lane_vars=args.lane_var,
+        engine=args.engine,
+        jit=not args.no_jit,
+        check_bounds=not args.no_bounds_check,
+        input_path=args.input,
+        scanner=args.scanner,
+        frontend=args.parser,
+        stats=args.stats,
+        sandbox=args.sandbox,
+        profile_ms=args.profile,
+        profile_steps=args.profile_steps,
+        profile_out=args.profile_out,
+        coverage=args.coverage,
+        coverage_out=args.coverage_out,
+        trace_out=args.trace,
+        trace_size=args.trace_size,
+        pgo_record=args.pgo_record,
+        pgo_use=args.pgo_use,
+    )
 
 
 if __name__ == "__main__":
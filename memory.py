@@ -1,7 +1,7 @@
 # Gestor de direcciones virtuales.
 # Asigna espacios para variables globales, locales, temporales y constantes.
 
-from typing import Dict
+from typing import Dict, Tuple
 
 # Segmentos de memoria
 SEG_GLOBAL = "global"
@@ -9,46 +9,106 @@ SEG_LOCAL = "local"
 SEG_TEMP = "temp"
 SEG_CONST = "const"
 
-# Rangos base por segmento y tipo
+SEGMENTS = (SEG_GLOBAL, SEG_LOCAL, SEG_TEMP, SEG_CONST)
+TYPES = ("entero", "flotante", "bool", "letrero")
+
+# Typecode del buffer (array) que respalda un arreglo de cada tipo
+ARRAY_TYPECODES = {"entero": 'q', "flotante": 'd'}
+
+# Tamaño por omisión de cada rango (direcciones por segmento y tipo)
 RANGE_SIZE = 1000
-BASES = {
-    SEG_GLOBAL: {
-        "entero": 10000,
-        "flotante": 11000,
-        "bool": 12000,
-        "letrero": 13000,
-    },
-    SEG_LOCAL: {
-        "entero": 20000,
-        "flotante": 21000,
-        "bool": 22000,
-        "letrero": 23000,
-    },
-    SEG_TEMP: {
-        "entero": 30000,
-        "flotante": 31000,
-        "bool": 32000,
-        "letrero": 33000,
-    },
-    SEG_CONST: {
-        "entero": 40000,
-        "flotante": 41000,
-        "bool": 42000,
-        "letrero": 43000,
-    },
-}
+# Cada segmento reserva lugar para 10 rangos de tipo; con RANGE_SIZE = 1000
+# quedan las bases de siempre: global 10000, local 20000, temp 30000, const 40000
+TYPE_BLOCKS = 10
+# Dirección más alta que cabe en un operando de los cuádruplos (array('i'), ver QuadStore)
+MAX_ADDRESS = 2**31 - 1
+
+
+class SegmentLayout:
+    #Distribución de direcciones virtuales: segmento -> tamaño de cada rango de tipo.
+    #La comparten el MemoryManager, el parser y las máquinas virtuales.
+    #dirección = (segmento + 1) * span + tipo * tamaño(segmento) + desplazamiento
+
+    def __init__(self, sizes: Dict[str, int] | None = None, default_size: int = RANGE_SIZE) -> None:
+        sizes = sizes or {}
+        self.sizes: Dict[str, int] = {seg: sizes.get(seg, default_size) for seg in SEGMENTS}
+        self.span = TYPE_BLOCKS * max(self.sizes.values())
+        self.bases: Dict[str, Dict[str, int]] = {
+            seg: {tipo: self.segment_start(seg) + t * self.sizes[seg] for t, tipo in enumerate(TYPES)}
+            for seg in SEGMENTS
+        }
+        # Límites para decidir la memoria con una sola comparación
+        self.local_min = self.segment_start(SEG_LOCAL)
+        self.temp_min = self.segment_start(SEG_TEMP)
+        self.const_min = self.segment_start(SEG_CONST)
+        self.max_address = self.segment_start(SEGMENTS[-1]) + self.span - 1
+
+    def segment_start(self, segment: str) -> int:
+        return (SEGMENTS.index(segment) + 1) * self.span
+
+    def base(self, segment: str, tipo: str) -> int:
+        return self.bases[segment][tipo]
+
+    def size(self, segment: str) -> int:
+        return self.sizes[segment]
+
+    def decode(self, address: int) -> Tuple[str, str, int] | None:
+        #Regresa (segmento, tipo, desplazamiento) o None si la dirección no es válida
+        seg_idx, rest = divmod(address, self.span)
+        seg_idx -= 1
+        if not 0 <= seg_idx < len(SEGMENTS):
+            return None
+        segment = SEGMENTS[seg_idx]
+        type_idx, offset = divmod(rest, self.sizes[segment])
+        if type_idx >= len(TYPES):
+            return None
+        return segment, TYPES[type_idx], offset
+
+    def segment_of(self, address: int) -> str | None:
+        decoded = self.decode(address)
+        return decoded[0] if decoded else None
+
+    def type_of(self, address: int) -> str | None:
+        decoded = self.decode(address)
+        return decoded[1] if decoded else None
+
+    def grown(self, segment: str, factor: int = 2) -> "SegmentLayout":
+        #Copia con el segmento indicado factor veces más grande (el doble por omisión)
+        sizes = dict(self.sizes)
+        sizes[segment] *= factor
+        return SegmentLayout(sizes)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SegmentLayout) and self.sizes == other.sizes
+
+    def __repr__(self) -> str:
+        return f"SegmentLayout({self.sizes})"
+
+
+DEFAULT_LAYOUT = SegmentLayout()
 
 
 class MemoryOverflowError(MemoryError):
     """ERROR"""
 
+    def __init__(self, message: str, segment: str | None = None) -> None:
+        super().__init__(message)
+        self.segment = segment
+
 class MemoryManager:
-    def __init__(self) -> None:
-        self._base_map: Dict[str, Dict[str, int]] = BASES
+    def __init__(self, layout: SegmentLayout | None = None) -> None:
+        self.layout: SegmentLayout = layout or DEFAULT_LAYOUT
+        self._base_map: Dict[str, Dict[str, int]] = self.layout.bases
         self._counters: Dict[str, Dict[str, int]] = {}
         self._free_temps: Dict[str, list[int]] = {}
         self.reset_all()
 
+    def set_layout(self, layout: SegmentLayout) -> None:
+        #Cambia la distribución de memoria y reinicia todos los contadores
+        self.layout = layout
+        self._base_map = layout.bases
+        self.reset_all()
+
     def reset_all(self) -> None:
         #Reinicia todos los contadores y libera temporales
         self._counters = {seg: bases.copy() for seg, bases in self._base_map.items()}
@@ -63,18 +123,19 @@ class MemoryManager:
         self._counters[SEG_TEMP] = self._base_map[SEG_TEMP].copy()
         self._free_temps = {tipo: [] for tipo in self._base_map[SEG_TEMP].keys()}
 
-    def allocate(self, segment: str, tipo: str) -> int:
-        #Entrega una nueva direccion para el segmento/tipo indicado
-        if segment == SEG_TEMP:
+    def allocate(self, segment: str, tipo: str, count: int = 1) -> int:
+        #Entrega una nueva direccion para el segmento/tipo indicado; con count > 1
+        #reserva un rango contiguo (arreglos) y regresa la primera direccion
+        if segment == SEG_TEMP and count == 1:
             free_list = self._free_temps.get(tipo, [])
             if free_list:
                 return free_list.pop()
 
         base = self._base_map[segment][tipo]
         next_addr = self._counters[segment][tipo]
-        if next_addr >= base + RANGE_SIZE:
-            raise MemoryOverflowError(f"Sin espacio para {segment} {tipo}")
-        self._counters[segment][tipo] += 1
+        if next_addr + count > base + self.layout.size(segment):
+            raise MemoryOverflowError(f"Sin espacio para {segment} {tipo}", segment)
+        self._counters[segment][tipo] += count
         return next_addr
 
     def free_temp(self, tipo: str, address: int) -> None:
@@ -90,11 +151,7 @@ class MemoryManager:
 
     def segment_of(self, address: int) -> str | None:
         #Devuelve el segmento al que pertenece una direccion, o None si no encaja
-        for seg, bases in self._base_map.items():
-            for tipo, base in bases.items():
-                if base <= address < base + RANGE_SIZE:
-                    return seg
-        return None
+        return self.layout.segment_of(address)
 
 
 # Instancia global para usar en parser/intermediate
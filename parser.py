@@ -1,42 +1,69 @@
-from ply import yacc
+import math
+import os
+import sys
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
 from scanner import tokens, lexer as _lexer
 
 # Nuevas importaciones semánticas
 from tabla_symbolos import (
     FunctionDirectory,
-    FunctionInfo,
     VariableTable,
-    VariableInfo,
     SemanticError,
 )
 
+# Árbol de sintaxis; el análisis semántico y la generación de cuádruplos
+# son pasadas aparte sobre el árbol (semantic.py, codegen.py)
+from ast_nodes import (
+    Assign,
+    AssignIndex,
+    Binary,
+    Block,
+    Call,
+    CallStmt,
+    Const,
+    Function,
+    If,
+    Index,
+    Letrero,
+    Print,
+    Program,
+    Read,
+    Return,
+    Unary,
+    Var,
+    VarGroup,
+    While,
+    deep_nesting,
+)
+from codegen import CodeGenerator
+from semantic import SemanticAnalyzer
+
+# compile_stats y compiled_program se cargan solo cuando se usan; ver startup_bench
+if TYPE_CHECKING:
+    from compile_stats import CompileStats
+    from compiled_program import CompiledProgram
+
 # Infraestructura de IR (cuádruplos y temporales)
-import intermediate as ir
-from intermediate import (
-    alloc_global,
-    alloc_local,
-    emit_quad,
-    fill_quad,
-    intern_const,
-    new_temp,
-    PJumps,
-    reset_function_memory,
-    reset_ir,
-    quads,
+from intermediate import const_table, quads, reset_ir
+from memory import (
+    DEFAULT_LAYOUT,
+    MAX_ADDRESS,
+    SEG_TEMP,
+    MemoryOverflowError,
+    SegmentLayout,
+    memory_manager,
 )
-from memory import SEG_LOCAL, SEG_TEMP, memory_manager
 
 # Cubo semántico para tipos
 from cube_semantic import (
-    result_type,
     TIPO_ENTERO,
     TIPO_FLOTANTE,
-    TIPO_BOOL,
-    TIPO_LETRERO,
-    TIPO_ERROR,
 )
 
 #  ESTRUCTURAS SEMÁNTICAS GLOBALES
+# (las del último programa compilado)
 
 # Directorio de funciones (todas las funciones del programa)
 func_dir: FunctionDirectory = FunctionDirectory()
@@ -44,58 +71,15 @@ func_dir: FunctionDirectory = FunctionDirectory()
 # Tabla de variables globales (vars declaradas antes de 'inicio')
 global_var_table: VariableTable = VariableTable()
 
-# Función en contexto (para resolver ámbito local); None = global
-current_func: FunctionInfo | None = None
-
-# Salto inicial para brincar funciones y entrar a main
-main_goto: int | None = None
-main_start: int | None = None
-
-
-def _reset_semantic_structures():
-    global func_dir, global_var_table, current_func, main_goto, main_start
-    func_dir = FunctionDirectory()
-    global_var_table = VariableTable()
-    current_func = None
-    main_goto = None
-    main_start = None
-
-
-def _extract_var_decls(vars_ast):
-    result = []
 
-    def visit(node):
-        if not node:
-            return
-        tag = node[0]
-        if tag != 'vars':
-            return
-        _, id_list, var_type, vars_final = node
-        for name in id_list:
-            result.append((name, var_type))
-        if vars_final:
-            visit(vars_final)
-
-    visit(vars_ast)
-    return result
-
-
-def _lookup_var_info(name: str) -> VariableInfo:
-    if current_func:
-        info = current_func.var_table.lookup(name)
-        if info:
-            return info
-    info = global_var_table.lookup(name)
-    if info is None:
-        raise SemanticError(f"Variable '{name}' no declarada.")
-    return info
-
-
-def _lookup_var_type(name: str) -> str:
-    return _lookup_var_info(name).var_type
+def _syntax_error(tok):
+    if tok is not None:
+        return SyntaxError(f"Error de sintaxis cerca de token {tok.type} (valor={tok.value!r})")
+    return SyntaxError("Error de sintaxis al final de la entrada")
 
 
 #  SINTAXIS
+# Las acciones solo construyen nodos de ast_nodes; ninguna emite cuádruplos
 precedence = (
     ('nonassoc', 'OP_IGUAL', 'OP_DIF', 'OP_MAYOR', 'OP_MENOR', 'OP_MAYORIGUAL', 'OP_MENORIGUAL'),
     ('left', 'OP_SUMA', 'OP_RESTA'),
@@ -103,11 +87,6 @@ precedence = (
 )
 
 
-# AST ligero para estructuras grandes (programa, func, etc.)
-def node(tag, *kids):
-    return (tag,) + kids
-
-
 # =======================
 # 1) <TIPO>
 # =======================
@@ -124,14 +103,7 @@ def p_tipo(p):
 def p_cte(p):
     '''cte : CTE_ENT
            | CTE_FLOT'''
-    # Regresamos (dir_constante, tipo)
-    token_type = p.slice[1].type
-    if token_type == 'CTE_ENT':
-        val_type = TIPO_ENTERO
-    else:
-        val_type = TIPO_FLOTANTE
-    addr = intern_const(p[1], val_type)
-    p[0] = (addr, val_type)
+    p[0] = Const(p[1], TIPO_ENTERO if p.slice[1].type == 'CTE_ENT' else TIPO_FLOTANTE)
 
 
 # =======================
@@ -140,52 +112,19 @@ def p_cte(p):
 def p_retorno(p):
     '''retorno : RETURN expresion PUNTO_Y_COMA
                | RETURN PUNTO_Y_COMA'''
-    if current_func is None:
-        raise SemanticError("'return' solo es v?lido dentro de una funci?n")
-
-    func_info = current_func
-    ret_type = func_info.return_type
-
-    if len(p) == 3:  # RETURN PUNTO_Y_COMA (sin expresi?n)
-        if ret_type != 'nula':
-            raise SemanticError(f"La funci?n '{func_info.name}' debe regresar {ret_type}")
-        emit_quad('RETURN', None, None, None)
-        p[0] = ('return', None)
-    else:  # RETURN expresion ;
-        expr_place, expr_type = p[2]
-        if ret_type == 'nula':
-            raise SemanticError("Funciones 'nula' no deben regresar valor")
-        if expr_type != ret_type:
-            raise SemanticError(f"Tipo de retorno invalido: se esperaba {ret_type}, se obtuvo {expr_type}")
-        emit_quad('RETURN', expr_place, None, None)
-        p[0] = ('return', (expr_place, expr_type))
+    p[0] = Return(p[2] if len(p) == 4 else None, p.lineno(1))
 
 # =======================
 # 3) <ASIGNA>
 # =======================
 def p_asigna(p):
     'asigna : ID OP_ASIG expresion PUNTO_Y_COMA'
-    var_name = p[1]
-    var_info = _lookup_var_info(var_name)
-    var_type = var_info.var_type
-    var_addr = var_info.address
+    p[0] = Assign(p[1], p[3], p.lineno(1))
 
-    expr_place, expr_type = p[3]
 
-    # Verificamos tipos con el cubo semántico
-    res_type = result_type(var_type, '=', expr_type)
-    if res_type == TIPO_ERROR:
-        raise SemanticError(
-            f"Type-mismatch en asignación a '{var_name}': "
-            f"no se puede asignar {expr_type} a {var_type}"
-        )
-
-    # Generar cuádruplo de asignación
-    # (=, expr_place, -, var_name)
-    emit_quad('=', expr_place, None, var_addr)
-
-    # AST opcional
-    p[0] = ('assign', var_name, p[3])
+def p_asigna_arreglo(p):
+    'asigna : ID CORA_ABRE expresion CORA_CIERRA OP_ASIG expresion PUNTO_Y_COMA'
+    p[0] = AssignIndex(p[1], p[3], p[6], p.lineno(1))
 
 
 # =======================
@@ -197,21 +136,25 @@ def p_estatuto(p):
                 | ciclo
                 | llamada PUNTO_Y_COMA
                 | imprime
+                | lectura
                 | retorno
                 | CORA_ABRE list_estatuto CORA_CIERRA'''
     if len(p) == 2:
         p[0] = p[1]
     elif len(p) == 3:
-        p[0] = ('call_stmt', p[1])
+        p[0] = CallStmt(p[1], p[1].line)
     else:
-        p[0] = ('block_square', p[2] or [])
+        p[0] = Block(p[2], p.lineno(1))
 
 
+# Las listas son recursivas por la izquierda: cada elemento se agrega a la
+# misma lista (tiempo lineal) y la pila del parser no crece con su longitud
 def p_list_estatuto(p):
     '''list_estatuto : empty
-                     | estatuto list_estatuto'''
+                     | list_estatuto estatuto'''
     if len(p) == 3:
-        p[0] = [p[1]] + (p[2] or [])
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = []
 
@@ -221,14 +164,15 @@ def p_list_estatuto(p):
 # =======================
 def p_cuerpo(p):
     'cuerpo : LLAVE_ABRE cuerpo_estat LLAVE_CIERRA'
-    p[0] = p[2] or []
+    p[0] = p[2]
 
 
 def p_cuerpo_estat(p):
     '''cuerpo_estat : empty
-                    | estatuto cuerpo_estat'''
+                    | cuerpo_estat estatuto'''
     if len(p) == 3:
-        p[0] = [p[1]] + (p[2] or [])
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = []
 
@@ -238,23 +182,12 @@ def p_cuerpo_estat(p):
 # =======================
 def p_expresion(p):
     'expresion : exp expresion_exp'
-    left_place, left_type = p[1]
-
     if p[2] is None:
         # Solo expresión aritmética
-        p[0] = (left_place, left_type)
+        p[0] = p[1]
     else:
-        op, (right_place, right_type) = p[2]
-
-        res_type = result_type(left_type, op, right_type)
-        if res_type == TIPO_ERROR:
-            raise SemanticError(
-                f"Operación relacional inválida: {left_type} {op} {right_type}"
-            )
-
-        temp = new_temp(res_type)
-        emit_quad(op, left_place, right_place, temp)
-        p[0] = (temp, res_type)
+        op, right = p[2]
+        p[0] = Binary(op, p[1], right)
 
 
 def p_expresion_exp(p):
@@ -267,7 +200,7 @@ def p_expresion_exp(p):
                      | OP_IGUAL exp'''
     if len(p) == 3:
         op = p[1]           # '>', '<', '!=', '=='
-        right = p[2]        # (place, tipo)
+        right = p[2]
         p[0] = (op, right)
     else:
         p[0] = None
@@ -277,176 +210,104 @@ def p_expresion_exp(p):
 # 7) <CICLO>
 # =======================
 def p_ciclo(p):
-    'ciclo : MIENTRAS ciclo_marca PAR_ABRE expresion ciclo_cond_prep PAR_CIERRA HAZ cuerpo PUNTO_Y_COMA'
-    loop_start = p[2]
-    body = p[8]
-
-    # Al final del cuerpo, regresar al inicio
-    emit_quad('GOTO', None, None, loop_start)
-
-    # Rellenar el salto falso para que apunte despu?s del ciclo
-    end_false = PJumps.pop()
-    fill_quad(end_false, ir.next_quad)
-
-    p[0] = ('while', p[4], body)
-
-
-def p_ciclo_cond_prep(p):
-    'ciclo_cond_prep : '
-    cond_place, cond_type = p[-1]
-    if cond_type != TIPO_BOOL:
-        raise SemanticError("La condicion de 'mientras' debe ser de tipo bool")
-    # GOTOF para salir del ciclo si la condici?n es falsa (se inserta antes del cuerpo)
-    false_jump = emit_quad('GOTOF', cond_place, None, None)
-    PJumps.append(false_jump)
-
-
-def p_ciclo_marca(p):
-    'ciclo_marca : '
-    p[0] = ir.next_quad
-
+    'ciclo : MIENTRAS PAR_ABRE expresion PAR_CIERRA HAZ cuerpo PUNTO_Y_COMA'
+    p[0] = While(p[3], p[6], p.lineno(1))
 
 
 # =======================
 # 8) <CONDICIÓN>  y  <CONDICIÓN_CUERPO>
 # =======================
 def p_condicion(p):
-    'condicion : SI PAR_ABRE expresion condicion_marca PAR_CIERRA cuerpo condicion_cuerpo PUNTO_Y_COMA'
-    then_body = p[6]
-    else_body = p[7]
-
-    if else_body is not None:
-        p[0] = ('if_else', p[3], then_body, else_body)
-        # Rellenar el salto al final (goto_end) que quedó en la pila
-        fill_quad(PJumps.pop(), ir.next_quad)
-    else:
-        # Sin else: el GOTOF apunta al final del if
-        fill_quad(PJumps.pop(), ir.next_quad)
-        p[0] = ('if', p[3], then_body)
-
-
-def p_condicion_marca(p):
-    'condicion_marca : '
-    cond_place, cond_type = p[-1]
-    if cond_type != TIPO_BOOL:
-        raise SemanticError("La condicion de 'si' debe ser de tipo bool")
-    # Emitir GOTOF inmediatamente despues de evaluar la condicion
-    false_jump = emit_quad('GOTOF', cond_place, None, None)
-    PJumps.append(false_jump)
-
+    'condicion : SI PAR_ABRE expresion PAR_CIERRA cuerpo condicion_cuerpo PUNTO_Y_COMA'
+    p[0] = If(p[3], p[5], p[6], p.lineno(1))
 
 
 def p_condicion_cuerpo(p):
     '''condicion_cuerpo : empty
-                        | SINO condicion_else_marca cuerpo'''
-    if len(p) == 4:
-        p[0] = p[3]
+                        | SINO cuerpo'''
+    if len(p) == 3:
+        p[0] = p[2]
     else:
         p[0] = None
 
 
-def p_condicion_else_marca(p):
-    'condicion_else_marca : '
-    goto_end = emit_quad('GOTO', None, None, None)
-    false_jump = PJumps.pop()
-    fill_quad(false_jump, ir.next_quad)
-    PJumps.append(goto_end)
-
-
 # =======================
 # 9) <IMPRIME>, <IMPRIME_EXP>, <IMPRIME_EXP’>
 # =======================
 def p_imprime(p):
     'imprime : ESCRIBE PAR_ABRE imprime_exp PAR_CIERRA PUNTO_Y_COMA'
-    items = p[3]  # lista de ('expr', (place,tipo)) o ('str', lexema)
-
-    for kind, val in items:
-        if kind == 'expr':
-            place, _tipo = val
-            emit_quad('PRINT', place, None, None)
-        else:  # 'str'
-            lex_addr, _tipo = val
-            emit_quad('PRINT', lex_addr, None, None)
-
-    p[0] = ('print', items)
+    p[0] = Print(p[3], p.lineno(1))
 
 
 def p_imprime_exp(p):
-    '''imprime_exp : expresion imprime_exp_p
-                   | LETRERO  imprime_exp_p'''
-    if p.slice[1].type == 'LETRERO':
-        addr = intern_const(p[1], TIPO_LETRERO)
-        head = ('str', (addr, TIPO_LETRERO))      # cadena literal
+    '''imprime_exp : imprime_item
+                   | imprime_exp COMA imprime_item'''
+    if len(p) == 2:
+        p[0] = [p[1]]
     else:
-        head = ('expr', p[1])     # (place, tipo)
-
-    tail = p[2] or []
-    p[0] = [head] + tail
+        p[1].append(p[3])
+        p[0] = p[1]
 
 
-def p_imprime_exp_p(p):
-    '''imprime_exp_p : empty
-                     | COMA imprime_exp'''
-    if len(p) == 3:
-        p[0] = p[2]
+def p_imprime_item(p):
+    '''imprime_item : expresion
+                    | LETRERO'''
+    if p.slice[1].type == 'LETRERO':
+        p[0] = Letrero(p[1])      # cadena literal
     else:
-        p[0] = []
+        p[0] = p[1]
 
 
 # =======================
-# 10) <LLAMADA>, <LLAMADA_EXPRESIÓN>, <LLAMADA_EX’>
+# <LECTURA>: lee(x); lee(a, v[i]);
 # =======================
-def p_llamada(p):
-    'llamada : ID PAR_ABRE llamada_expresion PAR_CIERRA'
-    func_name = p[1]
-    args = p[3] or []
-
-    func_info = func_dir.get_function(func_name)
-    if not func_info:
-        raise SemanticError(f"Funcion '{func_name}' no declarada")
+def p_lectura(p):
+    'lectura : LEE PAR_ABRE lee_lista PAR_CIERRA PUNTO_Y_COMA'
+    p[0] = Read(p[3], p.lineno(1))
 
-    expected_params = func_info.parameters
-    if len(args) != len(expected_params):
-        raise SemanticError(f"Funcion '{func_name}' espera {len(expected_params)} argumentos, recibi? {len(args)}")
 
-    total_size = sum(func_info.locals_size.values()) + sum(func_info.temps_size.values())
-    emit_quad('ERA', total_size, None, func_name)
-
-    for idx, ((arg_place, arg_type), (_pname, ptype, _paddr)) in enumerate(zip(args, expected_params), start=1):
-        if arg_type != ptype:
-            raise SemanticError(f"Argumento {idx} de '{func_name}' debe ser {ptype}, se recibi? {arg_type}")
-        emit_quad('PARAMETER', arg_place, None, idx)
+def p_lee_lista(p):
+    '''lee_lista : lee_destino
+                 | lee_lista COMA lee_destino'''
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[1].append(p[3])
+        p[0] = p[1]
 
-    emit_quad('GOSUB', func_name, None, func_info.start_quad)
 
-    ret_place = None
-    ret_type = func_info.return_type
-    if ret_type != 'nula':
-        ret_place = new_temp(ret_type)
-        emit_quad('RETVAL', func_name, None, ret_place)
+def p_lee_destino(p):
+    'lee_destino : ID'
+    p[0] = Var(p[1])
 
-    p[0] = ('call', func_name, args, ret_place, ret_type)
 
+def p_lee_destino_arreglo(p):
+    'lee_destino : ID CORA_ABRE expresion CORA_CIERRA'
+    p[0] = Index(p[1], p[3])
 
 
+# =======================
+# 10) <LLAMADA>, <LLAMADA_EXPRESIÓN>, <LLAMADA_EX’>
+# =======================
+def p_llamada(p):
+    'llamada : ID PAR_ABRE llamada_expresion PAR_CIERRA'
+    p[0] = Call(p[1], p[3], p.lineno(1))
 
 
 def p_llamada_expresion(p):
     '''llamada_expresion : empty
-                         | expresion llamada_ex'''
-    if len(p) == 3:
-        p[0] = [p[1]] + (p[2] or [])
-    else:
-        p[0] = []
+                         | llamada_ex'''
+    p[0] = p[1] if p[1] is not None else []
 
 
 def p_llamada_ex(p):
-    '''llamada_ex : empty
-                  | COMA expresion llamada_ex'''
-    if len(p) == 4:
-        p[0] = [p[2]] + (p[3] or [])
+    '''llamada_ex : expresion
+                  | llamada_ex COMA expresion'''
+    if len(p) == 2:
+        p[0] = [p[1]]
     else:
-        p[0] = []
+        p[1].append(p[3])
+        p[0] = p[1]
 
 
 # =======================
@@ -454,26 +315,13 @@ def p_llamada_ex(p):
 # =======================
 def p_factor_group(p):
     'factor : PAR_ABRE expresion PAR_CIERRA'
-    # Solo regresamos el resultado de la expresión interna
-    p[0] = p[2]  # (place, tipo)
+    # Solo regresamos la expresión interna
+    p[0] = p[2]
 
 
 def p_factor_signed(p):
     'factor : factor_sr factor_cte'
-    sign, (place, tipo) = p[1], p[2]
-
-    if sign is None:
-        p[0] = (place, tipo)
-    elif sign == '+':
-        # +x no cambia el valor
-        p[0] = (place, tipo)
-    else:  # '-'
-        # unary minus: generamos UMINUS si es numérico
-        if tipo not in (TIPO_ENTERO, TIPO_FLOTANTE):
-            raise SemanticError(f"No se puede aplicar signo '-' a tipo {tipo}")
-        temp = new_temp(tipo)
-        emit_quad('UMINUS', place, None, temp)
-        p[0] = (temp, tipo)
+    p[0] = p[2] if p[1] is None else Unary(p[1], p[2])
 
 
 def p_factor_sr(p):
@@ -492,43 +340,47 @@ def p_factor_cte(p):
     '''factor_cte : ID
                   | cte
                   | llamada'''
-    sym_type = p.slice[1].type
-
-    if sym_type == 'ID':
-        name = p[1]
-        info = _lookup_var_info(name)
-        p[0] = (info.address, info.var_type)
-    elif sym_type == 'cte':
-        # p[1] es (valor, tipo) ya
-        p[0] = p[1]
+    if p.slice[1].type == 'ID':
+        p[0] = Var(p[1])
     else:
-        # llamada: usar valor de retorno si no es 'nula'
-        call_tag, fname, args, ret_place, ret_type = p[1]
-        if ret_type == 'nula':
-            raise SemanticError("Llamada a función 'nula' no puede usarse en expresiones")
-        p[0] = (ret_place, ret_type)
+        # cte o llamada: ya son nodos
+        p[0] = p[1]
+
+
+def p_factor_arreglo(p):
+    'factor_cte : ID CORA_ABRE expresion CORA_CIERRA'
+    p[0] = Index(p[1], p[3])
 
 
 # =======================
 # 12) <VARS>, <VARS_TODO>, <VARS_COMA>, <VARS_FINAL>
 # =======================
 def p_vars(p):
-    'vars : VARS ID vars_todo'
-    extra_ids, tipo, vars_final = p[3]
-    # AST de vars
-    p[0] = ('vars', [p[2]] + extra_ids, tipo, vars_final)
+    'vars : VARS ID var_dim vars_todo'
+    # Lista de VarGroup; el primer grupo empieza con el ID que sigue a 'vars'
+    groups = p[4]
+    groups[0].names.insert(0, (p[2], p[3]))
+    groups[0].line = p.lineno(2)
+    p[0] = groups
+
+
+def p_var_dim(p):
+    '''var_dim : empty
+               | CORA_ABRE CTE_ENT CORA_CIERRA'''
+    p[0] = p[2] if len(p) == 4 else None
 
 
 def p_vars_todo(p):
     'vars_todo : vars_coma DOS_PUNTOS tipo PUNTO_Y_COMA vars_final'
-    p[0] = (p[1], p[3], p[5])  # (extra_ids, tipo, vars_final)
+    p[0] = [VarGroup(p[1], p[3], p.lineno(2))] + (p[5] or [])
 
 
 def p_vars_coma(p):
     '''vars_coma : empty
-                 | COMA ID vars_coma'''
-    if len(p) == 4:
-        p[0] = [p[2]] + (p[3] or [])
+                 | vars_coma COMA ID var_dim'''
+    if len(p) == 5:
+        p[1].append((p[3], p[4]))
+        p[0] = p[1]
     else:
         p[0] = []
 
@@ -542,52 +394,10 @@ def p_vars_final(p):
 # =======================
 # 13) <FUNCS>, <FUNCS_NT>, <FUNC_TIPO>, <FUNCS_COMA>, <FUNC_VARS>
 # =======================
-def p_func_header(p):
-    'func_header : funcs_nt ID PAR_ABRE func_tipo PAR_CIERRA'
-    return_type = p[1]
-    func_name = p[2]
-    params = p[4] or []  # lista de (nombre, tipo)
-
-    # Reiniciar memoria local/temporal para la nueva funci?n
-    reset_function_memory()
-
-    # Crear entrada de funci?n (lanza error si ya exist?a)
-    func_info = func_dir.add_function(func_name, return_type)
-
-    # Registrar par?metros
-    for param_name, param_type in params:
-        addr = alloc_local(param_type)
-        func_info.add_parameter(param_name, param_type, addr)
-
-    # Establecer contexto actual y punto de entrada de la funci?n
-    global current_func
-    current_func = func_info
-    func_info.start_quad = ir.next_quad
-
-    p[0] = (func_info, return_type, func_name, params)
-
-
 def p_funcs(p):
-    'funcs : func_header LLAVE_ABRE func_vars cuerpo LLAVE_CIERRA PUNTO_Y_COMA'
-    func_info, return_type, func_name, params = p[1]
-    vars_ast = p[3]  # AST de vars locales (o None)
-
-    body = p[4]
-    p[0] = ('func', return_type, func_name, params, vars_ast, body)
-
-    # Registrar tama?os de activaci?n
-    func_info.locals_size = memory_manager.get_usage(SEG_LOCAL)
-    func_info.temps_size = memory_manager.get_usage(SEG_TEMP)
-
-    # Cuadruplo de fin de funcion
-    emit_quad('ENDFUNC', None, None, None)
-
-    # Salir del contexto de funci?n
-    global current_func
-    current_func = None
-
-
-
+    'funcs : funcs_nt ID PAR_ABRE func_tipo PAR_CIERRA LLAVE_ABRE func_vars cuerpo LLAVE_CIERRA PUNTO_Y_COMA'
+    # params: lista de (nombre, tipo)
+    p[0] = Function(p[2], p[1], p[4], p[7], p[8], p.lineno(2))
 
 
 def p_funcs_nt(p):
@@ -598,30 +408,24 @@ def p_funcs_nt(p):
 
 def p_func_tipo(p):
     '''func_tipo : empty
-                 | ID DOS_PUNTOS tipo funcs_coma'''
-    if len(p) == 5:
-        p[0] = [(p[1], p[3])] + (p[4] or [])
-    else:
-        p[0] = []
+                 | funcs_coma'''
+    p[0] = p[1] if p[1] is not None else []
 
 
 def p_funcs_coma(p):
-    '''funcs_coma : empty
-                  | COMA ID DOS_PUNTOS tipo funcs_coma'''
-    if len(p) == 6:
-        p[0] = [(p[2], p[4])] + (p[5] or [])
+    '''funcs_coma : ID DOS_PUNTOS tipo
+                  | funcs_coma COMA ID DOS_PUNTOS tipo'''
+    if len(p) == 4:
+        p[0] = [(p[1], p[3])]
     else:
-        p[0] = []
+        p[1].append((p[3], p[5]))
+        p[0] = p[1]
 
 
 def p_func_vars(p):
     '''func_vars : empty
                  | vars'''
-    p[0] = p[1]
-    if p[1] is not None and current_func is not None:
-        for var_name, var_type in _extract_var_decls(p[1]):
-            addr = alloc_local(var_type)
-            current_func.var_table.add_variable(var_name, var_type, addr, is_param=False)
+    p[0] = p[1] or []
 
 
 # =======================
@@ -629,21 +433,11 @@ def p_func_vars(p):
 # =======================
 def p_exp(p):
     'exp : termino exp_termino'
-    left_place, left_type = p[1]
     if p[2] is None:
-        p[0] = (left_place, left_type)
+        p[0] = p[1]
     else:
-        op, (right_place, right_type) = p[2]
-
-        res_type = result_type(left_type, op, right_type)
-        if res_type == TIPO_ERROR:
-            raise SemanticError(
-                f"Operación aritmética inválida: {left_type} {op} {right_type}"
-            )
-
-        temp = new_temp(res_type)
-        emit_quad(op, left_place, right_place, temp)
-        p[0] = (temp, res_type)
+        op, right = p[2]
+        p[0] = Binary(op, p[1], right)
 
 
 def p_exp_termino(p):
@@ -652,7 +446,7 @@ def p_exp_termino(p):
                    | OP_RESTA exp'''
     if len(p) == 3:
         op = p[1]   # '+' o '-'
-        right = p[2]  # (place, tipo)
+        right = p[2]
         p[0] = (op, right)
     else:
         p[0] = None
@@ -663,21 +457,11 @@ def p_exp_termino(p):
 # =======================
 def p_termino(p):
     'termino : factor termino_factor'
-    left_place, left_type = p[1]
     if p[2] is None:
-        p[0] = (left_place, left_type)
+        p[0] = p[1]
     else:
-        op, (right_place, right_type) = p[2]
-
-        res_type = result_type(left_type, op, right_type)
-        if res_type == TIPO_ERROR:
-            raise SemanticError(
-                f"Operación aritmética inválida: {left_type} {op} {right_type}"
-            )
-
-        temp = new_temp(res_type)
-        emit_quad(op, left_place, right_place, temp)
-        p[0] = (temp, res_type)
+        op, right = p[2]
+        p[0] = Binary(op, p[1], right)
 
 
 def p_termino_factor(p):
@@ -686,7 +470,7 @@ def p_termino_factor(p):
                       | OP_DIV  termino'''
     if len(p) == 3:
         op = p[1]     # '*' o '/'
-        right = p[2]  # (place, tipo)
+        right = p[2]
         p[0] = (op, right)
     else:
         p[0] = None
@@ -697,52 +481,20 @@ def p_termino_factor(p):
 # Programa → programa id ; <PRO_VARS> <PRO_FUNCS> inicio <CUERPO> fin
 # =======================
 def p_programa(p):
-    'programa : PROGRAMA ID PUNTO_Y_COMA program_entry pro_vars pro_funcs INICIO program_main cuerpo FIN'
-    prog_name = p[2]
-
-    pro_vars_ast = p[5]
-    pro_funcs_list = p[6]
-    main_body = p[9]
-
-    # AST del programa (como antes)
-    p[0] = node('programa', prog_name, pro_vars_ast, pro_funcs_list, main_body)
-    # Fin de programa
-    emit_quad('END', None, None, None)
-
-
-
-# Helper: emitir salto inicial al main
-def p_program_entry(p):
-    'program_entry : '
-    global main_goto
-    main_goto = emit_quad('GOTO', None, None, None)
-    p[0] = None
-
-
-# Helper: rellenar salto al main justo al entrar a INICIO
-def p_program_main(p):
-    'program_main : '
-    global main_start
-    main_start = ir.next_quad
-    if main_goto is not None:
-        fill_quad(main_goto, ir.next_quad)
-    p[0] = None
+    'programa : PROGRAMA ID PUNTO_Y_COMA pro_vars pro_funcs INICIO cuerpo FIN'
+    p[0] = Program(p[2], p[4], p[5], p[7])
 
 
 def p_pro_vars(p):
     '''pro_vars : empty
                 | vars'''
-    p[0] = p[1]
-    if p[1] is not None and current_func is None:
-        for var_name, var_type in _extract_var_decls(p[1]):
-            addr = alloc_global(var_type)
-            global_var_table.add_variable(var_name, var_type, addr)
+    p[0] = p[1] or []
 
 
 def p_pro_funcs(p):
     '''pro_funcs : empty
                  | pro_funcs_list'''
-    p[0] = p[1] if p[1] else None
+    p[0] = p[1] or []
 
 
 def p_pro_funcs_list(p):
@@ -751,7 +503,8 @@ def p_pro_funcs_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 # =======================
@@ -763,40 +516,545 @@ def p_empty(p):
 
 
 def p_error(p):
-    if p:
-        raise SyntaxError(f"Error de sintaxis cerca de token {p.type} (valor={p.value!r})")
-    else:
-        raise SyntaxError("Error de sintaxis al final de la entrada")
+    raise _syntax_error(p)
 
 
 # Construcción del parser
-parser = yacc.yacc(start='programa')
+# Las tablas LALR se cargan de parsetab.py la primera vez que se usa el
+# frontend de PLY (el descendente recursivo no las necesita). Al arrancar no
+# se escribe nada a disco: parsetab.py, parser.out y lextab.py se regeneran
+# con build_tables() / 'python parser.py' cuando cambia la gramática.
+parser = None
+
+
+def _ply_parser():
+    global parser
+    if parser is None:
+        from ply import yacc
+        parser = yacc.yacc(module=sys.modules[__name__], start='programa', debug=False, write_tables=False)
+    return parser
+
+
+def build_tables() -> None:
+    import scanner
+    from ply import lex, yacc
+
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    # PLY solo reescribe las tablas si no encuentra unas válidas
+    for name in ('parsetab.py', 'lextab.py'):
+        path = os.path.join(outputdir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    sys.modules.pop('parsetab', None)
+    sys.modules.pop('lextab', None)
+    yacc.yacc(module=sys.modules[__name__], start='programa', outputdir=outputdir)
+    lex.lex(module=scanner).writetab('lextab', outputdir)
+
+
+def tables_current() -> bool:
+    # ¿parsetab.py y lextab.py corresponden a la gramática y al scanner actuales?
+    # (si no, PLY reconstruye las tablas en memoria en cada arranque)
+    import lextab
+    import parsetab
+    import scanner
+    from ply import lex, yacc
+
+    pdict = dict(vars(sys.modules[__name__]), start='programa')
+    pinfo = yacc.ParserReflect(pdict)
+    pinfo.get_all()
+    fresh = lex.lex(module=scanner)
+    saved_re = {state: [pattern for pattern, _ in res] for state, res in lextab._lexstatere.items()}
+    return parsetab._lr_signature == pinfo.signature() and fresh.lexstateretext == saved_re
+
+
+# ============================================================
+#  PARSER DESCENDENTE RECURSIVO
+# ============================================================
+# Misma gramática que las reglas de arriba, escrita a mano: un método por no
+# terminal que construye los mismos nodos que las acciones de PLY, sin las
+# tablas LALR ni una llamada de Python por producción.
+
+TIPOS = ('ENTERO', 'FLOTANTE')
+OPS_RELACIONALES = ('OP_MAYOR', 'OP_MENOR', 'OP_MAYORIGUAL', 'OP_MENORIGUAL', 'OP_DIF', 'OP_IGUAL')
+INICIO_ESTATUTO = ('ID', 'SI', 'MIENTRAS', 'ESCRIBE', 'LEE', 'RETURN', 'CORA_ABRE')
+INICIO_EXPRESION = ('PAR_ABRE', 'OP_SUMA', 'OP_RESTA', 'ID', 'CTE_ENT', 'CTE_FLOT')
+
+
+class RecursiveDescentParser:
+    def __init__(self, lexer) -> None:
+        self.lexer = lexer
+        self.tok = None
+        self.type = '$end'
+
+    def parse(self, code: str) -> Program:
+        self.lexer.input(code)
+        self._next = self.lexer.token
+        self._advance()
+        try:
+            with deep_nesting():
+                return self.programa()
+        except RecursionError:
+            # Bloques anidados sin fin: mismo tipo de error que cualquier otro de sintaxis
+            line = self.tok.lineno if self.tok is not None else self.lexer.lineno
+            raise SyntaxError(f"Error de sintaxis: anidamiento demasiado profundo (linea {line})") from None
+
+    #  Tokens
+
+    def _advance(self) -> None:
+        tok = self._next()
+        self.tok = tok
+        self.type = tok.type if tok is not None else '$end'
+
+    def _expect(self, tok_type: str):
+        if self.type != tok_type:
+            raise _syntax_error(self.tok)
+        value = self.tok.value
+        self._advance()
+        return value
+
+    #  Programa, variables y funciones
+
+    def programa(self) -> Program:
+        self._expect('PROGRAMA')
+        prog_name = self._expect('ID')
+        self._expect('PUNTO_Y_COMA')
+        groups = self.vars() if self.type == 'VARS' else []
+        funcs = []
+        while self.type == 'NULA' or self.type in TIPOS:
+            funcs.append(self.funcs())
+        self._expect('INICIO')
+        body = self.cuerpo()
+        self._expect('FIN')
+        if self.tok is not None:
+            raise _syntax_error(self.tok)
+        return Program(prog_name, groups, funcs, body)
+
+    def tipo(self) -> str:
+        if self.type not in TIPOS:
+            raise _syntax_error(self.tok)
+        value = self.tok.value
+        self._advance()
+        return value
+
+    def vars(self):
+        self._expect('VARS')
+        line = self.tok.lineno if self.tok is not None else 0
+        first = (self._expect('ID'), self.var_dim())
+        groups = []
+        self.vars_todo(groups)
+        groups[0].names.insert(0, first)
+        groups[0].line = line
+        return groups
+
+    def var_dim(self):
+        if self.type != 'CORA_ABRE':
+            return None
+        self._advance()
+        dim = self._expect('CTE_ENT')
+        self._expect('CORA_CIERRA')
+        return dim
+
+    def vars_todo(self, groups) -> None:
+        while True:
+            names = []
+            while self.type == 'COMA':
+                self._advance()
+                names.append((self._expect('ID'), self.var_dim()))
+            line = self.tok.lineno if self.tok is not None else 0
+            self._expect('DOS_PUNTOS')
+            groups.append(VarGroup(names, self.tipo(), line))
+            self._expect('PUNTO_Y_COMA')
+            # vars_final: otro grupo empieza con ',' o ':' (sin la palabra vars)
+            if self.type != 'COMA' and self.type != 'DOS_PUNTOS':
+                return
+
+    def funcs(self) -> Function:
+        if self.type == 'NULA':
+            return_type = self.tok.value
+            self._advance()
+        else:
+            return_type = self.tipo()
+        line = self.tok.lineno if self.tok is not None else 0
+        func_name = self._expect('ID')
+        self._expect('PAR_ABRE')
+        params = []
+        if self.type == 'ID':
+            params.append(self.param())
+            while self.type == 'COMA':
+                self._advance()
+                params.append(self.param())
+        self._expect('PAR_CIERRA')
+        self._expect('LLAVE_ABRE')
+        groups = self.vars() if self.type == 'VARS' else []
+        body = self.cuerpo()
+        self._expect('LLAVE_CIERRA')
+        self._expect('PUNTO_Y_COMA')
+        return Function(func_name, return_type, params, groups, body, line)
+
+    def param(self):
+        name = self._expect('ID')
+        self._expect('DOS_PUNTOS')
+        return (name, self.tipo())
+
+    #  Estatutos
+
+    def cuerpo(self):
+        self._expect('LLAVE_ABRE')
+        body = self.list_estatuto()
+        self._expect('LLAVE_CIERRA')
+        return body
+
+    def list_estatuto(self):
+        stmts = []
+        while self.type in INICIO_ESTATUTO:
+            stmts.append(self.estatuto())
+        return stmts
+
+    def estatuto(self):
+        t = self.type
+        line = self.tok.lineno
+        if t == 'ID':
+            name = self.tok.value
+            self._advance()
+            if self.type == 'OP_ASIG':
+                self._advance()
+                expr = self.expresion()
+                self._expect('PUNTO_Y_COMA')
+                return Assign(name, expr, line)
+            if self.type == 'CORA_ABRE':
+                self._advance()
+                index = self.expresion()
+                self._expect('CORA_CIERRA')
+                self._expect('OP_ASIG')
+                expr = self.expresion()
+                self._expect('PUNTO_Y_COMA')
+                return AssignIndex(name, index, expr, line)
+            if self.type == 'PAR_ABRE':
+                call = self.llamada(name, line)
+                self._expect('PUNTO_Y_COMA')
+                return CallStmt(call, line)
+            raise _syntax_error(self.tok)
+        if t == 'SI':
+            return self.condicion()
+        if t == 'MIENTRAS':
+            return self.ciclo()
+        if t == 'ESCRIBE':
+            return self.imprime()
+        if t == 'LEE':
+            return self.lectura()
+        if t == 'RETURN':
+            self._advance()
+            if self.type == 'PUNTO_Y_COMA':
+                self._advance()
+                return Return(None, line)
+            expr = self.expresion()
+            self._expect('PUNTO_Y_COMA')
+            return Return(expr, line)
+        # CORA_ABRE list_estatuto CORA_CIERRA
+        self._expect('CORA_ABRE')
+        stmts = self.list_estatuto()
+        self._expect('CORA_CIERRA')
+        return Block(stmts, line)
+
+    def condicion(self) -> If:
+        line = self.tok.lineno
+        self._expect('SI')
+        self._expect('PAR_ABRE')
+        cond = self.expresion()
+        self._expect('PAR_CIERRA')
+        then_body = self.cuerpo()
+        else_body = None
+        if self.type == 'SINO':
+            self._advance()
+            else_body = self.cuerpo()
+        self._expect('PUNTO_Y_COMA')
+        return If(cond, then_body, else_body, line)
+
+    def ciclo(self) -> While:
+        line = self.tok.lineno
+        self._expect('MIENTRAS')
+        self._expect('PAR_ABRE')
+        cond = self.expresion()
+        self._expect('PAR_CIERRA')
+        self._expect('HAZ')
+        body = self.cuerpo()
+        self._expect('PUNTO_Y_COMA')
+        return While(cond, body, line)
+
+    def imprime(self) -> Print:
+        line = self.tok.lineno
+        self._expect('ESCRIBE')
+        self._expect('PAR_ABRE')
+        items = []
+        while True:
+            if self.type == 'LETRERO':
+                items.append(Letrero(self.tok.value))
+                self._advance()
+            else:
+                items.append(self.expresion())
+            if self.type != 'COMA':
+                break
+            self._advance()
+        self._expect('PAR_CIERRA')
+        self._expect('PUNTO_Y_COMA')
+        return Print(items, line)
+
+    def lectura(self) -> Read:
+        line = self.tok.lineno
+        self._expect('LEE')
+        self._expect('PAR_ABRE')
+        targets = [self.lee_destino()]
+        while self.type == 'COMA':
+            self._advance()
+            targets.append(self.lee_destino())
+        self._expect('PAR_CIERRA')
+        self._expect('PUNTO_Y_COMA')
+        return Read(targets, line)
+
+    def lee_destino(self):
+        name = self._expect('ID')
+        if self.type != 'CORA_ABRE':
+            return Var(name)
+        self._advance()
+        index = self.expresion()
+        self._expect('CORA_CIERRA')
+        return Index(name, index)
+
+    def llamada(self, func_name: str, line: int) -> Call:
+        # El ID ya se consumió; el token actual es '('
+        self._expect('PAR_ABRE')
+        args = []
+        if self.type in INICIO_EXPRESION:
+            args.append(self.expresion())
+            while self.type == 'COMA':
+                self._advance()
+                args.append(self.expresion())
+        self._expect('PAR_CIERRA')
+        return Call(func_name, args, line)
+
+    #  Expresiones
+    #
+    # expresion -> exp [relop exp], exp -> termino {(+|-) termino},
+    # termino -> factor {(*|/) factor}. Se lee con una pila explícita en lugar de
+    # un método por nivel: cada '(', índice o llamada abre un contexto nuevo, así
+    # miles de paréntesis anidados no agotan la pila de Python (como con PLY).
+
+    def expresion(self):
+        stack = []
+        ctx = _ExprContext('expr')
+        while True:
+            # Operando: '(' abre un contexto; si no, signo opcional y factor_cte
+            t = self.type
+            if t == 'PAR_ABRE':
+                self._advance()
+                stack.append(ctx)
+                ctx = _ExprContext('par')
+                continue
+            sign = None
+            if t == 'OP_SUMA' or t == 'OP_RESTA':
+                sign = self.tok.value
+                self._advance()
+                t = self.type
+            if t == 'CTE_ENT' or t == 'CTE_FLOT':
+                value = Const(self.tok.value, TIPO_ENTERO if t == 'CTE_ENT' else TIPO_FLOTANTE)
+                self._advance()
+            else:
+                line = self.tok.lineno if self.tok is not None else 0
+                name = self._expect('ID')
+                if self.type == 'PAR_ABRE':
+                    self._advance()
+                    if self.type in INICIO_EXPRESION:
+                        ctx.sign = sign
+                        stack.append(ctx)
+                        ctx = _ExprContext('call', name, line)
+                        continue
+                    self._expect('PAR_CIERRA')
+                    value = Call(name, [], line)
+                elif self.type == 'CORA_ABRE':
+                    self._advance()
+                    ctx.sign = sign
+                    stack.append(ctx)
+                    ctx = _ExprContext('index', name)
+                    continue
+                else:
+                    value = Var(name)
+            if sign is not None:
+                value = Unary(sign, value)
+
+            # Operadores tras el operando; al cerrar un contexto su resultado es
+            # el operando del contexto de afuera y se vuelve a este ciclo
+            while True:
+                ctx.factors.append(value)
+                if self.type == 'OP_MULT' or self.type == 'OP_DIV':
+                    ctx.factor_ops.append(self.tok.value)
+                    self._advance()
+                    break
+                ctx.terms.append(_right_nested(ctx.factors, ctx.factor_ops))
+                ctx.factors = []
+                ctx.factor_ops = []
+                if self.type == 'OP_SUMA' or self.type == 'OP_RESTA':
+                    ctx.term_ops.append(self.tok.value)
+                    self._advance()
+                    break
+                value = _right_nested(ctx.terms, ctx.term_ops)
+                ctx.terms = []
+                ctx.term_ops = []
+                if ctx.left is None and self.type in OPS_RELACIONALES:
+                    ctx.left = value
+                    ctx.op = self.tok.value
+                    self._advance()
+                    break
+                if ctx.left is not None:
+                    value = Binary(ctx.op, ctx.left, value)
+                    ctx.left = None
+
+                kind = ctx.kind
+                if kind == 'expr':
+                    return value
+                if kind == 'par':
+                    self._expect('PAR_CIERRA')
+                elif kind == 'index':
+                    self._expect('CORA_CIERRA')
+                    value = Index(ctx.name, value)
+                else:
+                    ctx.args.append(value)
+                    if self.type == 'COMA':
+                        self._advance()
+                        break
+                    self._expect('PAR_CIERRA')
+                    value = Call(ctx.name, ctx.args, ctx.line)
+                ctx = stack.pop()
+                if ctx.sign is not None:
+                    value = Unary(ctx.sign, value)
+                    ctx.sign = None
+
+
+class _ExprContext:
+    # Un nivel abierto de expresión: 'expr' (el de afuera), 'par', 'index' o 'call'
+    __slots__ = ('kind', 'name', 'line', 'args', 'sign', 'left', 'op',
+                 'terms', 'term_ops', 'factors', 'factor_ops')
+
+    def __init__(self, kind: str, name: str | None = None, line: int = 0) -> None:
+        self.kind = kind
+        self.name = name
+        self.line = line
+        self.args = []
+        self.sign = None       # signo pendiente sobre el índice o llamada que se está leyendo
+        self.left = None       # lado izquierdo de un operador relacional
+        self.op = None
+        self.terms = []
+        self.term_ops = []
+        self.factors = []
+        self.factor_ops = []
+
+
+def _right_nested(operands: list, ops: list):
+    # exp y termino son recursivas por la derecha en la gramática: los operandos
+    # se leen de izquierda a derecha y se combinan de derecha a izquierda
+    result = operands[-1]
+    for i in range(len(ops) - 1, -1, -1):
+        result = Binary(ops[i], operands[i], result)
+    return result
 
 
 # ============================================================
 #  API PÚBLICA DEL PARSER
 # ============================================================
-def parse(code: str):
-    _reset_semantic_structures()
-    reset_ir()  # limpiar PilaO, PTypes, POper, PJumps, quads, temporales
-    ast = parser.parse(code, lexer=_lexer)
-    # Salvaguarda: si el salto a main quedó sin rellenar, rellenarlo aquí
-    if main_goto is not None:
-        # Calcular inicio probable de main:
-        # - si main_start se seteo en program_main, úsalo
-        # - si no, toma el quad siguiente al último ENDFUNC (o 1 si no hay funcs)
-        start_guess = 1
-        for idx, (op, _, _, _) in enumerate(quads):
-            if op == 'ENDFUNC':
-                start_guess = idx + 1
-        target = main_start if main_start is not None else start_guess
+def parse(code: str, layout: SegmentLayout | None = None, check_bounds: bool = True, lexer=None,
+          frontend: str = "ply", stats: "CompileStats | None" = None) -> Program:
+    # Parsea y compila: los cuádruplos quedan en intermediate.quads
+    # stats: si se da un CompileStats, se llena con tiempos, memoria y conteos por fase
+    return compile_ast(parse_ast(code, lexer, frontend, stats), layout, check_bounds, stats)
+
+
+def compile_program(code: str, layout: SegmentLayout | None = None, check_bounds: bool = True, lexer=None,
+                    frontend: str = "ply", stats: "CompileStats | None" = None) -> "CompiledProgram":
+    # Compila y congela el resultado: lo pueden ejecutar muchas VM sin volver a prepararlo
+    from compiled_program import CompiledProgram
+    parse(code, layout, check_bounds, lexer, frontend, stats)
+    return CompiledProgram.build(quads, const_table, func_dir, memory_manager.layout)
+
+
+def parse_ast(code: str, lexer=None, frontend: str = "ply", stats: "CompileStats | None" = None) -> Program:
+    # Solo el análisis sintáctico: regresa el árbol sin revisar ni generar nada
+    # lexer: cualquier objeto con input()/token() (p.ej. fast_scanner.FastLexer); por omisión el de PLY
+    # frontend: "ply" (tablas LALR) o "rd" (RecursiveDescentParser); construyen el mismo árbol
+    if frontend not in ("ply", "rd"):
+        raise ValueError(f"Parser desconocido: {frontend!r}")
+    lexer = lexer or _lexer
+    if stats is not None:
+        # Para medir por separado, primero se sacan todos los tokens y el parser los consume ya hechos
+        from compile_stats import ReplayLexer, tokenize
+        check = stats.progress_check()
+        with stats.phase("lex"):
+            token_list = tokenize(code, lexer, check)
+        stats.tokens = len(token_list)
+        lexer = ReplayLexer(token_list, check)
+    lexer.lineno = 1
+    # Las tablas de PLY se cargan antes de medir: es un costo de arranque, no del programa
+    ply_parser = _ply_parser() if frontend == "ply" else None
+    with stats.phase("parse") if stats is not None else nullcontext():
+        if ply_parser is None:
+            program = RecursiveDescentParser(lexer).parse(code)
+        else:
+            program = ply_parser.parse(code, lexer=lexer)
+    program.lines = code.count('\n') + 1
+    return program
+
+
+def compile_ast(program: Program, layout: SegmentLayout | None = None, check_bounds: bool = True,
+                stats: "CompileStats | None" = None) -> Program:
+    # Análisis semántico y generación de cuádruplos sobre un árbol ya parseado.
+    # Si un segmento se llena se agranda y se repiten las dos pasadas (sin
+    # volver a parsear), así los programas grandes compilan sin configurar nada.
+    global func_dir, global_var_table
+    layout = layout or DEFAULT_LAYOUT
+    while True:
+        memory_manager.set_layout(layout)
+        reset_ir()  # limpiar quads, constantes y temporales
+        analyzer = SemanticAnalyzer()
+        generator = CodeGenerator(check_bounds)
+        func_dir = analyzer.func_dir
+        global_var_table = analyzer.global_var_table
         try:
-            _, _, _, res = quads[main_goto]
-            if res in (None, 0):
-                fill_quad(main_goto, target)
-        except Exception:
-            fill_quad(main_goto, target)
-    return ast
+            if stats is None:
+                analyzer.analyze(program)
+                generator.generate(program)
+                return program
+            stats.layouts += 1
+            with stats.phase("semantic"):
+                analyzer.analyze(program)
+            with stats.phase("codegen"):
+                generator.generate(program)
+            stats.record_output(len(quads), len(const_table), func_dir, memory_manager.get_usage(SEG_TEMP))
+            return program
+        except MemoryOverflowError as e:
+            if e.segment is None:
+                raise
+            layout = _grown_layout(layout, e.segment, program.lines, generator.line or analyzer.line)
+
+
+def _grown_layout(layout: SegmentLayout, segment: str, total_lines: int, lineno: int) -> SegmentLayout:
+    # El tamaño se estima con la parte del programa que se alcanzó a compilar;
+    # duplicar a ciegas recompila una vez por cada duplicación y el costo
+    # deja de ser lineal en programas grandes. Se limita a 16x porque los
+    # locales y temporales solo cuentan la función actual.
+    factor = min(16, max(2, math.ceil(1.1 * total_lines / max(lineno, 1))))
+    grown = layout
+    for seg in layout.sizes:
+        # Los segmentos que se llenan al mismo ritmo también se agrandan
+        used = max(memory_manager.get_usage(seg).values(), default=0)
+        if seg == segment or used * factor > layout.size(seg):
+            grown = grown.grown(seg, factor)
+    if grown.max_address > MAX_ADDRESS:
+        # La estimación se pasó del límite de direcciones: solo se duplica el segmento lleno
+        grown = layout.grown(segment)
+        if grown.max_address > MAX_ADDRESS:
+            raise SemanticError(
+                f"El programa necesita más direcciones de {segment} de las que caben en los cuádruplos "
+                f"(linea {lineno}; máximo {MAX_ADDRESS})"
+            )
+    return grown
 
 
 def get_function_directory() -> FunctionDirectory:
@@ -805,3 +1063,11 @@ def get_function_directory() -> FunctionDirectory:
 
 def get_global_var_table() -> VariableTable:
     return global_var_table
+
+
+def get_memory_layout() -> SegmentLayout:
+    return memory_manager.layout
+
+
+if __name__ == "__main__":
+    build_tables()
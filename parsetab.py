@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'programanonassocOP_IGUALOP_DIFOP_MAYOROP_MENOROP_MAYORIGUALOP_MENORIGUALleftOP_SUMAOP_RESTAleftOP_MULTOP_DIVCOMA CORA_ABRE CORA_CIERRA CTE_ENT CTE_FLOT DOS_PUNTOS ENTERO ESCRIBE FIN FLOTANTE HAZ ID INICIO LETRERO LLAVE_ABRE LLAVE_CIERRA MIENTRAS NULA OP_ASIG OP_DIF OP_DIV OP_IGUAL OP_MAYOR OP_MAYORIGUAL OP_MENOR OP_MENORIGUAL OP_MULT OP_RESTA OP_SUMA PAR_ABRE PAR_CIERRA PROGRAMA PUNTO_Y_COMA RETURN SI SINO VARStipo : ENTERO\n            | FLOTANTEcte : CTE_ENT\n           | CTE_FLOTretorno : RETURN expresion PUNTO_Y_COMA\n               | RETURN PUNTO_Y_COMAasigna : ID OP_ASIG expresion PUNTO_Y_COMAestatuto : asigna\n                | condicion\n                | ciclo\n                | llamada PUNTO_Y_COMA\n                | imprime\n                | retorno\n                | CORA_ABRE list_estatuto CORA_CIERRAlist_estatuto : empty\n                     | estatuto list_estatutocuerpo : LLAVE_ABRE cuerpo_estat LLAVE_CIERRAcuerpo_estat : empty\n                    | estatuto cuerpo_estatexpresion : exp expresion_expexpresion_exp : empty\n                     | OP_MAYOR exp\n                     | OP_MENOR exp\n                     | OP_MAYORIGUAL exp\n                     | OP_MENORIGUAL exp\n                     | OP_DIF   exp\n                     | OP_IGUAL expciclo : MIENTRAS ciclo_marca PAR_ABRE expresion ciclo_cond_prep PAR_CIERRA HAZ cuerpo PUNTO_Y_COMAciclo_cond_prep : ciclo_marca : condicion : SI PAR_ABRE expresion condicion_marca PAR_CIERRA cuerpo condicion_cuerpo PUNTO_Y_COMAcondicion_marca : condicion_cuerpo : empty\n                        | SINO condicion_else_marca cuerpocondicion_else_marca : imprime : ESCRIBE PAR_ABRE imprime_exp PAR_CIERRA PUNTO_Y_COMAimprime_exp : expresion imprime_exp_p\n                   | LETRERO  imprime_exp_pimprime_exp_p : empty\n                     | COMA imprime_expllamada : ID PAR_ABRE llamada_expresion PAR_CIERRAllamada_expresion : empty\n                         | expresion llamada_exllamada_ex : empty\n                  | COMA expresion llamada_exfactor : PAR_ABRE expresion PAR_CIERRAfactor : factor_sr factor_ctefactor_sr : empty\n                 | factor_rsfactor_rs : OP_SUMA\n                 | OP_RESTAfactor_cte : ID\n                  | cte\n                  | llamadavars : VARS ID vars_todovars_todo : vars_coma DOS_PUNTOS tipo PUNTO_Y_COMA vars_finalvars_coma : empty\n                 | COMA ID vars_comavars_final : empty\n                  | vars_todofunc_header : funcs_nt ID PAR_ABRE func_tipo PAR_CIERRAfuncs : func_header LLAVE_ABRE func_vars cuerpo LLAVE_CIERRA PUNTO_Y_COMAfuncs_nt : NULA\n                | tipofunc_tipo : empty\n                 | ID DOS_PUNTOS tipo funcs_comafuncs_coma : empty\n                  | COMA ID DOS_PUNTOS tipo funcs_comafunc_vars : empty\n                 | varsexp : termino exp_terminoexp_termino : empty\n                   | OP_SUMA exp\n                   | OP_RESTA exptermino : factor termino_factortermino_factor : empty\n                      | OP_MULT termino\n                      | OP_DIV  terminoprograma : PROGRAMA ID PUNTO_Y_COMA program_entry pro_vars pro_funcs INICIO program_main cuerpo FINprogram_entry : program_main : pro_vars : empty\n                | varspro_funcs : empty\n                 | pro_funcs_listpro_funcs_list : funcs\n                      | pro_funcs_list funcsempty :'
+_lr_signature = 'programanonassocOP_IGUALOP_DIFOP_MAYOROP_MENOROP_MAYORIGUALOP_MENORIGUALleftOP_SUMAOP_RESTAleftOP_MULTOP_DIVCOMA CORA_ABRE CORA_CIERRA CTE_ENT CTE_FLOT DOS_PUNTOS ENTERO ESCRIBE FIN FLOTANTE HAZ ID INICIO LEE LETRERO LLAVE_ABRE LLAVE_CIERRA MIENTRAS NULA OP_ASIG OP_DIF OP_DIV OP_IGUAL OP_MAYOR OP_MAYORIGUAL OP_MENOR OP_MENORIGUAL OP_MULT OP_RESTA OP_SUMA PAR_ABRE PAR_CIERRA PROGRAMA PUNTO_Y_COMA RETURN SI SINO VARStipo : ENTERO\n            | FLOTANTEcte : CTE_ENT\n           | CTE_FLOTretorno : RETURN expresion PUNTO_Y_COMA\n               | RETURN PUNTO_Y_COMAasigna : ID OP_ASIG expresion PUNTO_Y_COMAasigna : ID CORA_ABRE expresion CORA_CIERRA OP_ASIG expresion PUNTO_Y_COMAestatuto : asigna\n                | condicion\n                | ciclo\n                | llamada PUNTO_Y_COMA\n                | imprime\n                | lectura\n                | retorno\n                | CORA_ABRE list_estatuto CORA_CIERRAlist_estatuto : empty\n                     | list_estatuto estatutocuerpo : LLAVE_ABRE cuerpo_estat LLAVE_CIERRAcuerpo_estat : empty\n                    | cuerpo_estat estatutoexpresion : exp expresion_expexpresion_exp : empty\n                     | OP_MAYOR exp\n                     | OP_MENOR exp\n                     | OP_MAYORIGUAL exp\n                     | OP_MENORIGUAL exp\n                     | OP_DIF   exp\n                     | OP_IGUAL expciclo : MIENTRAS PAR_ABRE expresion PAR_CIERRA HAZ cuerpo PUNTO_Y_COMAcondicion : SI PAR_ABRE expresion PAR_CIERRA cuerpo condicion_cuerpo PUNTO_Y_COMAcondicion_cuerpo : empty\n                        | SINO cuerpoimprime : ESCRIBE PAR_ABRE imprime_exp PAR_CIERRA PUNTO_Y_COMAimprime_exp : imprime_item\n                   | imprime_exp COMA imprime_itemimprime_item : expresion\n                    | LETREROlectura : LEE PAR_ABRE lee_lista PAR_CIERRA PUNTO_Y_COMAlee_lista : lee_destino\n                 | lee_lista COMA lee_destinolee_destino : IDlee_destino : ID CORA_ABRE expresion CORA_CIERRAllamada : ID PAR_ABRE llamada_expresion PAR_CIERRAllamada_expresion : empty\n                         | llamada_exllamada_ex : expresion\n                  | llamada_ex COMA expresionfactor : PAR_ABRE expresion PAR_CIERRAfactor : factor_sr factor_ctefactor_sr : empty\n                 | factor_rsfactor_rs : OP_SUMA\n                 | OP_RESTAfactor_cte : ID\n                  | cte\n                  | llamadafactor_cte : ID CORA_ABRE expresion CORA_CIERRAvars : VARS ID var_dim vars_todovar_dim : empty\n               | CORA_ABRE CTE_ENT CORA_CIERRAvars_todo : vars_coma DOS_PUNTOS tipo PUNTO_Y_COMA vars_finalvars_coma : empty\n                 | vars_coma COMA ID var_dimvars_final : empty\n                  | vars_todofuncs : funcs_nt ID PAR_ABRE func_tipo PAR_CIERRA LLAVE_ABRE func_vars cuerpo LLAVE_CIERRA PUNTO_Y_COMAfuncs_nt : NULA\n                | tipofunc_tipo : empty\n                 | funcs_comafuncs_coma : ID DOS_PUNTOS tipo\n                  | funcs_coma COMA ID DOS_PUNTOS tipofunc_vars : empty\n                 | varsexp : termino exp_terminoexp_termino : empty\n                   | OP_SUMA exp\n                   | OP_RESTA exptermino : factor termino_factortermino_factor : empty\n                      | OP_MULT termino\n                      | OP_DIV  terminoprograma : PROGRAMA ID PUNTO_Y_COMA pro_vars pro_funcs INICIO cuerpo FINpro_vars : empty\n                | varspro_funcs : empty\n                 | pro_funcs_listpro_funcs_list : funcs\n                      | pro_funcs_list funcsempty :'
     
-_lr_action_items = {'PROGRAMA':([0,],[2,]),'$end':([1,44,],[0,-79,]),'ID':([2,9,15,16,17,18,19,28,33,37,47,48,49,50,52,53,54,59,66,69,70,71,72,74,76,80,81,82,83,84,85,91,95,98,102,105,106,107,108,109,110,113,114,117,118,128,129,133,139,156,168,172,],[3,20,24,-63,-64,-1,-2,35,39,55,55,-8,-9,-10,-12,-13,55,-88,-11,55,-88,-88,-88,-88,-6,-88,121,-48,-49,-50,-51,-14,-48,-88,-5,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,152,-7,-88,-88,-36,-31,-28,]),'PUNTO_Y_COMA':([3,18,19,42,51,59,60,64,75,77,78,79,93,103,104,111,112,115,116,120,121,122,123,124,125,130,136,141,142,143,144,145,146,147,148,149,150,151,160,163,164,170,171,],[4,-1,-2,63,66,76,86,-17,102,-88,-88,-88,129,-20,-21,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,156,-22,-23,-24,-25,-26,-27,-73,-74,-77,-78,-46,-88,168,-33,172,-34,]),'VARS':([4,5,23,],[-80,9,9,]),'NULA':([4,5,6,7,8,12,13,22,25,63,86,88,89,90,],[-80,-88,16,-82,-83,16,-86,-87,-55,-88,-62,-56,-59,-60,]),'ENTERO':([4,5,6,7,8,12,13,22,25,34,61,63,86,88,89,90,158,],[-80,-88,18,-82,-83,18,-86,-87,-55,18,18,-88,-62,-56,-59,-60,18,]),'FLOTANTE':([4,5,6,7,8,12,13,22,25,34,61,63,86,88,89,90,158,],[-80,-88,19,-82,-83,19,-86,-87,-55,19,19,-88,-62,-56,-59,-60,19,]),'INICIO':([4,5,6,7,8,10,11,12,13,22,25,63,86,88,89,90,],[-80,-88,-88,-82,-83,21,-84,-85,-86,-87,-55,-88,-62,-56,-59,-60,]),'LLAVE_ABRE':([14,21,23,25,29,30,31,32,62,63,88,89,90,154,165,166,169,],[23,-81,-88,-55,37,37,-69,-70,-61,-88,-56,-59,-60,37,-35,37,37,]),'COMA':([18,19,20,35,63,77,78,79,87,96,100,101,103,104,111,112,115,116,120,121,122,123,124,125,130,141,142,143,144,145,146,147,148,149,150,151,153,162,],[-1,-2,28,28,28,-88,-88,-88,128,133,139,139,-20,-21,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-22,-23,-24,-25,-26,-27,-73,-74,-77,-78,-46,133,128,]),'PAR_CIERRA':([18,19,33,40,41,71,77,78,79,87,94,95,96,97,99,100,101,103,104,111,112,115,116,119,120,121,122,123,124,125,126,127,130,131,132,134,135,137,138,140,141,142,143,144,145,146,147,148,149,150,151,153,155,157,159,162,167,],[-1,-2,-88,62,-65,-88,-88,-88,-88,-88,130,-42,-88,-32,136,-88,-88,-20,-21,-71,-72,-75,-76,151,-47,-52,-53,-54,-3,-4,-66,-67,-41,-43,-44,154,-29,-37,-39,-38,-22,-23,-24,-25,-26,-27,-73,-74,-77,-78,-46,-88,161,-40,-45,-88,-68,]),'DOS_PUNTOS':([20,26,27,35,39,43,63,89,152,],[-88,34,-57,-88,61,-58,-88,-57,158,]),'PAR_ABRE':([24,55,56,57,58,59,70,71,72,73,74,80,98,105,106,107,108,109,110,113,114,117,118,121,133,139,],[33,71,72,-30,74,80,80,80,80,98,80,80,80,80,80,80,80,80,80,80,80,80,80,71,80,80,]),'FIN':([36,64,],[44,-17,]),'LLAVE_CIERRA':([37,38,45,46,47,48,49,50,52,53,64,65,66,76,91,102,129,156,168,172,],[-88,60,64,-18,-88,-8,-9,-10,-12,-13,-17,-19,-11,-6,-14,-5,-7,-36,-31,-28,]),'CORA_ABRE':([37,47,48,49,50,52,53,54,66,69,76,91,102,129,156,168,172,],[54,54,-8,-9,-10,-12,-13,54,-11,54,-6,-14,-5,-7,-36,-31,-28,]),'SI':([37,47,48,49,50,52,53,54,66,69,76,91,102,129,156,168,172,],[56,56,-8,-9,-10,-12,-13,56,-11,56,-6,-14,-5,-7,-36,-31,-28,]),'MIENTRAS':([37,47,48,49,50,52,53,54,66,69,76,91,102,129,156,168,172,],[57,57,-8,-9,-10,-12,-13,57,-11,57,-6,-14,-5,-7,-36,-31,-28,]),'ESCRIBE':([37,47,48,49,50,52,53,54,66,69,76,91,102,129,156,168,172,],[58,58,-8,-9,-10,-12,-13,58,-11,58,-6,-14,-5,-7,-36,-31,-28,]),'RETURN':([37,47,48,49,50,52,53,54,66,69,76,91,102,129,156,168,172,],[59,59,-8,-9,-10,-12,-13,59,-11,59,-6,-14,-5,-7,-36,-31,-28,]),'CORA_CIERRA':([48,49,50,52,53,54,66,67,68,69,76,91,92,102,129,156,168,172,],[-8,-9,-10,-12,-13,-88,-11,91,-15,-88,-6,-14,-16,-5,-7,-36,-31,-28,]),'OP_ASIG':([55,],[70,]),'CTE_ENT':([59,70,71,72,74,80,81,82,83,84,85,95,98,105,106,107,108,109,110,113,114,117,118,133,139,],[-88,-88,-88,-88,-88,-88,124,-48,-49,-50,-51,-48,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,]),'CTE_FLOT':([59,70,71,72,74,80,81,82,83,84,85,95,98,105,106,107,108,109,110,113,114,117,118,133,139,],[-88,-88,-88,-88,-88,-88,125,-48,-49,-50,-51,-48,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,-88,]),'OP_SUMA':([59,70,71,72,74,78,79,80,98,105,106,107,108,109,110,113,114,115,116,117,118,120,121,122,123,124,125,130,133,139,149,150,151,],[84,84,84,84,84,113,-88,84,84,84,84,84,84,84,84,84,84,-75,-76,84,84,-47,-52,-53,-54,-3,-4,-41,84,84,-77,-78,-46,]),'OP_RESTA':([59,70,71,72,74,78,79,80,98,105,106,107,108,109,110,113,114,115,116,117,118,120,121,122,123,124,125,130,133,139,149,150,151,],[85,85,85,85,85,114,-88,85,85,85,85,85,85,85,85,85,85,-75,-76,85,85,-47,-52,-53,-54,-3,-4,-41,85,85,-77,-78,-46,]),'SINO':([64,160,],[-17,165,]),'LETRERO':([74,139,],[101,101,]),'OP_MAYOR':([77,78,79,111,112,115,116,120,121,122,123,124,125,130,147,148,149,150,151,],[105,-88,-88,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-73,-74,-77,-78,-46,]),'OP_MENOR':([77,78,79,111,112,115,116,120,121,122,123,124,125,130,147,148,149,150,151,],[106,-88,-88,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-73,-74,-77,-78,-46,]),'OP_MAYORIGUAL':([77,78,79,111,112,115,116,120,121,122,123,124,125,130,147,148,149,150,151,],[107,-88,-88,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-73,-74,-77,-78,-46,]),'OP_MENORIGUAL':([77,78,79,111,112,115,116,120,121,122,123,124,125,130,147,148,149,150,151,],[108,-88,-88,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-73,-74,-77,-78,-46,]),'OP_DIF':([77,78,79,111,112,115,116,120,121,122,123,124,125,130,147,148,149,150,151,],[109,-88,-88,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-73,-74,-77,-78,-46,]),'OP_IGUAL':([77,78,79,111,112,115,116,120,121,122,123,124,125,130,147,148,149,150,151,],[110,-88,-88,-71,-72,-75,-76,-47,-52,-53,-54,-3,-4,-41,-73,-74,-77,-78,-46,]),'OP_MULT':([79,120,121,122,123,124,125,130,151,],[117,-47,-52,-53,-54,-3,-4,-41,-46,]),'OP_DIV':([79,120,121,122,123,124,125,130,151,],[118,-47,-52,-53,-54,-3,-4,-41,-46,]),'HAZ':([161,],[166,]),}
+_lr_action_items = {'PROGRAMA':([0,],[2,]),'$end':([1,32,],[0,-84,]),'ID':([2,8,13,14,15,16,17,26,27,33,34,40,43,44,45,46,48,49,50,51,57,60,63,64,65,66,67,68,69,70,71,72,74,78,79,80,81,82,83,89,90,94,106,109,110,111,112,113,114,117,118,121,122,137,140,144,146,147,159,162,166,168,181,182,184,],[3,18,21,-68,-69,-1,-2,-91,35,52,-20,62,-21,-9,-10,-11,-13,-14,-15,-91,-91,86,-12,52,-17,-91,-91,-91,-91,-91,-91,105,-6,-91,125,-51,-52,-53,-54,-16,-18,-51,-5,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-7,-91,-91,105,-91,-91,-91,-34,-39,-8,-31,-30,]),'PUNTO_Y_COMA':([3,16,17,42,47,57,61,73,75,76,77,91,107,108,115,116,119,120,124,125,126,127,128,129,139,143,145,148,149,150,151,152,153,154,155,156,157,158,164,172,173,174,175,177,179,183,],[4,-1,-2,-19,63,74,87,106,-91,-91,-91,137,-22,-23,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,166,168,-24,-25,-26,-27,-28,-29,-78,-79,-82,-83,-49,-91,180,181,182,-32,184,-58,-33,]),'NULA':([4,5,6,7,11,12,20,28,87,134,135,136,180,],[-91,14,-85,-86,14,-89,-90,-59,-91,-62,-65,-66,-67,]),'ENTERO':([4,5,6,7,11,12,20,28,39,58,87,133,134,135,136,180,],[-91,16,-85,-86,16,-89,-90,-59,16,16,-91,16,-62,-65,-66,-67,]),'FLOTANTE':([4,5,6,7,11,12,20,28,39,58,87,133,134,135,136,180,],[-91,17,-85,-86,17,-89,-90,-59,17,17,-91,17,-62,-65,-66,-67,]),'INICIO':([4,5,6,7,9,10,11,12,20,28,87,134,135,136,180,],[-91,-91,-85,-86,19,-87,-88,-89,-90,-59,-91,-62,-65,-66,-67,]),'VARS':([4,85,],[8,8,]),'COMA':([16,17,18,22,23,29,30,38,41,62,75,76,77,84,87,88,95,96,99,100,101,102,103,104,105,107,108,115,116,119,120,124,125,126,127,128,129,135,139,148,149,150,151,152,153,154,155,156,157,158,161,163,167,169,178,179,],[-1,-2,-91,-91,-60,40,-63,60,-61,-91,-91,-91,-91,-72,-91,-64,140,-47,144,-35,-37,-38,146,-40,-42,-22,-23,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-63,-44,-24,-25,-26,-27,-28,-29,-78,-79,-82,-83,-49,-73,-48,-36,-41,-43,-58,]),'PAR_CIERRA':([16,17,27,36,37,38,68,75,76,77,84,93,94,95,96,97,98,99,100,101,102,103,104,105,107,108,115,116,119,120,123,124,125,126,127,128,129,139,148,149,150,151,152,153,154,155,156,157,158,161,163,167,169,178,179,],[-1,-2,-91,59,-70,-71,-91,-91,-91,-91,-72,139,-45,-46,-47,141,142,143,-35,-37,-38,145,-40,-42,-22,-23,-76,-77,-80,-81,158,-50,-55,-56,-57,-3,-4,-44,-24,-25,-26,-27,-28,-29,-78,-79,-82,-83,-49,-73,-48,-36,-41,-43,-58,]),'CORA_ABRE':([18,26,33,34,43,44,45,46,48,49,50,51,52,62,63,64,65,74,89,90,105,106,125,137,166,168,181,182,184,],[24,-91,51,-20,-21,-9,-10,-11,-13,-14,-15,-91,67,24,-12,51,-17,-6,-16,-18,147,-5,159,-7,-34,-39,-8,-31,-30,]),'DOS_PUNTOS':([18,22,23,29,30,35,41,62,86,87,88,135,],[-91,-91,-60,39,-63,58,-61,-91,133,-91,-64,-63,]),'LLAVE_ABRE':([19,28,59,85,87,130,131,132,134,135,136,141,165,176,],[26,-59,85,-91,-91,26,-74,-75,-62,-65,-66,26,26,26,]),'PAR_ABRE':([21,52,53,54,55,56,57,66,67,68,69,70,71,78,109,110,111,112,113,114,117,118,121,122,125,140,144,147,159,162,],[27,68,69,70,71,72,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,68,78,78,78,78,78,]),'CTE_ENT':([24,57,66,67,68,69,70,71,78,79,80,81,82,83,94,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,],[31,-91,-91,-91,-91,-91,-91,-91,-91,128,-51,-52,-53,-54,-51,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,]),'FIN':([25,42,],[32,-19,]),'LLAVE_CIERRA':([26,33,34,42,43,44,45,46,48,49,50,63,74,89,106,137,160,166,168,181,182,184,],[-91,42,-20,-19,-21,-9,-10,-11,-13,-14,-15,-12,-6,-16,-5,-7,172,-34,-39,-8,-31,-30,]),'SI':([26,33,34,43,44,45,46,48,49,50,51,63,64,65,74,89,90,106,137,166,168,181,182,184,],[-91,53,-20,-21,-9,-10,-11,-13,-14,-15,-91,-12,53,-17,-6,-16,-18,-5,-7,-34,-39,-8,-31,-30,]),'MIENTRAS':([26,33,34,43,44,45,46,48,49,50,51,63,64,65,74,89,90,106,137,166,168,181,182,184,],[-91,54,-20,-21,-9,-10,-11,-13,-14,-15,-91,-12,54,-17,-6,-16,-18,-5,-7,-34,-39,-8,-31,-30,]),'ESCRIBE':([26,33,34,43,44,45,46,48,49,50,51,63,64,65,74,89,90,106,137,166,168,181,182,184,],[-91,55,-20,-21,-9,-10,-11,-13,-14,-15,-91,-12,55,-17,-6,-16,-18,-5,-7,-34,-39,-8,-31,-30,]),'LEE':([26,33,34,43,44,45,46,48,49,50,51,63,64,65,74,89,90,106,137,166,168,181,182,184,],[-91,56,-20,-21,-9,-10,-11,-13,-14,-15,-91,-12,56,-17,-6,-16,-18,-5,-7,-34,-39,-8,-31,-30,]),'RETURN':([26,33,34,43,44,45,46,48,49,50,51,63,64,65,74,89,90,106,137,166,168,181,182,184,],[-91,57,-20,-21,-9,-10,-11,-13,-14,-15,-91,-12,57,-17,-6,-16,-18,-5,-7,-34,-39,-8,-31,-30,]),'CORA_CIERRA':([31,44,45,46,48,49,50,51,63,64,65,74,75,76,77,89,90,92,106,107,108,115,116,119,120,124,125,126,127,128,129,137,139,148,149,150,151,152,153,154,155,156,157,158,166,168,170,171,179,181,182,184,],[41,-9,-10,-11,-13,-14,-15,-91,-12,89,-17,-6,-91,-91,-91,-16,-18,138,-5,-22,-23,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-7,-44,-24,-25,-26,-27,-28,-29,-78,-79,-82,-83,-49,-34,-39,178,179,-58,-8,-31,-30,]),'SINO':([42,164,],[-19,176,]),'OP_ASIG':([52,138,],[66,162,]),'CTE_FLOT':([57,66,67,68,69,70,71,78,79,80,81,82,83,94,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,],[-91,-91,-91,-91,-91,-91,-91,-91,129,-51,-52,-53,-54,-51,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,-91,]),'OP_SUMA':([57,66,67,68,69,70,71,76,77,78,109,110,111,112,113,114,117,118,119,120,121,122,124,125,126,127,128,129,139,140,144,147,156,157,158,159,162,179,],[82,82,82,82,82,82,82,117,-91,82,82,82,82,82,82,82,82,82,-80,-81,82,82,-50,-55,-56,-57,-3,-4,-44,82,82,82,-82,-83,-49,82,82,-58,]),'OP_RESTA':([57,66,67,68,69,70,71,76,77,78,109,110,111,112,113,114,117,118,119,120,121,122,124,125,126,127,128,129,139,140,144,147,156,157,158,159,162,179,],[83,83,83,83,83,83,83,118,-91,83,83,83,83,83,83,83,83,83,-80,-81,83,83,-50,-55,-56,-57,-3,-4,-44,83,83,83,-82,-83,-49,83,83,-58,]),'LETRERO':([71,144,],[102,102,]),'OP_MAYOR':([75,76,77,115,116,119,120,124,125,126,127,128,129,139,154,155,156,157,158,179,],[109,-91,-91,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,-78,-79,-82,-83,-49,-58,]),'OP_MENOR':([75,76,77,115,116,119,120,124,125,126,127,128,129,139,154,155,156,157,158,179,],[110,-91,-91,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,-78,-79,-82,-83,-49,-58,]),'OP_MAYORIGUAL':([75,76,77,115,116,119,120,124,125,126,127,128,129,139,154,155,156,157,158,179,],[111,-91,-91,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,-78,-79,-82,-83,-49,-58,]),'OP_MENORIGUAL':([75,76,77,115,116,119,120,124,125,126,127,128,129,139,154,155,156,157,158,179,],[112,-91,-91,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,-78,-79,-82,-83,-49,-58,]),'OP_DIF':([75,76,77,115,116,119,120,124,125,126,127,128,129,139,154,155,156,157,158,179,],[113,-91,-91,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,-78,-79,-82,-83,-49,-58,]),'OP_IGUAL':([75,76,77,115,116,119,120,124,125,126,127,128,129,139,154,155,156,157,158,179,],[114,-91,-91,-76,-77,-80,-81,-50,-55,-56,-57,-3,-4,-44,-78,-79,-82,-83,-49,-58,]),'OP_MULT':([77,124,125,126,127,128,129,139,158,179,],[121,-50,-55,-56,-57,-3,-4,-44,-49,-58,]),'OP_DIV':([77,124,125,126,127,128,129,139,158,179,],[122,-50,-55,-56,-57,-3,-4,-44,-49,-58,]),'HAZ':([142,],[165,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'programa':([0,],[1,]),'program_entry':([4,],[5,]),'pro_vars':([5,],[6,]),'empty':([5,6,20,23,33,35,37,47,54,59,63,69,70,71,72,74,77,78,79,80,87,96,98,100,101,105,106,107,108,109,110,113,114,117,118,133,139,153,160,162,],[7,11,27,31,41,27,46,46,68,82,89,68,82,95,82,82,104,112,116,82,127,132,82,138,138,82,82,82,82,82,82,82,82,82,82,82,82,132,164,127,]),'vars':([5,23,],[8,32,]),'pro_funcs':([6,],[10,]),'pro_funcs_list':([6,],[12,]),'funcs':([6,12,],[13,22,]),'func_header':([6,12,],[14,14,]),'funcs_nt':([6,12,],[15,15,]),'tipo':([6,12,34,61,158,],[17,17,42,87,162,]),'vars_todo':([20,63,],[25,90,]),'vars_coma':([20,35,63,],[26,43,26,]),'program_main':([21,],[29,]),'func_vars':([23,],[30,]),'cuerpo':([29,30,154,166,169,],[36,38,160,170,171,]),'func_tipo':([33,],[40,]),'cuerpo_estat':([37,47,],[45,65,]),'estatuto':([37,47,54,69,],[47,47,69,69,]),'asigna':([37,47,54,69,],[48,48,48,48,]),'condicion':([37,47,54,69,],[49,49,49,49,]),'ciclo':([37,47,54,69,],[50,50,50,50,]),'llamada':([37,47,54,69,81,],[51,51,51,51,123,]),'imprime':([37,47,54,69,],[52,52,52,52,]),'retorno':([37,47,54,69,],[53,53,53,53,]),'list_estatuto':([54,69,],[67,92,]),'ciclo_marca':([57,],[73,]),'expresion':([59,70,71,72,74,80,98,133,139,],[75,93,96,97,100,119,135,153,100,]),'exp':([59,70,71,72,74,80,98,105,106,107,108,109,110,113,114,133,139,],[77,77,77,77,77,77,77,141,142,143,144,145,146,147,148,77,77,]),'termino':([59,70,71,72,74,80,98,105,106,107,108,109,110,113,114,117,118,133,139,],[78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,149,150,78,78,]),'factor':([59,70,71,72,74,80,98,105,106,107,108,109,110,113,114,117,118,133,139,],[79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,]),'factor_sr':([59,70,71,72,74,80,98,105,106,107,108,109,110,113,114,117,118,133,139,],[81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,]),'factor_rs':([59,70,71,72,74,80,98,105,106,107,108,109,110,113,114,117,118,133,139,],[83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,]),'vars_final':([63,],[88,]),'llamada_expresion':([71,],[94,]),'imprime_exp':([74,139,],[99,157,]),'expresion_exp':([77,],[103,]),'exp_termino':([78,],[111,]),'termino_factor':([79,],[115,]),'factor_cte':([81,],[120,]),'cte':([81,],[122,]),'funcs_coma':([87,162,],[126,167,]),'llamada_ex':([96,153,],[131,159,]),'condicion_marca':([97,],[134,]),'imprime_exp_p':([100,101,],[137,140,]),'ciclo_cond_prep':([135,],[155,]),'condicion_cuerpo':([160,],[163,]),'condicion_else_marca':([165,],[169,]),}
+_lr_goto_items = {'programa':([0,],[1,]),'pro_vars':([4,],[5,]),'empty':([4,5,18,22,26,27,51,57,62,66,67,68,69,70,71,75,76,77,78,85,87,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,164,],[6,10,23,30,34,37,65,80,23,80,80,94,80,80,80,108,116,120,80,131,135,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,175,]),'vars':([4,85,],[7,132,]),'pro_funcs':([5,],[9,]),'pro_funcs_list':([5,],[11,]),'funcs':([5,11,],[12,20,]),'funcs_nt':([5,11,],[13,13,]),'tipo':([5,11,39,58,133,],[15,15,61,84,161,]),'var_dim':([18,62,],[22,88,]),'cuerpo':([19,130,141,165,176,],[25,160,164,177,183,]),'vars_todo':([22,87,],[28,136,]),'vars_coma':([22,87,],[29,29,]),'cuerpo_estat':([26,],[33,]),'func_tipo':([27,],[36,]),'funcs_coma':([27,],[38,]),'estatuto':([33,64,],[43,90,]),'asigna':([33,64,],[44,44,]),'condicion':([33,64,],[45,45,]),'ciclo':([33,64,],[46,46,]),'llamada':([33,64,79,],[47,47,127,]),'imprime':([33,64,],[48,48,]),'lectura':([33,64,],[49,49,]),'retorno':([33,64,],[50,50,]),'list_estatuto':([51,],[64,]),'expresion':([57,66,67,68,69,70,71,78,140,144,147,159,162,],[73,91,92,96,97,98,101,123,163,101,170,171,173,]),'exp':([57,66,67,68,69,70,71,78,109,110,111,112,113,114,117,118,140,144,147,159,162,],[75,75,75,75,75,75,75,75,148,149,150,151,152,153,154,155,75,75,75,75,75,]),'termino':([57,66,67,68,69,70,71,78,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,],[76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,156,157,76,76,76,76,76,]),'factor':([57,66,67,68,69,70,71,78,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,],[77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,]),'factor_sr':([57,66,67,68,69,70,71,78,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,],[79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,]),'factor_rs':([57,66,67,68,69,70,71,78,109,110,111,112,113,114,117,118,121,122,140,144,147,159,162,],[81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,]),'llamada_expresion':([68,],[93,]),'llamada_ex':([68,],[95,]),'imprime_exp':([71,],[99,]),'imprime_item':([71,144,],[100,167,]),'lee_lista':([72,],[103,]),'lee_destino':([72,146,],[104,169,]),'expresion_exp':([75,],[107,]),'exp_termino':([76,],[115,]),'termino_factor':([77,],[119,]),'factor_cte':([79,],[124,]),'cte':([79,],[126,]),'func_vars':([85,],[130,]),'vars_final':([87,],[134,]),'condicion_cuerpo':([164,],[174,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,92 +27,95 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> programa","S'",1,None,None,None),
-  ('tipo -> ENTERO','tipo',1,'p_tipo','parser.py',115),
-  ('tipo -> FLOTANTE','tipo',1,'p_tipo','parser.py',116),
-  ('cte -> CTE_ENT','cte',1,'p_cte','parser.py',125),
-  ('cte -> CTE_FLOT','cte',1,'p_cte','parser.py',126),
-  ('retorno -> RETURN expresion PUNTO_Y_COMA','retorno',3,'p_retorno','parser.py',141),
-  ('retorno -> RETURN PUNTO_Y_COMA','retorno',2,'p_retorno','parser.py',142),
-  ('asigna -> ID OP_ASIG expresion PUNTO_Y_COMA','asigna',4,'p_asigna','parser.py',167),
-  ('estatuto -> asigna','estatuto',1,'p_estatuto','parser.py',195),
-  ('estatuto -> condicion','estatuto',1,'p_estatuto','parser.py',196),
-  ('estatuto -> ciclo','estatuto',1,'p_estatuto','parser.py',197),
-  ('estatuto -> llamada PUNTO_Y_COMA','estatuto',2,'p_estatuto','parser.py',198),
-  ('estatuto -> imprime','estatuto',1,'p_estatuto','parser.py',199),
-  ('estatuto -> retorno','estatuto',1,'p_estatuto','parser.py',200),
-  ('estatuto -> CORA_ABRE list_estatuto CORA_CIERRA','estatuto',3,'p_estatuto','parser.py',201),
-  ('list_estatuto -> empty','list_estatuto',1,'p_list_estatuto','parser.py',211),
-  ('list_estatuto -> estatuto list_estatuto','list_estatuto',2,'p_list_estatuto','parser.py',212),
-  ('cuerpo -> LLAVE_ABRE cuerpo_estat LLAVE_CIERRA','cuerpo',3,'p_cuerpo','parser.py',223),
-  ('cuerpo_estat -> empty','cuerpo_estat',1,'p_cuerpo_estat','parser.py',228),
-  ('cuerpo_estat -> estatuto cuerpo_estat','cuerpo_estat',2,'p_cuerpo_estat','parser.py',229),
-  ('expresion -> exp expresion_exp','expresion',2,'p_expresion','parser.py',240),
-  ('expresion_exp -> empty','expresion_exp',1,'p_expresion_exp','parser.py',261),
-  ('expresion_exp -> OP_MAYOR exp','expresion_exp',2,'p_expresion_exp','parser.py',262),
-  ('expresion_exp -> OP_MENOR exp','expresion_exp',2,'p_expresion_exp','parser.py',263),
-  ('expresion_exp -> OP_MAYORIGUAL exp','expresion_exp',2,'p_expresion_exp','parser.py',264),
-  ('expresion_exp -> OP_MENORIGUAL exp','expresion_exp',2,'p_expresion_exp','parser.py',265),
-  ('expresion_exp -> OP_DIF exp','expresion_exp',2,'p_expresion_exp','parser.py',266),
-  ('expresion_exp -> OP_IGUAL exp','expresion_exp',2,'p_expresion_exp','parser.py',267),
-  ('ciclo -> MIENTRAS ciclo_marca PAR_ABRE expresion ciclo_cond_prep PAR_CIERRA HAZ cuerpo PUNTO_Y_COMA','ciclo',9,'p_ciclo','parser.py',280),
-  ('ciclo_cond_prep -> <empty>','ciclo_cond_prep',0,'p_ciclo_cond_prep','parser.py',295),
-  ('ciclo_marca -> <empty>','ciclo_marca',0,'p_ciclo_marca','parser.py',305),
-  ('condicion -> SI PAR_ABRE expresion condicion_marca PAR_CIERRA cuerpo condicion_cuerpo PUNTO_Y_COMA','condicion',8,'p_condicion','parser.py',314),
-  ('condicion_marca -> <empty>','condicion_marca',0,'p_condicion_marca','parser.py',329),
-  ('condicion_cuerpo -> empty','condicion_cuerpo',1,'p_condicion_cuerpo','parser.py',340),
-  ('condicion_cuerpo -> SINO condicion_else_marca cuerpo','condicion_cuerpo',3,'p_condicion_cuerpo','parser.py',341),
-  ('condicion_else_marca -> <empty>','condicion_else_marca',0,'p_condicion_else_marca','parser.py',349),
-  ('imprime -> ESCRIBE PAR_ABRE imprime_exp PAR_CIERRA PUNTO_Y_COMA','imprime',5,'p_imprime','parser.py',360),
-  ('imprime_exp -> expresion imprime_exp_p','imprime_exp',2,'p_imprime_exp','parser.py',375),
-  ('imprime_exp -> LETRERO imprime_exp_p','imprime_exp',2,'p_imprime_exp','parser.py',376),
-  ('imprime_exp_p -> empty','imprime_exp_p',1,'p_imprime_exp_p','parser.py',388),
-  ('imprime_exp_p -> COMA imprime_exp','imprime_exp_p',2,'p_imprime_exp_p','parser.py',389),
-  ('llamada -> ID PAR_ABRE llamada_expresion PAR_CIERRA','llamada',4,'p_llamada','parser.py',400),
-  ('llamada_expresion -> empty','llamada_expresion',1,'p_llamada_expresion','parser.py',435),
-  ('llamada_expresion -> expresion llamada_ex','llamada_expresion',2,'p_llamada_expresion','parser.py',436),
-  ('llamada_ex -> empty','llamada_ex',1,'p_llamada_ex','parser.py',444),
-  ('llamada_ex -> COMA expresion llamada_ex','llamada_ex',3,'p_llamada_ex','parser.py',445),
-  ('factor -> PAR_ABRE expresion PAR_CIERRA','factor',3,'p_factor_group','parser.py',456),
-  ('factor -> factor_sr factor_cte','factor',2,'p_factor_signed','parser.py',462),
-  ('factor_sr -> empty','factor_sr',1,'p_factor_sr','parser.py',480),
-  ('factor_sr -> factor_rs','factor_sr',1,'p_factor_sr','parser.py',481),
-  ('factor_rs -> OP_SUMA','factor_rs',1,'p_factor_rs','parser.py',486),
-  ('factor_rs -> OP_RESTA','factor_rs',1,'p_factor_rs','parser.py',487),
-  ('factor_cte -> ID','factor_cte',1,'p_factor_cte','parser.py',492),
-  ('factor_cte -> cte','factor_cte',1,'p_factor_cte','parser.py',493),
-  ('factor_cte -> llamada','factor_cte',1,'p_factor_cte','parser.py',494),
-  ('vars -> VARS ID vars_todo','vars',3,'p_vars','parser.py',516),
-  ('vars_todo -> vars_coma DOS_PUNTOS tipo PUNTO_Y_COMA vars_final','vars_todo',5,'p_vars_todo','parser.py',523),
-  ('vars_coma -> empty','vars_coma',1,'p_vars_coma','parser.py',528),
-  ('vars_coma -> COMA ID vars_coma','vars_coma',3,'p_vars_coma','parser.py',529),
-  ('vars_final -> empty','vars_final',1,'p_vars_final','parser.py',537),
-  ('vars_final -> vars_todo','vars_final',1,'p_vars_final','parser.py',538),
-  ('func_header -> funcs_nt ID PAR_ABRE func_tipo PAR_CIERRA','func_header',5,'p_func_header','parser.py',546),
-  ('funcs -> func_header LLAVE_ABRE func_vars cuerpo LLAVE_CIERRA PUNTO_Y_COMA','funcs',6,'p_funcs','parser.py',571),
-  ('funcs_nt -> NULA','funcs_nt',1,'p_funcs_nt','parser.py',594),
-  ('funcs_nt -> tipo','funcs_nt',1,'p_funcs_nt','parser.py',595),
-  ('func_tipo -> empty','func_tipo',1,'p_func_tipo','parser.py',600),
-  ('func_tipo -> ID DOS_PUNTOS tipo funcs_coma','func_tipo',4,'p_func_tipo','parser.py',601),
-  ('funcs_coma -> empty','funcs_coma',1,'p_funcs_coma','parser.py',609),
-  ('funcs_coma -> COMA ID DOS_PUNTOS tipo funcs_coma','funcs_coma',5,'p_funcs_coma','parser.py',610),
-  ('func_vars -> empty','func_vars',1,'p_func_vars','parser.py',618),
-  ('func_vars -> vars','func_vars',1,'p_func_vars','parser.py',619),
-  ('exp -> termino exp_termino','exp',2,'p_exp','parser.py',631),
-  ('exp_termino -> empty','exp_termino',1,'p_exp_termino','parser.py',650),
-  ('exp_termino -> OP_SUMA exp','exp_termino',2,'p_exp_termino','parser.py',651),
-  ('exp_termino -> OP_RESTA exp','exp_termino',2,'p_exp_termino','parser.py',652),
-  ('termino -> factor termino_factor','termino',2,'p_termino','parser.py',665),
-  ('termino_factor -> empty','termino_factor',1,'p_termino_factor','parser.py',684),
-  ('termino_factor -> OP_MULT termino','termino_factor',2,'p_termino_factor','parser.py',685),
-  ('termino_factor -> OP_DIV termino','termino_factor',2,'p_termino_factor','parser.py',686),
-  ('programa -> PROGRAMA ID PUNTO_Y_COMA program_entry pro_vars pro_funcs INICIO program_main cuerpo FIN','programa',10,'p_programa','parser.py',700),
-  ('program_entry -> <empty>','program_entry',0,'p_program_entry','parser.py',716),
-  ('program_main -> <empty>','program_main',0,'p_program_main','parser.py',724),
-  ('pro_vars -> empty','pro_vars',1,'p_pro_vars','parser.py',733),
-  ('pro_vars -> vars','pro_vars',1,'p_pro_vars','parser.py',734),
-  ('pro_funcs -> empty','pro_funcs',1,'p_pro_funcs','parser.py',743),
-  ('pro_funcs -> pro_funcs_list','pro_funcs',1,'p_pro_funcs','parser.py',744),
-  ('pro_funcs_list -> funcs','pro_funcs_list',1,'p_pro_funcs_list','parser.py',749),
-  ('pro_funcs_list -> pro_funcs_list funcs','pro_funcs_list',2,'p_pro_funcs_list','parser.py',750),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',761),
+  ('tipo -> ENTERO','tipo',1,'p_tipo','parser.py',84),
+  ('tipo -> FLOTANTE','tipo',1,'p_tipo','parser.py',85),
+  ('cte -> CTE_ENT','cte',1,'p_cte','parser.py',94),
+  ('cte -> CTE_FLOT','cte',1,'p_cte','parser.py',95),
+  ('retorno -> RETURN expresion PUNTO_Y_COMA','retorno',3,'p_retorno','parser.py',103),
+  ('retorno -> RETURN PUNTO_Y_COMA','retorno',2,'p_retorno','parser.py',104),
+  ('asigna -> ID OP_ASIG expresion PUNTO_Y_COMA','asigna',4,'p_asigna','parser.py',111),
+  ('asigna -> ID CORA_ABRE expresion CORA_CIERRA OP_ASIG expresion PUNTO_Y_COMA','asigna',7,'p_asigna_arreglo','parser.py',116),
+  ('estatuto -> asigna','estatuto',1,'p_estatuto','parser.py',124),
+  ('estatuto -> condicion','estatuto',1,'p_estatuto','parser.py',125),
+  ('estatuto -> ciclo','estatuto',1,'p_estatuto','parser.py',126),
+  ('estatuto -> llamada PUNTO_Y_COMA','estatuto',2,'p_estatuto','parser.py',127),
+  ('estatuto -> imprime','estatuto',1,'p_estatuto','parser.py',128),
+  ('estatuto -> lectura','estatuto',1,'p_estatuto','parser.py',129),
+  ('estatuto -> retorno','estatuto',1,'p_estatuto','parser.py',130),
+  ('estatuto -> CORA_ABRE list_estatuto CORA_CIERRA','estatuto',3,'p_estatuto','parser.py',131),
+  ('list_estatuto -> empty','list_estatuto',1,'p_list_estatuto','parser.py',143),
+  ('list_estatuto -> list_estatuto estatuto','list_estatuto',2,'p_list_estatuto','parser.py',144),
+  ('cuerpo -> LLAVE_ABRE cuerpo_estat LLAVE_CIERRA','cuerpo',3,'p_cuerpo','parser.py',156),
+  ('cuerpo_estat -> empty','cuerpo_estat',1,'p_cuerpo_estat','parser.py',161),
+  ('cuerpo_estat -> cuerpo_estat estatuto','cuerpo_estat',2,'p_cuerpo_estat','parser.py',162),
+  ('expresion -> exp expresion_exp','expresion',2,'p_expresion','parser.py',174),
+  ('expresion_exp -> empty','expresion_exp',1,'p_expresion_exp','parser.py',184),
+  ('expresion_exp -> OP_MAYOR exp','expresion_exp',2,'p_expresion_exp','parser.py',185),
+  ('expresion_exp -> OP_MENOR exp','expresion_exp',2,'p_expresion_exp','parser.py',186),
+  ('expresion_exp -> OP_MAYORIGUAL exp','expresion_exp',2,'p_expresion_exp','parser.py',187),
+  ('expresion_exp -> OP_MENORIGUAL exp','expresion_exp',2,'p_expresion_exp','parser.py',188),
+  ('expresion_exp -> OP_DIF exp','expresion_exp',2,'p_expresion_exp','parser.py',189),
+  ('expresion_exp -> OP_IGUAL exp','expresion_exp',2,'p_expresion_exp','parser.py',190),
+  ('ciclo -> MIENTRAS PAR_ABRE expresion PAR_CIERRA HAZ cuerpo PUNTO_Y_COMA','ciclo',7,'p_ciclo','parser.py',203),
+  ('condicion -> SI PAR_ABRE expresion PAR_CIERRA cuerpo condicion_cuerpo PUNTO_Y_COMA','condicion',7,'p_condicion','parser.py',211),
+  ('condicion_cuerpo -> empty','condicion_cuerpo',1,'p_condicion_cuerpo','parser.py',216),
+  ('condicion_cuerpo -> SINO cuerpo','condicion_cuerpo',2,'p_condicion_cuerpo','parser.py',217),
+  ('imprime -> ESCRIBE PAR_ABRE imprime_exp PAR_CIERRA PUNTO_Y_COMA','imprime',5,'p_imprime','parser.py',228),
+  ('imprime_exp -> imprime_item','imprime_exp',1,'p_imprime_exp','parser.py',233),
+  ('imprime_exp -> imprime_exp COMA imprime_item','imprime_exp',3,'p_imprime_exp','parser.py',234),
+  ('imprime_item -> expresion','imprime_item',1,'p_imprime_item','parser.py',243),
+  ('imprime_item -> LETRERO','imprime_item',1,'p_imprime_item','parser.py',244),
+  ('lectura -> LEE PAR_ABRE lee_lista PAR_CIERRA PUNTO_Y_COMA','lectura',5,'p_lectura','parser.py',255),
+  ('lee_lista -> lee_destino','lee_lista',1,'p_lee_lista','parser.py',260),
+  ('lee_lista -> lee_lista COMA lee_destino','lee_lista',3,'p_lee_lista','parser.py',261),
+  ('lee_destino -> ID','lee_destino',1,'p_lee_destino','parser.py',270),
+  ('lee_destino -> ID CORA_ABRE expresion CORA_CIERRA','lee_destino',4,'p_lee_destino_arreglo','parser.py',275),
+  ('llamada -> ID PAR_ABRE llamada_expresion PAR_CIERRA','llamada',4,'p_llamada','parser.py',283),
+  ('llamada_expresion -> empty','llamada_expresion',1,'p_llamada_expresion','parser.py',288),
+  ('llamada_expresion -> llamada_ex','llamada_expresion',1,'p_llamada_expresion','parser.py',289),
+  ('llamada_ex -> expresion','llamada_ex',1,'p_llamada_ex','parser.py',294),
+  ('llamada_ex -> llamada_ex COMA expresion','llamada_ex',3,'p_llamada_ex','parser.py',295),
+  ('factor -> PAR_ABRE expresion PAR_CIERRA','factor',3,'p_factor_group','parser.py',307),
+  ('factor -> factor_sr factor_cte','factor',2,'p_factor_signed','parser.py',313),
+  ('factor_sr -> empty','factor_sr',1,'p_factor_sr','parser.py',318),
+  ('factor_sr -> factor_rs','factor_sr',1,'p_factor_sr','parser.py',319),
+  ('factor_rs -> OP_SUMA','factor_rs',1,'p_factor_rs','parser.py',324),
+  ('factor_rs -> OP_RESTA','factor_rs',1,'p_factor_rs','parser.py',325),
+  ('factor_cte -> ID','factor_cte',1,'p_factor_cte','parser.py',330),
+  ('factor_cte -> cte','factor_cte',1,'p_factor_cte','parser.py',331),
+  ('factor_cte -> llamada','factor_cte',1,'p_factor_cte','parser.py',332),
+  ('factor_cte -> ID CORA_ABRE expresion CORA_CIERRA','factor_cte',4,'p_factor_arreglo','parser.py',341),
+  ('vars -> VARS ID var_dim vars_todo','vars',4,'p_vars','parser.py',349),
+  ('var_dim -> empty','var_dim',1,'p_var_dim','parser.py',358),
+  ('var_dim -> CORA_ABRE CTE_ENT CORA_CIERRA','var_dim',3,'p_var_dim','parser.py',359),
+  ('vars_todo -> vars_coma DOS_PUNTOS tipo PUNTO_Y_COMA vars_final','vars_todo',5,'p_vars_todo','parser.py',364),
+  ('vars_coma -> empty','vars_coma',1,'p_vars_coma','parser.py',369),
+  ('vars_coma -> vars_coma COMA ID var_dim','vars_coma',4,'p_vars_coma','parser.py',370),
+  ('vars_final -> empty','vars_final',1,'p_vars_final','parser.py',379),
+  ('vars_final -> vars_todo','vars_final',1,'p_vars_final','parser.py',380),
+  ('funcs -> funcs_nt ID PAR_ABRE func_tipo PAR_CIERRA LLAVE_ABRE func_vars cuerpo LLAVE_CIERRA PUNTO_Y_COMA','funcs',10,'p_funcs','parser.py',388),
+  ('funcs_nt -> NULA','funcs_nt',1,'p_funcs_nt','parser.py',394),
+  ('funcs_nt -> tipo','funcs_nt',1,'p_funcs_nt','parser.py',395),
+  ('func_tipo -> empty','func_tipo',1,'p_func_tipo','parser.py',400),
+  ('func_tipo -> funcs_coma','func_tipo',1,'p_func_tipo','parser.py',401),
+  ('funcs_coma -> ID DOS_PUNTOS tipo','funcs_coma',3,'p_funcs_coma','parser.py',406),
+  ('funcs_coma -> funcs_coma COMA ID DOS_PUNTOS tipo','funcs_coma',5,'p_funcs_coma','parser.py',407),
+  ('func_vars -> empty','func_vars',1,'p_func_vars','parser.py',416),
+  ('func_vars -> vars','func_vars',1,'p_func_vars','parser.py',417),
+  ('exp -> termino exp_termino','exp',2,'p_exp','parser.py',425),
+  ('exp_termino -> empty','exp_termino',1,'p_exp_termino','parser.py',434),
+  ('exp_termino -> OP_SUMA exp','exp_termino',2,'p_exp_termino','parser.py',435),
+  ('exp_termino -> OP_RESTA exp','exp_termino',2,'p_exp_termino','parser.py',436),
+  ('termino -> factor termino_factor','termino',2,'p_termino','parser.py',449),
+  ('termino_factor -> empty','termino_factor',1,'p_termino_factor','parser.py',458),
+  ('termino_factor -> OP_MULT termino','termino_factor',2,'p_termino_factor','parser.py',459),
+  ('termino_factor -> OP_DIV termino','termino_factor',2,'p_termino_factor','parser.py',460),
+  ('programa -> PROGRAMA ID PUNTO_Y_COMA pro_vars pro_funcs INICIO cuerpo FIN','programa',8,'p_programa','parser.py',474),
+  ('pro_vars -> empty','pro_vars',1,'p_pro_vars','parser.py',479),
+  ('pro_vars -> vars','pro_vars',1,'p_pro_vars','parser.py',480),
+  ('pro_funcs -> empty','pro_funcs',1,'p_pro_funcs','parser.py',485),
+  ('pro_funcs -> pro_funcs_list','pro_funcs',1,'p_pro_funcs','parser.py',486),
+  ('pro_funcs_list -> funcs','pro_funcs_list',1,'p_pro_funcs_list','parser.py',491),
+  ('pro_funcs_list -> pro_funcs_list funcs','pro_funcs_list',2,'p_pro_funcs_list','parser.py',492),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',504),
 ]
@@ -0,0 +1,152 @@
+# Cliente del servidor Patito (patito_server.py): mismos argumentos que
+# main.py, pero la compilación y la ejecución ocurren en un trabajador ya
+# caliente y la salida del programa llega conforme se produce.
+#   python patito_client.py --test tests/fibonacci.txt --max-steps 100000 --timeout 5
+
+# Solo depende de la biblioteca estándar ligera: el cliente debe arrancar rápido
+import argparse
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, Iterator
+
+DEFAULT_SOCKET = os.path.join(os.environ.get("TMPDIR", "/tmp"), "patito.sock")
+
+# Opciones de línea de comandos para cada campo de sandbox.SandboxLimits
+LIMIT_OPTIONS = (
+    ("--max-steps", "max_steps", int, "Maximo de cuadruplos a ejecutar"),
+    ("--max-depth", "max_depth", int, "Maximo de llamadas anidadas"),
+    ("--max-slots", "max_slots", int, "Maximo de casillas de memoria en marcos de llamada y arreglos"),
+    ("--max-output-bytes", "max_output_bytes", int, "Maximo de bytes que puede escribir el programa"),
+    ("--max-source-bytes", "max_source_bytes", int, "Maximo de bytes del codigo fuente"),
+    ("--max-compile-ms", "max_compile_ms", float, "Maximo de milisegundos de compilacion"),
+)
+
+
+def add_limit_arguments(argp: argparse.ArgumentParser) -> None:
+    for flag, dest, kind, text in LIMIT_OPTIONS:
+        argp.add_argument(flag, dest=dest, type=kind, default=None, help=text)
+
+
+def limits_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {dest: getattr(args, dest) for _flag, dest, _kind, _text in LIMIT_OPTIONS if getattr(args, dest) is not None}
+
+
+def request(message: Dict[str, Any], path: str = DEFAULT_SOCKET) -> Iterator[Dict[str, Any]]:
+    # Manda una petición al servidor y va regresando los eventos conforme llegan
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                yield json.loads(line)
+
+
+def run_file(
+    src_path: str,
+    *,
+    jit: bool = True,
+    check_bounds: bool = True,
+    input_path: str | None = None,
+    scanner: str = "ply",
+    frontend: str = "ply",
+    stats: bool = False,
+    socket_path: str = DEFAULT_SOCKET,
+    sandbox: bool = False,
+    limits: Dict[str, Any] | None = None,
+    timeout: float | None = None,
+    compile_only: bool = False,
+) -> int:
+    print(f"\n=== COMPILANDO Y EJECUTANDO {src_path} ===")
+    try:
+        with open(src_path, encoding="utf-8") as f:
+            code = f.read()
+        data = None
+        if input_path is not None:
+            with open(input_path, encoding="utf-8") as f:
+                data = f.read()
+    except OSError as e:
+        print(f"No se pudo leer el archivo: {e}", file=sys.stderr)
+        return 1
+
+    message = {
+        "op": "compile" if compile_only else "run",
+        "source": code,
+        "jit": jit,
+        "check_bounds": check_bounds,
+        "scanner": scanner,
+        "parser": frontend,
+        "input": data,
+        "sandbox": sandbox,
+        "limits": limits or {},
+        "timeout": timeout,
+        "stats": stats,
+    }
+    try:
+        for event in request(message, socket_path):
+            kind = event["event"]
+            if kind == "compiled":
+                origin = "en cache" if event["cached"] else f"{event['ms']:.1f} ms"
+                print(f"Compilado: {event['quads']} cuadruplos ({origin})")
+                if not compile_only:
+                    print("-" * 42)
+                    print("Maquina Virtual")
+            elif kind == "output":
+                sys.stdout.write(event["data"])
+                sys.stdout.flush()
+            elif kind == "error":
+                print("ERROR")
+                print(f"[{event['kind']}] {event['message']}", file=sys.stderr)
+                return 1
+            elif kind == "done":
+                if stats and "telemetry" in event:
+                    from main import print_vm_stats
+                    print_vm_stats(event["telemetry"])
+                elif event.get("steps") is not None:
+                    print(f"cuadruplos ejecutados: {event['steps']}")
+                return 0
+    except OSError as e:
+        print(f"No se pudo conectar con el servidor en {socket_path}: {e}", file=sys.stderr)
+        return 1
+    print("El servidor cerro la conexion sin terminar", file=sys.stderr)
+    return 1
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Cliente del servidor Patito")
+    argp.add_argument("--test", default="tests/fibonacci_recursivo.txt", help="Ruta al archivo Patito a compilar/ejecutar")
+    argp.add_argument("--no-jit", action="store_true", help="Desactiva el JIT de trazas para ciclos calientes de la VM")
+    argp.add_argument(
+        "--no-bounds-check",
+        action="store_true",
+        help="No genera la verificacion de limites (VER) en accesos a arreglos",
+    )
+    argp.add_argument("--input", default=None, help="Archivo con los datos que lee 'lee'")
+    argp.add_argument("--scanner", choices=("ply", "regex"), default="ply", help="Analizador lexico")
+    argp.add_argument("--parser", choices=("ply", "rd"), default="ply", help="Analizador sintactico")
+    argp.add_argument("--stats", action="store_true", help="Muestra el uso de memoria de la VM")
+    argp.add_argument("--socket", default=DEFAULT_SOCKET, help="Ruta del socket Unix del servidor")
+    argp.add_argument("--sandbox", action="store_true", help="Ejecuta con los limites de SandboxLimits.strict()")
+    add_limit_arguments(argp)
+    argp.add_argument("--timeout", type=float, default=None, help="Maximo de segundos de la peticion")
+    argp.add_argument("--compile-only", action="store_true", help="Solo compila (queda en la cache del servidor)")
+    args = argp.parse_args(argv)
+    sys.exit(run_file(
+        args.test,
+        jit=not args.no_jit,
+        check_bounds=not args.no_bounds_check,
+        input_path=args.input,
+        scanner=args.scanner,
+        frontend=args.parser,
+        stats=args.stats,
+        socket_path=args.socket,
+        sandbox=args.sandbox,
+        limits=limits_from_args(args),
+        timeout=args.timeout,
+        compile_only=args.compile_only,
+    ))
+
+
+if __name__ == "__main__":
+    main()
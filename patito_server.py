@@ -0,0 +1,484 @@
+# Servidor local de compilación y ejecución: evita pagar en cada corrida el
+# arranque del intérprete, la carga de las tablas de PLY y la compilación.
+#   python patito_server.py --socket /tmp/patito.sock --workers 2
+#   python patito_client.py --test tests/fibonacci.txt
+#
+# Protocolo (ver patito_client.request): una conexión por petición; el cliente
+# manda una línea JSON y el servidor contesta con líneas JSON hasta un evento
+# "done" o "error":
+#   {"op": "run", "source": "...", "jit": true, "check_bounds": true,
+#    "scanner": "ply", "parser": "ply", "input": "5 3\n", "sandbox": false,
+#    "limits": {"max_steps": 100000}, "timeout": 5.0, "stats": false, "globals": false}
+#   {"event": "compiled", "cached": false, "quads": 120, "ms": 3.2}
+#   {"event": "output", "data": "1\n2\n"}                       (varias veces)
+#   {"event": "done", "steps": 512, "telemetry": {...}}         (o "error")
+# "op" también puede ser "compile" (sin ejecutar), "ping" o "shutdown".
+#
+# Los trabajadores son procesos que ya tienen el compilador cargado. Cada
+# programa compilado se publica como imagen en memoria compartida
+# (program_image); el servidor guarda los nombres por hash del código y
+# cualquier trabajador la adjunta sin recompilar. Los límites de compilación
+# de cada petición se revisan también cuando el programa sale del caché.
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Set
+
+from patito_client import DEFAULT_SOCKET, add_limit_arguments, limits_from_args
+
+if TYPE_CHECKING:
+    from sandbox import SandboxLimits
+
+DEFAULT_WORKERS = 2
+DEFAULT_CACHE = 64
+# Margen sobre max_compile_ms antes de dar por perdido a un trabajador que compila
+COMPILE_GRACE_S = 1.0
+
+
+#  Trabajador
+
+class _PipeWriter(io.TextIOBase):
+    # stdout del trabajador: junta lo impreso y lo manda por el pipe cada
+    # 'limit' caracteres o 'interval' segundos, para no mandar un mensaje por línea
+    def __init__(self, conn, limit: int = 8192, interval: float = 0.05) -> None:
+        self.conn = conn
+        self.limit = limit
+        self.interval = interval
+        self.parts: List[str] = []
+        self.size = 0
+        self.last = time.perf_counter()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.limit or time.perf_counter() - self.last >= self.interval:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self.parts:
+            self.conn.send(("output", "".join(self.parts)))
+            self.parts = []
+            self.size = 0
+        self.last = time.perf_counter()
+
+
+def _compile(job: Dict[str, Any], limits):
+    import parser as patito_parser
+    import sandbox
+
+    lexer = None
+    if job.get("scanner") == "regex":
+        from fast_scanner import FastLexer
+        lexer = FastLexer()
+    options = dict(check_bounds=job.get("check_bounds", True), lexer=lexer, frontend=job.get("parser", "ply"))
+    if limits is not None:
+        return sandbox.compile_program(job["source"], limits, **options)
+    return patito_parser.compile_program(job["source"], **options)
+
+
+def _error_kind(e: Exception) -> str:
+    import sandbox
+
+    kinds = (
+        (sandbox.SourceTooLarge, "source"),
+        (sandbox.CompileTimeExceeded, "compile_time"),
+        (sandbox.StepLimitExceeded, "steps"),
+        (sandbox.DepthLimitExceeded, "depth"),
+        (sandbox.MemoryLimitExceeded, "memory"),
+        (sandbox.OutputLimitExceeded, "output"),
+    )
+    for cls, kind in kinds:
+        if isinstance(e, cls):
+            return kind
+    return "internal"
+
+
+def _handle_job(conn, job: Dict[str, Any]) -> None:
+    import program_image
+    from tabla_symbolos import SemanticError
+    from tracing_jit import DEFAULT_THRESHOLD
+    from sandbox import CompileLimitExceeded, LimitExceeded, SandboxLimits
+    from VM_Patito import PatitoRuntimeError, VirtualMachine
+
+    # Imágenes que el servidor ya sacó de su caché
+    for name in list(program_image.attached_names()):
+        if name not in job["live"]:
+            program_image.detach(name)
+
+    name = job.get("image")
+    limits = SandboxLimits(**job["limits"]) if job.get("limits") else None
+    try:
+        program = None
+        if name is not None:
+            try:
+                program = program_image.attach(name)
+            except FileNotFoundError:
+                # La imagen ya no existe (el servidor la fija mientras dura la
+                # petición, pero pudo borrarse por fuera): se vuelve a compilar
+                program = None
+        if program is None:
+            # 'ms' es solo la compilación: el servidor lo guarda para revisar
+            # max_compile_ms cuando otra petición encuentre el programa en caché
+            start = time.perf_counter()
+            compiled = _compile(job, limits)
+            ms = round((time.perf_counter() - start) * 1e3, 3)
+            image = program_image.publish(compiled)
+            name = image.name
+            program = program_image.attach(name)
+            image.close()
+            del compiled
+            conn.send(("compiled", {"image": name, "cached": False, "quads": len(program.quads), "ms": ms}))
+        else:
+            conn.send(("compiled", {"image": name, "cached": True, "quads": len(program.quads), "ms": 0.0}))
+        if job["op"] == "compile":
+            conn.send(("done", {}))
+            return
+
+        data = job.get("input")
+        vm = VirtualMachine.from_program(
+            program,
+            jit_threshold=DEFAULT_THRESHOLD if job.get("jit", True) else None,
+            input_stream=io.BytesIO(data.encode("utf-8")) if data is not None else io.BytesIO(),
+            limits=limits,
+        )
+        writer = sys.stdout = _PipeWriter(conn)
+        try:
+            result = vm.run()
+        finally:
+            sys.stdout = sys.__stdout__
+            writer.flush()
+        done: Dict[str, Any] = {"steps": vm.steps if limits is not None else None}
+        if job.get("stats"):
+            done["telemetry"] = result["telemetry"]
+        if job.get("globals"):
+            done["global"] = {addr: list(v) if hasattr(v, "typecode") else v for addr, v in result["global"].items()}
+        conn.send(("done", done))
+    except (SemanticError, SyntaxError) as e:
+        conn.send(("error", {"kind": "compile", "message": str(e)}))
+    except (CompileLimitExceeded, LimitExceeded) as e:
+        conn.send(("error", {"kind": _error_kind(e), "message": str(e)}))
+    except PatitoRuntimeError as e:
+        conn.send(("error", {"kind": "runtime", "message": str(e)}))
+    except Exception as e:
+        conn.send(("error", {"kind": "internal", "message": f"{type(e).__name__}: {e}"}))
+
+
+def _worker_main(conn) -> None:
+    # Se carga todo el compilador antes de la primera petición
+    import parser as patito_parser
+    import fast_scanner  # noqa: F401
+    import VM_Patito  # noqa: F401
+
+    patito_parser._ply_parser()
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        _handle_job(conn, job)
+    # Cerrar la memoria antes de que el intérprete destruya los programas en desorden
+    import program_image
+    for name in program_image.attached_names():
+        program_image.detach(name)
+
+
+class Worker:
+    def __init__(self, ctx) -> None:
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        # Espera a que termine de cargar; así la primera petición ya lo encuentra caliente
+        self.conn.recv()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+#  Servidor
+
+def cache_key(request: Dict[str, Any]) -> str:
+    # Mismo código con las mismas opciones de compilación -> mismo programa
+    h = hashlib.sha256(request["source"].encode("utf-8"))
+    h.update(repr((request.get("check_bounds", True), request.get("scanner", "ply"),
+                   request.get("parser", "ply"))).encode())
+    return h.hexdigest()
+
+
+def _cap(requested, limit):
+    # El límite efectivo: el menor de los dos que estén definidos
+    if requested is None:
+        return limit
+    return requested if limit is None else min(requested, limit)
+
+
+class PatitoServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str,
+        workers: int = DEFAULT_WORKERS,
+        cache_size: int = DEFAULT_CACHE,
+        limits: "SandboxLimits | None" = None,
+        timeout: float | None = None,
+    ) -> None:
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, RequestHandler)
+        # 'spawn': hacer fork de un proceso con hilos no es seguro
+        self.ctx = multiprocessing.get_context("spawn")
+        self.workers: List[Worker] = [Worker(self.ctx) for _ in range(workers)]
+        self.idle: "queue.Queue[Worker]" = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+        # Hash del código -> nombre de la imagen (la más vieja se descarta primero)
+        self.images: "OrderedDict[str, str]" = OrderedDict()
+        self.cache_size = cache_size
+        # Imágenes que usa alguna petición en curso (nombre -> cuántas). Si una
+        # sale de la caché mientras tanto queda en 'retired' y se borra cuando
+        # termina la última, así ningún trabajador la busca ya borrada.
+        self.pins: Dict[str, int] = {}
+        self.retired: Set[str] = set()
+        # Nombre de la imagen -> ms que tardó en compilarse (ver execute)
+        self.compile_ms: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        # Límites máximos; una petición puede pedir menos, no más
+        from sandbox import SandboxLimits
+        self.limits = limits or SandboxLimits()
+        self.timeout = timeout
+
+    def _remember(self, key: str, name: str, ms: float) -> None:
+        with self.lock:
+            self.compile_ms[name] = ms
+            # Dos peticiones con el mismo código pueden compilarlo a la vez: la
+            # imagen anterior de esa clave también sale de la caché
+            old = self.images.get(key)
+            if old is not None and old != name:
+                self._retire(old)
+            self.images[key] = name
+            self.images.move_to_end(key)
+            while len(self.images) > self.cache_size:
+                _key, old = self.images.popitem(last=False)
+                self._retire(old)
+
+    def _retire(self, name: str) -> None:
+        # Con el lock tomado: borra la imagen, o lo deja para cuando se desfije
+        import program_image
+
+        self.compile_ms.pop(name, None)
+        if self.pins.get(name):
+            self.retired.add(name)
+        else:
+            program_image.unlink(name)
+
+    def _unpin(self, name: str) -> None:
+        import program_image
+
+        with self.lock:
+            count = self.pins.pop(name) - 1
+            if count:
+                self.pins[name] = count
+            elif name in self.retired:
+                self.retired.discard(name)
+                program_image.unlink(name)
+
+    def _limits_for(self, request: Dict[str, Any]) -> Dict[str, Any] | None:
+        # Límites del servidor, apretados con los de la petición; None si no hay ninguno
+        from sandbox import SandboxLimits
+
+        requested = dict(request.get("limits") or {})
+        if request.get("sandbox"):
+            requested = {**SandboxLimits.strict().as_dict(), **{k: v for k, v in requested.items() if v is not None}}
+        limits = self.limits.tighten(**requested)
+        return limits.as_dict() if limits != SandboxLimits() else None
+
+    def _replace(self, worker: Worker) -> Worker:
+        worker.kill()
+        fresh = Worker(self.ctx)
+        with self.lock:
+            self.workers[self.workers.index(worker)] = fresh
+        return fresh
+
+    def execute(self, request: Dict[str, Any], emit: Callable[[Dict[str, Any]], None]) -> None:
+        from sandbox import CompileLimitExceeded, SandboxLimits, check_compile_ms, check_source
+
+        key = cache_key(request)
+        limits = self._limits_for(request)
+        # La llave no incluye los límites, así que el caché no debe saltárselos:
+        # el tamaño del código se revisa siempre y un programa en caché se
+        # rechaza si su compilación tardó más que el max_compile_ms de esta
+        # petición, igual que si se compilara de nuevo
+        checks = SandboxLimits(**limits) if limits is not None else None
+        try:
+            if checks is not None:
+                check_source(request["source"], checks)
+            with self.lock:
+                name = self.images.get(key)
+                if name is not None:
+                    if checks is not None:
+                        check_compile_ms(self.compile_ms.get(name, 0.0), checks)
+                    self.images.move_to_end(key)
+                    # Fijada hasta que termine la petición (ver _unpin)
+                    self.pins[name] = self.pins.get(name, 0) + 1
+                live = set(self.images.values())
+        except CompileLimitExceeded as e:
+            emit({"event": "error", "kind": _error_kind(e), "message": str(e)})
+            return
+        timeout = _cap(request.get("timeout"), self.timeout)
+        job = {
+            "op": request.get("op", "run"),
+            "source": request["source"],
+            "image": name,
+            "live": live,
+            "check_bounds": request.get("check_bounds", True),
+            "scanner": request.get("scanner", "ply"),
+            "parser": request.get("parser", "ply"),
+            "jit": request.get("jit", True),
+            "input": request.get("input"),
+            "limits": limits,
+            "stats": request.get("stats", False),
+            "globals": request.get("globals", False),
+        }
+
+        worker = self.idle.get()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        # Respaldo de max_compile_ms aunque no haya timeout: el compilador lo
+        # revisa por bloques de tokens y por fase, pero si el trabajador no
+        # avisa que terminó de compilar a tiempo se reemplaza igual
+        max_compile_ms = limits.get("max_compile_ms") if limits is not None else None
+        compile_deadline = None
+        if max_compile_ms is not None:
+            compile_deadline = time.monotonic() + max_compile_ms / 1e3 + COMPILE_GRACE_S
+        try:
+            worker.conn.send(job)
+            while True:
+                waits = [d for d in (deadline, compile_deadline) if d is not None]
+                until = min(waits) if waits else None
+                remaining = None if until is None else max(0.0, until - time.monotonic())
+                if not worker.conn.poll(remaining):
+                    # Se acabó el tiempo: el trabajador se reemplaza por uno nuevo
+                    worker = self._replace(worker)
+                    if until == compile_deadline:
+                        emit({"event": "error", "kind": "compile_time",
+                              "message": f"La compilacion tardo mas de {max_compile_ms:g} ms"})
+                    else:
+                        emit({"event": "error", "kind": "timeout",
+                              "message": f"Se alcanzo el limite de {timeout} s de ejecucion"})
+                    return
+                kind, payload = worker.conn.recv()
+                if kind == "compiled":
+                    compile_deadline = None
+                    if not payload["cached"]:
+                        self._remember(key, payload["image"], payload["ms"])
+                    emit({"event": "compiled", **payload})
+                elif kind == "output":
+                    emit({"event": "output", "data": payload})
+                else:
+                    emit({"event": kind, **payload})
+                    return
+        except (EOFError, OSError) as e:
+            # El trabajador murió o el cliente cerró la conexión: no se puede seguir con él
+            worker = self._replace(worker)
+            if isinstance(e, EOFError):
+                emit({"event": "error", "kind": "internal", "message": "El trabajador termino inesperadamente"})
+        finally:
+            self.idle.put(worker)
+            if name is not None:
+                self._unpin(name)
+
+    def server_close(self) -> None:
+        import program_image
+
+        super().server_close()
+        for worker in self.workers:
+            worker.stop()
+        with self.lock:
+            for name in [*self.images.values(), *self.retired]:
+                program_image.unlink(name)
+            self.images.clear()
+            self.retired.clear()
+            self.compile_ms.clear()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def emit(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            op = request.get("op", "run")
+            if op not in ("run", "compile", "ping", "shutdown") or (op in ("run", "compile") and "source" not in request):
+                raise ValueError(f"peticion invalida: {op!r}")
+        except ValueError as e:
+            self.emit({"event": "error", "kind": "request", "message": str(e)})
+            return
+        if op == "ping":
+            self.emit({"event": "pong", "workers": len(self.server.workers), "cached": len(self.server.images)})
+        elif op == "shutdown":
+            self.emit({"event": "done"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self.server.execute(request, self.emit)
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Servidor local de compilacion y ejecucion Patito")
+    argp.add_argument("--socket", default=DEFAULT_SOCKET, help="Ruta del socket Unix")
+    argp.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Procesos trabajadores")
+    argp.add_argument("--cache", type=int, default=DEFAULT_CACHE, help="Programas compilados que se conservan")
+    argp.add_argument("--sandbox", action="store_true", help="Aplica SandboxLimits.strict() a todas las peticiones")
+    add_limit_arguments(argp)
+    argp.add_argument("--timeout", type=float, default=None, help="Maximo de segundos por peticion")
+    args = argp.parse_args(argv)
+
+    from sandbox import SandboxLimits
+    limits = SandboxLimits.strict() if args.sandbox else SandboxLimits()
+    limits = limits.tighten(**limits_from_args(args))
+    server = PatitoServer(args.socket, args.workers, args.cache, limits, args.timeout)
+    print(f"Servidor Patito en {args.socket} ({args.workers} trabajadores)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,638 @@
+# Optimización guiada por perfil (PGO) para programas Patito.
+#   recorder = ProfileRecorder()
+#   VirtualMachine.from_program(program, hooks=[recorder]).run()
+#   recorder.save("programa.pgo")
+#   ...
+#   program = optimize(program, load_profile("programa.pgo", program))
+#   VirtualMachine.from_program(program).run()
+# El perfil (JSON) tiene, por ip del programa sin optimizar: las veces que se
+# ejecutó cada cuádruplo, hacia dónde se fue cada GOTOF, entradas y vueltas de
+# cada ciclo y las llamadas de cada GOSUB; lleva la huella de los cuádruplos
+# para no aplicarse a otro programa (o a otra compilación del mismo).
+# optimize() reescribe solo lo caliente (min_count ejecuciones o más):
+#   - copia en línea las funciones pequeñas sin llamadas ni arreglos locales,
+#     en el marco de quien llama
+#   - une 'op a b t; = t x' en 'op a b x' si t no se usa en otro lado
+#   - une la comparación con su GOTOF en una superinstrucción ('GOTOF<', a, b, L)
+#   - en un si/sino cuyo camino común es el 'si', invierte la condición e
+#     intercambia los bloques: el camino común sigue derecho al final del
+#     si/sino y el GOTO que brinca el otro bloque queda en el camino raro
+#   - rota los ciclos con varias vueltas por entrada: la condición queda al
+#     final y salta hacia atrás, sin el GOTO de regreso en cada vuelta
+# En esta VM un salto tomado cuesta lo mismo que uno que sigue de largo; lo que
+# se paga es cada cuádruplo despachado, así que 'el camino común sigue derecho'
+# quiere decir que ejecuta menos cuádruplos.
+
+import dataclasses
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Set
+
+from compiled_program import CompiledProgram, link_calls
+from intermediate import FUSED_BRANCHES, OPCODE_OF, QuadStore
+from line_table import LineTable
+from memory import SEG_LOCAL, SEG_TEMP
+from quad_coverage import Coverage
+
+VERSION = 1
+# Ejecuciones para considerar caliente un cuádruplo
+HOT_COUNT = 100
+# Cuádruplos máximos de una función que se copia en línea
+MAX_INLINE_QUADS = 16
+
+BINARY = {'+', '-', '*', '/', '>', '<', '>=', '<=', '!=', '=='}
+RELATIONAL = {'>', '<', '>=', '<=', '!=', '=='}
+# Superinstrucción con la condición contraria
+NEGATED = {'GOTOF>': 'GOTOF<=', 'GOTOF<=': 'GOTOF>', 'GOTOF<': 'GOTOF>=', 'GOTOF>=': 'GOTOF<',
+           'GOTOF==': 'GOTOF!=', 'GOTOF!=': 'GOTOF=='}
+# Cuádruplos cuyo destino (res) es un ip
+JUMPS = {'GOTO', 'GOTOF', 'GOSUB'} | set(FUSED_BRANCHES)
+# Una función con alguno de estos no se copia en línea
+NOT_INLINABLE = {'ERA', 'PARAMETER', 'GOSUB', 'RETVAL', 'ALLOC', 'ENDFUNC', 'END'}
+
+# Campos que son direcciones de memoria, por operador
+_A1_ADDR = BINARY | set(FUSED_BRANCHES) | {'UMINUS', '=', 'PRINT', 'GOTOF', 'PARAMETER', 'RETURN', 'VER',
+                                           'LOADIDX', 'STOREIDX'}
+_A2_ADDR = BINARY | set(FUSED_BRANCHES) | {'LOADIDX', 'STOREIDX'}
+_RES_ADDR = BINARY | {'UMINUS', '=', 'RETVAL', 'LOADIDX', 'STOREIDX', 'READ'}
+_WRITES = BINARY | {'UMINUS', '=', 'RETVAL', 'LOADIDX', 'READ'}
+
+OP_GOTO = OPCODE_OF['GOTO']
+
+
+def fingerprint(program: CompiledProgram) -> str:
+    # Huella de los cuádruplos; un perfil solo sirve para el programa que lo grabó
+    code = program.quads
+    digest = hashlib.sha256()
+    for column in (code.ops, code.arg1, code.arg2, code.res):
+        digest.update(bytes(column))
+    digest.update("\0".join(code.symbols).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class ProfileRecorder(Coverage):
+    # Cobertura (cuádruplos y saltos) más las llamadas de cada GOSUB
+
+    def __init__(self) -> None:
+        super().__init__()
+        # ip del GOSUB -> llamadas
+        self.site_calls: Dict[int, int] = {}
+        self.program = None
+
+    def on_start(self, vm) -> None:
+        super().on_start(vm)
+        self.program = vm.program
+
+    def on_call(self, vm, name: str, call_ip: int) -> None:
+        super().on_call(vm, name, call_ip)
+        self.site_calls[call_ip] = self.site_calls.get(call_ip, 0) + 1
+
+    def loops(self) -> Dict[int, List[int]]:
+        # Cabecera de cada ciclo -> [entradas, vueltas]; el regreso es un GOTO hacia atrás
+        code = self.program.quads
+        out: Dict[int, List[int]] = {}
+        for ip, op in enumerate(code.ops):
+            header = code.res[ip]
+            if op == OP_GOTO and 0 <= header < ip:
+                turns = self.counts[ip]
+                out[header] = [self.counts[header] - turns, turns]
+        return out
+
+    def profile(self) -> Dict[str, Any]:
+        code = self.program.quads
+        return {
+            "version": VERSION,
+            "program": fingerprint(self.program),
+            "counts": list(self.counts),
+            "branches": {str(ip): n for ip, n in sorted(self.branches.items())},
+            "loops": {str(ip): n for ip, n in sorted(self.loops().items())},
+            "calls": {str(ip): [code.decode(code.arg1[ip]), n] for ip, n in sorted(self.site_calls.items())},
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.profile(), f)
+
+
+def load_profile(path: str, program: CompiledProgram | None = None) -> Dict[str, Any]:
+    # Con program se revisa que el perfil sea de ese programa
+    with open(path, encoding="utf-8") as f:
+        profile = json.load(f)
+    if not isinstance(profile, dict) or profile.get("version") != VERSION:
+        raise ValueError("No es un perfil de PGO de Patito (o es de otra version)")
+    if program is not None and profile.get("program") != fingerprint(program):
+        raise ValueError("El perfil es de otro programa (o de otra compilacion)")
+    return profile
+
+
+class _Quad:
+    # Cuádruplo mientras se optimiza; los saltos apuntan a otro _Quad (target)
+    __slots__ = ("op", "a1", "a2", "res", "line", "target", "count", "branch", "loop")
+
+    def __init__(self, op: str, a1: Any, a2: Any, res: Any, line: int = 0, count: int = 0) -> None:
+        self.op, self.a1, self.a2, self.res = op, a1, a2, res
+        self.line = line
+        self.target: "_Quad | None" = None
+        # Veces que se ejecutó; [saltó, siguió] si es GOTOF; [entradas, vueltas] si es cabecera de ciclo
+        self.count = count
+        self.branch: List[int] | None = None
+        self.loop: List[int] | None = None
+
+
+class _Inlinable:
+    def __init__(self, body: List[_Quad], end: _Quad, params: List[int], returns_value: bool,
+                 reachable: Set[_Quad]) -> None:
+        self.body = body
+        self.end = end
+        self.params = params
+        # Todos los caminos terminan en un 'return' con valor
+        self.returns_value = returns_value
+        # Lo que no se alcanza (p.ej. el GOTO después de un 'return') no se copia
+        self.reachable = reachable
+        self.writes = {q.res for q in body if q.op in _WRITES}
+
+
+class Optimizer:
+    def __init__(self, program: CompiledProgram, profile: Dict[str, Any],
+                 min_count: int = HOT_COUNT, max_inline: int = MAX_INLINE_QUADS) -> None:
+        self.program = program
+        self.layout = program.layout
+        self.min_count = min_count
+        self.max_inline = max_inline
+        # Cambios hechos por cada pasada
+        self.changes: Dict[str, int] = dict.fromkeys(
+            ("llamadas en linea", "copias", "superinstrucciones", "si/sino", "ciclos rotados"), 0)
+        self.original_size = len(program.quads)
+        # Cuádruplos reemplazados -> su reemplazo (los saltos se corrigen en _retarget)
+        self._moved: Dict[_Quad, _Quad] = {}
+        # Casillas nuevas por región y (segmento, tipo)
+        self._added: Dict[int, Dict[tuple, int]] = {}
+        self._load(profile)
+
+    def _load(self, profile: Dict[str, Any]) -> None:
+        code = self.program.quads
+        n = len(code)
+        lines = code.lines.expand(n)
+        counts = profile.get("counts") or [0] * n
+        quads = [_Quad(*code[ip], line=lines[ip], count=counts[ip]) for ip in range(n)]
+        for ip, q in enumerate(quads):
+            if q.op in JUMPS:
+                target = q.res if q.res is not None else ip + 1
+                q.target = quads[target] if 0 <= target < n else None
+        for ip, branch in profile.get("branches", {}).items():
+            quads[int(ip)].branch = list(branch)
+        for ip, loop in profile.get("loops", {}).items():
+            quads[int(ip)].loop = list(loop)
+        for ip, (_name, calls) in profile.get("calls", {}).items():
+            quads[int(ip)].count = calls
+        # Inicio de cada función
+        self.entries: Dict[str, _Quad] = {
+            name: quads[info.start_quad] for name, info in self.program.functions.items()
+            if info.start_quad is not None and 0 <= info.start_quad < n
+        }
+        # Regiones: el salto al main, cada función y el main; las direcciones
+        # de marco (locales y temporales) son de su región
+        main_start = quads[0].target if quads and quads[0].op == 'GOTO' else None
+        starts: Dict[_Quad, str | None] = {q: name for name, q in self.entries.items()}
+        if main_start is not None:
+            starts[main_start] = None
+        self.regions: List[List[_Quad]] = []
+        self.region_names: List[str | None] = []
+        for q in quads:
+            if q in starts or not self.regions:
+                self.regions.append([])
+                self.region_names.append(starts.get(q))
+            self.regions[-1].append(q)
+
+    # Pasadas
+
+    def run(self) -> CompiledProgram:
+        self.inline_calls()
+        self.forward_copies()
+        self.fuse_branches()
+        self.layout_branches()
+        self.rotate_loops()
+        return self._build()
+
+    def inline_calls(self) -> None:
+        # Copia en línea las llamadas calientes a funciones pequeñas
+        bodies = {name: self._inlinable(name) for name in self.entries}
+        targeted = self._targeted()
+        for r, region in enumerate(self.regions):
+            out: List[_Quad] = []
+            i = 0
+            while i < len(region):
+                site = self._call_site(r, i, bodies, targeted)
+                if site is None:
+                    out.append(region[i])
+                    i += 1
+                    continue
+                end, seq = site
+                landing = seq[0] if seq else region[end]
+                if region[i].loop is not None and landing.loop is None:
+                    landing.loop = region[i].loop
+                for q in region[i:end]:
+                    self._moved[q] = landing
+                out.extend(seq)
+                self.changes["llamadas en linea"] += 1
+                i = end
+            self.regions[r] = out
+        self._retarget()
+
+    def _inlinable(self, name: str) -> _Inlinable | None:
+        index = self.region_names.index(name) if name in self.region_names else -1
+        if index < 0:
+            return None
+        region = self.regions[index]
+        body, end = region[:-1], region[-1]
+        if end.op != 'ENDFUNC' or len(body) > self.max_inline or any(q.op in NOT_INLINABLE for q in body):
+            return None
+        inside = set(body)
+        if any(q.target is not None and q.target not in inside and q.target is not end for q in body):
+            return None
+        params = [addr for _pname, _ptype, addr in self.program.functions[name].parameters]
+        # Casillas con valor seguro a la entrada de cada cuádruplo (None = no se llega)
+        position = {q: k for k, q in enumerate(body)}
+        position[end] = len(body)
+        assigned: List[Set[Any] | None] = [None] * (len(body) + 1)
+        assigned[0] = set(params)
+        changed = True
+        while changed:
+            changed = False
+            for k, q in enumerate(body):
+                if assigned[k] is None:
+                    continue
+                out = assigned[k] | {q.res} if q.op in _WRITES else assigned[k]
+                follow = []
+                if q.op != 'RETURN' and q.op != 'GOTO':
+                    follow.append(k + 1)
+                if q.target is not None:
+                    follow.append(position[q.target])
+                for s in follow:
+                    new = out if assigned[s] is None else assigned[s] & out
+                    if new != assigned[s]:
+                        assigned[s] = new
+                        changed = True
+        # Una local sin asignar valdría 0 en un marco nuevo pero no en el de
+        # quien llama: no se copia
+        for k, q in enumerate(body):
+            if assigned[k] is not None and any(self._in_frame(a) and a not in assigned[k] for a in _reads(q)):
+                return None
+        returns_value = assigned[len(body)] is None and all(q.a1 is not None for q in body if q.op == 'RETURN')
+        reachable = {q for k, q in enumerate(body) if assigned[k] is not None}
+        return _Inlinable(body, end, params, returns_value, reachable)
+
+    def _call_site(self, r: int, i: int, bodies: Dict[str, _Inlinable | None], targeted: Set[_Quad]):
+        # ERA f, PARAMETER..., GOSUB f [, RETVAL f]; regresa (fin, cuádruplos que lo reemplazan)
+        region = self.regions[r]
+        era = region[i]
+        callee = bodies.get(era.res) if era.op == 'ERA' else None
+        if callee is None:
+            return None
+        j = i + 1
+        args = []
+        while j < len(region) and region[j].op == 'PARAMETER':
+            args.append(region[j].a1)
+            j += 1
+        if j >= len(region) or region[j].op != 'GOSUB' or region[j].a1 != era.res:
+            return None
+        gosub = region[j]
+        j += 1
+        dest = None
+        if j < len(region) and region[j].op == 'RETVAL' and region[j].a1 == era.res:
+            dest = region[j].res
+            j += 1
+            # 'RETVAL f t; = t x': los 'return' asignan directo a x
+            copy = region[j] if j < len(region) else None
+            if (copy is not None and copy.op == '=' and copy.a1 == dest and self._in_frame(dest)
+                    and copy not in targeted and self._frame_uses(region).get(dest) == 2):
+                dest = copy.res
+                j += 1
+        if (j >= len(region) or len(args) != len(callee.params) or gosub.count < self.min_count
+                or (dest is not None and not callee.returns_value)
+                or any(q in targeted for q in region[i + 1:j])):
+            return None
+        # Parte de las ejecuciones del cuerpo que le tocan a esta llamada
+        total = callee.body[0].count if callee.body else 0
+        share = min(1.0, gosub.count / total) if total else 1.0
+        try:
+            seq = self._expand(callee, args, dest, region[j], r, gosub, share)
+        except _NoRoom:
+            return None
+        return j, seq
+
+    def _expand(self, callee: _Inlinable, args: List[Any], dest: Any, after: _Quad, r: int,
+                gosub: _Quad, share: float) -> List[_Quad]:
+        # El cuerpo con las direcciones de marco de la función cambiadas por
+        # casillas nuevas de quien llama; 'return' asigna a dest y salta a after
+        fresh = self._allocator(r)
+        mapping: Dict[int, Any] = {}
+        seq: List[_Quad] = []
+        for param, arg in zip(callee.params, args):
+            if param not in callee.writes and arg not in callee.writes:
+                # El parámetro no cambia: se usa el argumento directo
+                mapping[param] = arg
+            else:
+                mapping[param] = fresh(param)
+                seq.append(_Quad('=', arg, None, mapping[param], gosub.line, gosub.count))
+
+        def rename(addr: Any) -> Any:
+            if not self._in_frame(addr):
+                return addr
+            if addr not in mapping:
+                mapping[addr] = fresh(addr)
+            return mapping[addr]
+
+        # Primer cuádruplo nuevo de cada uno del cuerpo (None si no dejó ninguno)
+        first: Dict[_Quad, _Quad | None] = {}
+        copies: List[tuple] = []
+        last = callee.body[-1] if callee.body else None
+        for q in callee.body:
+            start = len(seq)
+            if q not in callee.reachable:
+                first[q] = None
+                continue
+            count = int(q.count * share)
+            if q.op == 'RETURN':
+                if dest is not None:
+                    seq.append(_Quad('=', rename(q.a1), None, dest, q.line, count))
+                if q is not last:
+                    jump = _Quad('GOTO', None, None, None, q.line, count)
+                    jump.target = after
+                    seq.append(jump)
+            else:
+                new = _Quad(q.op, rename(q.a1) if q.op in _A1_ADDR else q.a1,
+                            rename(q.a2) if q.op in _A2_ADDR else q.a2,
+                            rename(q.res) if q.op in _RES_ADDR else q.res, q.line, count)
+                if q.branch is not None:
+                    new.branch = [int(n * share) for n in q.branch]
+                if q.loop is not None:
+                    new.loop = [int(n * share) for n in q.loop]
+                copies.append((q, new))
+                seq.append(new)
+            first[q] = seq[start] if len(seq) > start else None
+        # Un cuádruplo que no dejó nada lleva al siguiente que sí
+        landing: Dict[_Quad, _Quad] = {callee.end: after}
+        following = after
+        for q in reversed(callee.body):
+            following = first[q] or following
+            landing[q] = following
+        for q, new in copies:
+            if q.target is not None:
+                new.target = landing[q.target]
+        return seq
+
+    def forward_copies(self) -> None:
+        # 'op a b t; = t x' -> 'op a b x' si t solo aparece en esos dos cuádruplos
+        # (local o temporal: su valor no se lee en ningún otro lado)
+        targeted = self._targeted()
+        for r, region in enumerate(self.regions):
+            uses = self._frame_uses(region)
+            out: List[_Quad] = []
+            for q in region:
+                prev = out[-1] if out else None
+                if q.op == '=' and q.a1 == q.res and q not in targeted:
+                    # 'x = x' que deja un 'return' copiado en línea
+                    self.changes["copias"] += 1
+                    continue
+                if (q.op == '=' and prev is not None and prev.op in _WRITES and prev.res == q.a1
+                        and self._in_frame(q.a1) and uses.get(q.a1) == 2
+                        and q not in targeted and q.count >= self.min_count):
+                    prev.res = q.res
+                    self.changes["copias"] += 1
+                    continue
+                out.append(q)
+            self.regions[r] = out
+
+    def fuse_branches(self) -> None:
+        # 'op a b t; GOTOF t L' -> 'GOTOFop a b L' si t solo aparece en esos dos
+        targeted = self._targeted()
+        for r, region in enumerate(self.regions):
+            uses = self._frame_uses(region)
+            out: List[_Quad] = []
+            for q in region:
+                prev = out[-1] if out else None
+                if (q.op == 'GOTOF' and prev is not None and prev.op in RELATIONAL and prev.res == q.a1
+                        and self._in_frame(q.a1) and uses.get(q.a1) == 2
+                        and q not in targeted and q.count >= self.min_count):
+                    prev.op = 'GOTOF' + prev.op
+                    prev.res = None
+                    prev.target, prev.branch = q.target, q.branch
+                    self.changes["superinstrucciones"] += 1
+                    continue
+                out.append(q)
+            self.regions[r] = out
+
+    def layout_branches(self) -> None:
+        # si/sino: 'GOTOF E; si; GOTO F; E: sino; F:'. El bloque de en medio
+        # paga el GOTO; si es el camino común se invierte la condición y pasa al final
+        for region in self.regions:
+            for i, g in enumerate(region):
+                if (g.op in FUSED_BRANCHES and g.branch is not None and g.count >= self.min_count
+                        and g.branch[1] > g.branch[0]):
+                    self._swap_if_else(region, i)
+
+    def _swap_if_else(self, region: List[_Quad], i: int) -> None:
+        g = region[i]
+        position = {q: k for k, q in enumerate(region)}
+        e = position.get(g.target, -1)
+        if e <= i + 2 or region[e - 1].op != 'GOTO':
+            return
+        goto = region[e - 1]
+        end = position.get(goto.target, -1)
+        if end <= e:
+            return
+        then_block, else_block = region[i + 1:e - 1], region[e:end]
+        # Nadie salta a los bloques desde fuera de su propio bloque (salvo el GOTOF al 'sino')
+        then_set, else_set = set(then_block), set(else_block)
+        for k, q in enumerate(region):
+            if q.target in then_set and not i < k < e - 1:
+                return
+            if q.target in else_set and not (e <= k < end or (k == i and q.target is region[e])):
+                return
+        g.op = NEGATED[g.op]
+        g.target = then_block[0]
+        g.branch = [g.branch[1], g.branch[0]]
+        region[i + 1:end] = else_block + [goto] + then_block
+        self.changes["si/sino"] += 1
+
+    def rotate_loops(self) -> None:
+        # 'H: cond; GOTOFop L; cuerpo; GOTO H; L:' ->
+        # 'GOTO H; B: cuerpo; H: cond; GOTOF(no op) B; L:'. Cada vuelta ahorra el
+        # GOTO de regreso y cada entrada paga uno; conviene con 2 vueltas o más
+        for region in self.regions:
+            i = 0
+            while i < len(region):
+                h = region[i]
+                if h.loop is not None and h.loop[1] >= self.min_count and h.loop[1] >= 2 * max(h.loop[0], 1):
+                    i = self._rotate(region, i)
+                i += 1
+
+    def _rotate(self, region: List[_Quad], i: int) -> int:
+        h = region[i]
+        k = i
+        while k < len(region) and region[k].op not in JUMPS and region[k].op != 'RETURN':
+            k += 1
+        if k >= len(region) or region[k].op not in FUSED_BRANCHES:
+            return i
+        g = region[k]
+        position = {q: n for n, q in enumerate(region)}
+        x = position.get(g.target, -1)
+        if x <= k + 2 or region[x - 1].op != 'GOTO' or region[x - 1].target is not h:
+            return i
+        back = region[x - 1]
+        cond, body = region[i:k], region[k + 1:x - 1]
+        inner = set(cond) | set(body) | {g, back}
+        # Solo se entra por la cabecera (desde fuera) y solo el GOTO de regreso salta a ella desde dentro
+        if any(q.op == 'ENDFUNC' for q in body):
+            return i
+        for n, q in enumerate(region):
+            if q.target is None:
+                continue
+            if i <= n < x:
+                if q.target is h and q is not back:
+                    return i
+            elif q.target in inner and q.target is not h:
+                return i
+        entries, turns = h.loop
+        entry = _Quad('GOTO', None, None, None, h.line, entries)
+        entry.target = h
+        for other in self.regions:
+            for q in other:
+                if q.target is h and q is not back:
+                    q.target = entry
+                elif q.target is back:
+                    # Lo que iba al GOTO de regreso ahora sigue derecho a la condición
+                    q.target = h
+        for name, q in self.entries.items():
+            if q is h:
+                self.entries[name] = entry
+        g.op = NEGATED[g.op]
+        g.target = body[0]
+        if g.branch is not None:
+            g.branch = [g.branch[1], g.branch[0]]
+        h.loop = None
+        region[i:x] = [entry] + body + cond + [g]
+        self.changes["ciclos rotados"] += 1
+        # Se sigue por el cuerpo, que puede tener ciclos anidados
+        return i
+
+    # Auxiliares
+
+    def _in_frame(self, addr: Any) -> bool:
+        # Local o temporal (del marco de la región)
+        return isinstance(addr, int) and self.layout.local_min <= addr < self.layout.const_min
+
+    def _frame_uses(self, region: List[_Quad]) -> Dict[int, int]:
+        uses: Dict[int, int] = {}
+        for q in region:
+            for addr in _fields(q):
+                if self._in_frame(addr):
+                    uses[addr] = uses.get(addr, 0) + 1
+        return uses
+
+    def _targeted(self) -> Set[_Quad]:
+        targeted = {q.target for region in self.regions for q in region if q.target is not None}
+        return targeted | set(self.entries.values())
+
+    def _retarget(self) -> None:
+        if not self._moved:
+            return
+
+        def final(q: _Quad) -> _Quad:
+            while q in self._moved:
+                q = self._moved[q]
+            return q
+
+        for region in self.regions:
+            for q in region:
+                if q.target is not None:
+                    q.target = final(q.target)
+        for name, q in self.entries.items():
+            self.entries[name] = final(q)
+        self._moved.clear()
+
+    def _allocator(self, r: int) -> Callable[[int], int]:
+        # Casillas nuevas en el marco de la región r, del mismo segmento y tipo que addr
+        layout = self.layout
+        added = self._added.setdefault(r, {})
+        taken: Dict[tuple, int] = {}
+        for q in self.regions[r]:
+            for addr in _fields(q):
+                if self._in_frame(addr):
+                    seg, tipo, offset = layout.decode(addr)
+                    taken[(seg, tipo)] = max(taken.get((seg, tipo), 0), offset + 1)
+
+        def fresh(addr: int) -> int:
+            seg, tipo, _offset = layout.decode(addr)
+            key = (seg, tipo)
+            offset = taken.get(key, 0) + added.get(key, 0)
+            if offset >= layout.size(seg):
+                raise _NoRoom()
+            added[key] = added.get(key, 0) + 1
+            return layout.base(seg, tipo) + offset
+        return fresh
+
+    def _build(self) -> CompiledProgram:
+        code = [q for region in self.regions for q in region]
+        position = {q: ip for ip, q in enumerate(code)}
+        for q in code:
+            if q.target is not None:
+                q.res = position[q.target]
+        quads = QuadStore.from_quads([(q.op, q.a1, q.a2, q.res) for q in code])
+        quads.lines = LineTable.from_lines([q.line for q in code])
+        functions = {}
+        for name, info in self.program.functions.items():
+            changes: Dict[str, Any] = {}
+            if name in self.entries:
+                changes["start_quad"] = position[self.entries[name]]
+            if name in self.region_names:
+                # Las casillas que dejaron las funciones copiadas en línea
+                added = self._added.get(self.region_names.index(name), {})
+                locals_size, temps_size = dict(info.locals_size), dict(info.temps_size)
+                for (seg, tipo), n in added.items():
+                    sizes = locals_size if seg == SEG_LOCAL else temps_size if seg == SEG_TEMP else None
+                    if sizes is not None:
+                        sizes[tipo] = sizes.get(tipo, 0) + n
+                changes.update(locals_size=locals_size, temps_size=temps_size)
+            functions[name] = dataclasses.replace(info, **changes)
+        return CompiledProgram(
+            quads=quads,
+            const_by_addr=self.program.const_by_addr,
+            functions=MappingProxyType(functions),
+            layout=self.layout,
+            links=link_calls(quads, functions),
+        )
+
+    def report(self) -> str:
+        done = ", ".join(f"{name} {n}" for name, n in self.changes.items())
+        return f"PGO: {done} ({self.original_size} -> {sum(map(len, self.regions))} cuadruplos)"
+
+
+class _NoRoom(Exception):
+    """No quedan casillas del segmento para copiar la función en línea."""
+
+
+def optimize(program: CompiledProgram, profile: Dict[str, Any],
+             min_count: int = HOT_COUNT, max_inline: int = MAX_INLINE_QUADS) -> CompiledProgram:
+    return Optimizer(program, profile, min_count, max_inline).run()
+
+
+def _reads(q: _Quad) -> List[Any]:
+    out = []
+    if q.op in _A1_ADDR:
+        out.append(q.a1)
+    if q.op in _A2_ADDR:
+        out.append(q.a2)
+    if q.op == 'STOREIDX':
+        out.append(q.res)
+    return out
+
+
+def _fields(q: _Quad) -> List[Any]:
+    # Todas las direcciones del cuádruplo (leídas y escritas)
+    out = _reads(q)
+    if q.op in _WRITES:
+        out.append(q.res)
+    return out
@@ -0,0 +1,148 @@
+# Perfilador por muestreo para programas Patito.
+#   profiler = Profiler(interval_ms=1.0)          # con la señal SIGPROF (tiempo de CPU)
+#   profiler = Profiler(every_steps=10_000)       # cada N cuádruplos ejecutados
+#   VirtualMachine.from_program(program, hooks=[profiler]).run()
+#   profiler.write_collapsed("perfil.folded")     # para flamegraph.pl, inferno, speedscope
+#   print(profiler.report())                      # por función y por línea
+# Cada muestra guarda el ip y la pila de llamadas de la VM (call_stack); las
+# líneas se buscan al final en la tabla de líneas del programa (line_table).
+# Es un gancho de la VM (ver vm_hooks.py). Con el temporizador solo usa
+# on_start/on_finish, así que la VM corre con su ciclo normal y el JIT: el
+# manejador de la señal lee el ip de la variable local del ciclo y perfilar
+# solo cuesta lo de cada muestra. Dentro de una traza del JIT la muestra cae
+# en el GOTO de regreso, que es de la línea del ciclo. Con every_steps es un
+# on_quad cada N cuádruplos en el ciclo instrumentado, sin JIT: las muestras
+# son reproducibles pero la corrida es más lenta.
+
+import signal
+import threading
+from typing import Any, Dict, List, Tuple
+
+from vm_hooks import Hooks
+
+# Raíz de todas las pilas
+MAIN = "main"
+
+# Pila de llamadas de la VM: (ip de regreso, función) por cada llamada activa
+CallStack = Tuple[Tuple[int, str], ...]
+
+
+class Profiler(Hooks):
+    def __init__(self, interval_ms: float | None = 1.0, every_steps: int | None = None) -> None:
+        if every_steps is not None:
+            if every_steps <= 0:
+                raise ValueError("every_steps debe ser positivo")
+            interval_ms = None
+        elif interval_ms is None or interval_ms <= 0:
+            raise ValueError("Se necesita interval_ms o every_steps")
+        self.interval_ms = interval_ms
+        self.every_steps = every_steps
+        # Con el temporizador no hay on_quad y la VM no cambia de ciclo
+        self.quad_every = every_steps
+        # (pila de llamadas, ip) -> muestras
+        self.counts: Dict[Tuple[CallStack, int], int] = {}
+        self.samples = 0
+        # Muestras del temporizador que no cayeron dentro del ciclo de la VM
+        self.missed = 0
+        self._vm: Any = None
+        self._lines: Any = None
+        self._loops: Tuple[Any, ...] = ()
+        self._previous: Any = None
+
+    # Ganchos de la VM
+
+    def on_start(self, vm) -> None:
+        from VM_Patito import LOOP_CODES
+
+        self._vm = vm
+        self._lines = vm.quads.lines
+        self._loops = LOOP_CODES
+        if self.interval_ms is None:
+            return
+        if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+            raise ValueError("El muestreo por tiempo usa SIGPROF (Unix, hilo principal); usa every_steps")
+        self._previous = signal.signal(signal.SIGPROF, self._on_signal)
+        seconds = self.interval_ms / 1e3
+        signal.setitimer(signal.ITIMER_PROF, seconds, seconds)
+
+    def on_finish(self, vm) -> None:
+        if self.interval_ms is not None and self._previous is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous)
+            self._previous = None
+        self._vm = None
+
+    def _on_signal(self, _signum: int, frame: Any) -> None:
+        # Se sube por la pila de Python hasta el ciclo de la VM (la señal puede
+        # llegar dentro de print, de una traza del JIT, de _get_val, ...)
+        while frame is not None:
+            if frame.f_code in self._loops:
+                self.record(frame.f_locals["ip"], self._vm.call_stack)
+                return
+            frame = frame.f_back
+        self.missed += 1
+
+    def on_quad(self, vm, ip: int) -> None:
+        self.record(ip, vm.call_stack)
+
+    def record(self, ip: int, call_stack: List[Tuple[int, str]]) -> None:
+        key = (tuple(call_stack), ip)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.samples += 1
+
+    # Resultados
+
+    def stacks(self) -> List[Tuple[List[Tuple[str, int]], int]]:
+        # Cada pila como [(función, línea)] desde main; la línea de las
+        # funciones de abajo es la de la llamada y la de la última, la del ip
+        line_of = self._lines.line_of if self._lines is not None else (lambda ip: 0)
+        out = []
+        for (call_stack, ip), n in self.counts.items():
+            names = [MAIN] + [fname for _ret, fname in call_stack]
+            ips = [ret - 1 for ret, _fname in call_stack] + [ip]
+            out.append(([(name, line_of(at)) for name, at in zip(names, ips)], n))
+        return out
+
+    def collapsed(self, lines: bool = True) -> List[str]:
+        # Formato "main:12;fib:5;fib:5 37" de flamegraph.pl (una pila por renglón)
+        merged: Dict[str, int] = {}
+        for stack, n in self.stacks():
+            key = ";".join(f"{name}:{line}" if lines else name for name, line in stack)
+            merged[key] = merged.get(key, 0) + n
+        return [f"{key} {n}" for key, n in sorted(merged.items())]
+
+    def write_collapsed(self, path: str, lines: bool = True) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(row + "\n" for row in self.collapsed(lines))
+
+    def by_function(self) -> List[Tuple[str, int, int]]:
+        # (función, muestras propias, muestras con la función en la pila), de más a menos
+        own: Dict[str, int] = {}
+        total: Dict[str, int] = {}
+        for stack, n in self.stacks():
+            own[stack[-1][0]] = own.get(stack[-1][0], 0) + n
+            # Una recursión cuenta una sola vez por muestra
+            for name in {name for name, _line in stack}:
+                total[name] = total.get(name, 0) + n
+        return sorted(((name, own.get(name, 0), n) for name, n in total.items()), key=lambda r: (-r[2], -r[1], r[0]))
+
+    def by_line(self) -> List[Tuple[str, int, int]]:
+        # (función, línea, muestras) de la línea que se estaba ejecutando
+        own: Dict[Tuple[str, int], int] = {}
+        for stack, n in self.stacks():
+            own[stack[-1]] = own.get(stack[-1], 0) + n
+        return sorted(((name, line, n) for (name, line), n in own.items()), key=lambda r: (-r[2], r[0], r[1]))
+
+    def report(self, top: int = 15) -> str:
+        how = f"cada {self.every_steps} cuadruplos" if self.every_steps else f"cada {self.interval_ms:g} ms de CPU"
+        lines = [f"PERFIL ({self.samples} muestras, {how})"]
+        if not self.samples:
+            return "\n".join(lines)
+        lines.append(f"  {'funcion':<20} {'propio %':>9} {'total %':>9}")
+        for name, own, total in self.by_function()[:top]:
+            lines.append(f"  {name:<20} {100 * own / self.samples:9.1f} {100 * total / self.samples:9.1f}")
+        lines.append(f"  {'linea':<20} {'%':>9}")
+        for name, line, n in self.by_line()[:top]:
+            where = f"{name}:{line}" if line else f"{name}:-"
+            lines.append(f"  {where:<20} {100 * n / self.samples:9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,254 @@
+# Imagen binaria plana de un CompiledProgram, para que varios procesos
+# ejecuten el mismo programa sin recompilarlo ni deserializar los cuádruplos.
+#   image = publish(program)             # en el proceso que compila
+#   program = attach(image.name)         # en cada proceso trabajador
+#   VirtualMachine.from_program(program).run()
+#   image.close(); image.unlink()
+# También se puede escribir a un archivo y abrirlo con mmap (write_file/open_file).
+#
+# Formato (enteros little-endian, cada sección alineada a 8 bytes):
+#   encabezado: MAGIC, versión, número de secciones, (inicio, largo) de cada sección
+#   ops (B), arg1/arg2/res/links (i): columnas de cuádruplos, se usan sin copiar
+#   direcciones y valores de constantes enteras (i, q) y flotantes (i, d)
+#   line_data (B), line_cp_ip/line_cp_line/line_cp_offset (i): tabla de líneas (line_table)
+#   meta: JSON con distribución de memoria, símbolos, funciones, letreros y
+#   las constantes enteras que no caben en 64 bits
+# Al adjuntar solo se decodifican las constantes y meta; los cuádruplos (lo
+# que crece con el programa) quedan como memoryview sobre la memoria compartida.
+
+import json
+import mmap
+import multiprocessing
+import struct
+import sys
+from array import array
+from multiprocessing import shared_memory
+from types import MappingProxyType
+from typing import Any, Dict, List, Set, Tuple
+
+from compiled_program import CompiledProgram
+from intermediate import QuadStore
+from line_table import LineTable
+from memory import SegmentLayout
+from tabla_symbolos import FunctionInfo
+
+MAGIC = b"PATOIMG1"
+VERSION = 2
+SECTIONS = (
+    "ops", "arg1", "arg2", "res", "links", "int_addrs", "int_values", "float_addrs", "float_values",
+    "line_data", "line_cp_ip", "line_cp_line", "line_cp_offset", "meta",
+)
+TYPECODES = {
+    "ops": "B", "arg1": "i", "arg2": "i", "res": "i", "links": "i",
+    "int_addrs": "i", "int_values": "q", "float_addrs": "i", "float_values": "d",
+    "line_data": "B", "line_cp_ip": "i", "line_cp_line": "i", "line_cp_offset": "i", "meta": "B",
+}
+HEADER = struct.Struct(f"<8sII{2 * len(SECTIONS)}Q")
+
+# Programas ya adjuntados en este proceso: nombre -> (memoria, programa).
+# La memoria debe seguir abierta mientras existan las vistas sobre ella.
+_attached: Dict[str, Tuple[Any, CompiledProgram]] = {}
+# Nombres publicados desde este proceso
+_published: Set[str] = set()
+
+
+class ImageError(ValueError):
+    """El buffer no contiene una imagen de programa válida."""
+
+
+def _fits_q(value: int) -> bool:
+    return -2**63 <= value < 2**63
+
+
+def _sections(program: CompiledProgram) -> Dict[str, bytes]:
+    code = program.quads
+    lines = code.lines
+    ints = [(addr, val) for addr, val in program.const_by_addr.items() if type(val) is int and _fits_q(val)]
+    floats = [(addr, val) for addr, val in program.const_by_addr.items() if type(val) is float]
+    # Letreros y enteros fuera del rango de 'q' (Patito no limita el tamaño de un entero)
+    others = [(addr, val) for addr, val in program.const_by_addr.items()
+              if not (type(val) is float or type(val) is int and _fits_q(val))]
+    meta = {
+        "layout": program.layout.sizes,
+        "symbols": code.symbols,
+        "functions": [
+            [f.name, f.return_type, f.parameters, f.start_quad, f.locals_size, f.temps_size]
+            for f in program.functions.values()
+        ],
+        "constants": others,
+        "line_runs": lines.runs,
+    }
+    return {
+        "ops": bytes(array("B", code.ops)),
+        "arg1": bytes(array("i", code.arg1)),
+        "arg2": bytes(array("i", code.arg2)),
+        "res": bytes(array("i", code.res)),
+        "links": bytes(array("i", program.links)),
+        "int_addrs": bytes(array("i", [addr for addr, _ in ints])),
+        "int_values": bytes(array("q", [val for _, val in ints])),
+        "float_addrs": bytes(array("i", [addr for addr, _ in floats])),
+        "float_values": bytes(array("d", [val for _, val in floats])),
+        "line_data": bytes(lines.data),
+        "line_cp_ip": bytes(array("i", lines.cp_ip)),
+        "line_cp_line": bytes(array("i", lines.cp_line)),
+        "line_cp_offset": bytes(array("i", lines.cp_offset)),
+        "meta": json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+    }
+
+
+def encode(program: CompiledProgram) -> bytes:
+    if sys.byteorder != "little":
+        raise ImageError("Las imagenes de programa solo se generan en maquinas little-endian")
+    parts = _sections(program)
+    offset = HEADER.size
+    table: List[int] = []
+    body = bytearray()
+    for name in SECTIONS:
+        # Alineado a 8 bytes para que cast() a 'q'/'d' caiga en direcciones naturales
+        pad = -(offset + len(body)) % 8
+        body += b"\0" * pad
+        table += [offset + len(body), len(parts[name])]
+        body += parts[name]
+    return HEADER.pack(MAGIC, VERSION, len(SECTIONS), *table) + bytes(body)
+
+
+def decode(buf) -> CompiledProgram:
+    # buf: cualquier objeto con protocolo de buffer (memoria compartida, mmap, bytes)
+    view = memoryview(buf).cast("B")
+    if len(view) < HEADER.size:
+        raise ImageError("Imagen de programa truncada")
+    magic, version, count, *table = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION or count != len(SECTIONS):
+        raise ImageError("No es una imagen de programa Patito (o es de otra version)")
+    cols = {
+        name: view[start:start + length].cast(TYPECODES[name])
+        for name, start, length in zip(SECTIONS, table[0::2], table[1::2])
+    }
+    meta = json.loads(bytes(cols["meta"]).decode("utf-8"))
+
+    const_by_addr: Dict[int, Any] = dict(zip(cols["int_addrs"], cols["int_values"]))
+    const_by_addr.update(zip(cols["float_addrs"], cols["float_values"]))
+    const_by_addr.update((addr, val) for addr, val in meta["constants"])
+    functions = {}
+    for name, return_type, params, start, locals_size, temps_size in meta["functions"]:
+        functions[name] = FunctionInfo(name, return_type, [tuple(p) for p in params], start_quad=start,
+                                       locals_size=locals_size, temps_size=temps_size)
+    lines = LineTable.from_columns(cols["line_data"], cols["line_cp_ip"], cols["line_cp_line"],
+                                   cols["line_cp_offset"], meta["line_runs"])
+    quads = QuadStore.from_columns(cols["ops"], cols["arg1"], cols["arg2"], cols["res"], meta["symbols"], lines)
+    return CompiledProgram(
+        quads=quads,
+        const_by_addr=MappingProxyType(const_by_addr),
+        functions=MappingProxyType(functions),
+        layout=SegmentLayout(meta["layout"]),
+        links=cols["links"],
+    )
+
+
+class ProgramImage:
+    # Imagen publicada en multiprocessing.shared_memory; quien la publica la libera
+    def __init__(self, shm: shared_memory.SharedMemory, size: int) -> None:
+        self.shm = shm
+        self.size = size
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def unlink(self) -> None:
+        _published.discard(self.shm.name)
+        self.shm.unlink()
+
+    def __enter__(self) -> "ProgramImage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        self.unlink()
+
+
+def publish(program: CompiledProgram) -> ProgramImage:
+    data = encode(program)
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    shm.buf[:len(data)] = data
+    _published.add(shm.name)
+    return ProgramImage(shm, len(data))
+
+
+def _open_shared(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # Antes de 3.13 adjuntar registra la memoria en el resource_tracker, que la
+    # borra cuando termina su proceso. Los trabajadores de un pool comparten el
+    # tracker de quien publicó (registrar de nuevo no hace nada); solo un
+    # proceso independiente tiene uno propio y debe quitar el registro.
+    shm = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None and name not in _published:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def attach(name: str) -> CompiledProgram:
+    # Una sola vez por proceso y nombre; las siguientes llamadas regresan el mismo programa
+    cached = _attached.get(name)
+    if cached is None:
+        shm = _open_shared(name)
+        cached = _attached[name] = (shm, decode(shm.buf))
+    return cached[1]
+
+
+def attached_names() -> List[str]:
+    return list(_attached)
+
+
+def detach(name: str) -> None:
+    # Olvida un programa adjuntado; la memoria se cierra cuando ya nadie usa sus vistas
+    cached = _attached.pop(name, None)
+    if cached is None:
+        return
+    mem, program = cached
+    del program, cached
+    try:
+        mem.close()
+    except BufferError:
+        pass
+
+
+def unlink(name: str) -> None:
+    # Borra una imagen publicada por otro proceso (p.ej. un trabajador del servidor)
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def run_attached(name: str, jit: bool = True) -> Dict[str, Any]:
+    # Para usar como tarea de un pool: la tarea solo lleva el nombre de la imagen
+    from tracing_jit import DEFAULT_THRESHOLD
+    from VM_Patito import VirtualMachine
+    return VirtualMachine.from_program(attach(name), jit_threshold=DEFAULT_THRESHOLD if jit else None).run()
+
+
+def write_file(program: CompiledProgram, path: str) -> int:
+    data = encode(program)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def open_file(path: str) -> CompiledProgram:
+    # El archivo se mapea en memoria de solo lectura; el sistema comparte las páginas entre procesos
+    cached = _attached.get(path)
+    if cached is None:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        cached = _attached[path] = (mm, decode(mm))
+    return cached[1]
@@ -0,0 +1,110 @@
+# Cobertura de un programa Patito: qué cuádruplos, líneas y saltos se ejecutaron.
+#   coverage = Coverage()
+#   VirtualMachine.from_program(program, hooks=[coverage]).run()
+#   print(coverage.report())
+#   open("programa.cov", "w").write(coverage.annotate(code))   # estilo gcov
+# Es un gancho de la VM (ver vm_hooks.py): cuenta cada cuádruplo en on_quad y,
+# después de cada GOTOF (o comparación + GOTOF de pgo.py), hacia dónde se fue. Las líneas salen de la tabla de
+# líneas del programa (line_table); los cuádruplos sin línea (salto al main,
+# END) no cuentan.
+
+from array import array
+from typing import Dict, List, Tuple
+
+from intermediate import FUSED_BRANCHES, OPCODE_OF
+from vm_hooks import Hooks
+
+BRANCH_CODES = {OPCODE_OF[op] for op in ('GOTOF', *FUSED_BRANCHES)}
+
+
+class Coverage(Hooks):
+    quad_every = 1
+
+    def __init__(self) -> None:
+        # Veces que se ejecutó cada cuádruplo
+        self.counts = array('q')
+        # ip del GOTOF -> [veces que saltó, veces que siguió]
+        self.branches: Dict[int, List[int]] = {}
+        # Función -> llamadas
+        self.calls: Dict[str, int] = {}
+        self.functions: List[str] = []
+        self._res = None
+        self._lines = None
+        self._prev = -1
+
+    # Ganchos de la VM
+
+    def on_start(self, vm) -> None:
+        code = vm.quads
+        n = len(code.ops)
+        if len(self.counts) != n:
+            # Varias corridas del mismo programa se acumulan
+            self.counts = array('q', bytes(8 * n))
+            self.branches = {ip: [0, 0] for ip in range(n) if code.ops[ip] in BRANCH_CODES}
+        self._res, self._lines = code.res, code.lines
+        self.functions = list(vm.program.functions)
+        self._prev = -1
+
+    def on_quad(self, vm, ip: int) -> None:
+        self.counts[ip] += 1
+        branch = self.branches.get(self._prev)
+        if branch is not None:
+            branch[0 if ip == self._res[self._prev] else 1] += 1
+        self._prev = ip
+
+    def on_call(self, vm, name: str, call_ip: int) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    # Resultados
+
+    def line_counts(self) -> Dict[int, int]:
+        # Línea -> veces que se ejecutó (la del cuádruplo de la línea que más se ejecutó)
+        out: Dict[int, int] = {}
+        lines = self._lines.expand(len(self.counts)) if self._lines is not None else []
+        for ip, line in enumerate(lines):
+            if line:
+                out[line] = max(out.get(line, 0), self.counts[ip])
+        return out
+
+    def missed_lines(self) -> List[int]:
+        return sorted(line for line, n in self.line_counts().items() if not n)
+
+    def branch_summary(self) -> Tuple[int, int]:
+        # (direcciones de GOTOF que se tomaron, direcciones posibles)
+        taken = sum((jumped > 0) + (fell > 0) for jumped, fell in self.branches.values())
+        return taken, 2 * len(self.branches)
+
+    def report(self) -> str:
+        per_line = self.line_counts()
+        hit = sum(1 for n in per_line.values() if n)
+        quads_hit = sum(1 for n in self.counts if n)
+        taken, possible = self.branch_summary()
+        lines = ["COBERTURA"]
+        lines.append(f"  lineas {hit}/{len(per_line)} ({_pct(hit, len(per_line))}), "
+                     f"cuadruplos {quads_hit}/{len(self.counts)} ({_pct(quads_hit, len(self.counts))}), "
+                     f"saltos {taken}/{possible} ({_pct(taken, possible)})")
+        missed = self.missed_lines()
+        if missed:
+            lines.append(f"  lineas sin ejecutar: {', '.join(map(str, missed))}")
+        never = [name for name in self.functions if name not in self.calls]
+        if never:
+            lines.append(f"  funciones sin llamar: {', '.join(never)}")
+        half = [ip for ip, (jumped, fell) in sorted(self.branches.items()) if (jumped > 0) != (fell > 0)]
+        if half:
+            where = ", ".join(f"linea {self._lines.line_of(ip)}" for ip in half)
+            lines.append(f"  condiciones que solo tomaron un camino: {where}")
+        return "\n".join(lines)
+
+    def annotate(self, code: str) -> str:
+        # El código con las veces que se ejecutó cada línea; '#####' = nunca, '-' = sin cuádruplos
+        per_line = self.line_counts()
+        out = []
+        for number, text in enumerate(code.splitlines(), 1):
+            n = per_line.get(number)
+            mark = "-" if n is None else "#####" if n == 0 else str(n)
+            out.append(f"{mark:>9}:{number:>5}:{text}")
+        return "\n".join(out) + "\n"
+
+
+def _pct(part: int, whole: int) -> str:
+    return f"{100 * part / whole:.1f}%" if whole else "-"
@@ -0,0 +1,141 @@
+# Límites para ejecutar programas Patito que no son de confianza.
+#   limits = SandboxLimits.strict()                  # o SandboxLimits(max_steps=10_000, ...)
+#   program = sandbox.compile_program(code, limits)  # SourceTooLarge / CompileTimeExceeded
+#   VirtualMachine.from_program(program, limits=limits).run()
+# Cada límite en None queda desactivado. Sin límites (limits=None) la VM usa
+# su ciclo normal, que no revisa nada; con límites usa la copia del ciclo que
+# los revisa (VirtualMachine._execute_checked) y el JIT queda apagado.
+# Los errores de ejecución son subclases de VM_Patito.LimitExceeded
+# (y por lo tanto de PatitoRuntimeError); los de compilación, de
+# CompileLimitExceeded.
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterator
+
+from compile_stats import CompileStats
+from VM_Patito import (  # noqa: F401  (se reexportan para quien use el sandbox)
+    DepthLimitExceeded,
+    LimitExceeded,
+    MemoryLimitExceeded,
+    OutputLimitExceeded,
+    StepLimitExceeded,
+)
+
+
+class CompileLimitExceeded(Exception):
+    """La compilación rebasó un límite del sandbox."""
+
+
+class SourceTooLarge(CompileLimitExceeded):
+    """El código fuente es más grande que max_source_bytes."""
+
+
+class CompileTimeExceeded(CompileLimitExceeded):
+    """La compilación tardó más que max_compile_ms."""
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    # Cuádruplos ejecutados
+    max_steps: int | None = None
+    # Llamadas anidadas (profundidad de call_stack)
+    max_depth: int | None = None
+    # Memoria reservada en ejecución: locales y temporales de cada llamada
+    # activa más los elementos de los arreglos. Las variables globales y los
+    # temporales del main ya están acotados por el tamaño del código.
+    max_slots: int | None = None
+    # Bytes escritos por 'escribe' (UTF-8, con el salto de línea)
+    max_output_bytes: int | None = None
+    # Tamaño del código fuente (UTF-8)
+    max_source_bytes: int | None = None
+    # Tiempo de compilación; se revisa cada CHECK_EVERY tokens al leer y al
+    # parsear y al terminar cada fase (el servidor además tiene un respaldo)
+    max_compile_ms: float | None = None
+
+    @classmethod
+    def strict(cls) -> "SandboxLimits":
+        # Valores pensados para código enviado por usuarios
+        return cls(
+            max_steps=10_000_000,
+            max_depth=1_000,
+            max_slots=1_000_000,
+            max_output_bytes=1 << 20,
+            max_source_bytes=256 << 10,
+            max_compile_ms=2_000.0,
+        )
+
+    def tighten(self, **requested: Any) -> "SandboxLimits":
+        # Límites pedidos por un cliente: solo pueden ser más estrictos que estos
+        values: Dict[str, Any] = {}
+        for f in fields(self):
+            mine, theirs = getattr(self, f.name), requested.get(f.name)
+            if theirs is None:
+                values[f.name] = mine
+            else:
+                values[f.name] = theirs if mine is None else min(mine, theirs)
+        return SandboxLimits(**values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+@dataclass
+class CompileDeadline(CompileStats):
+    # CompileStats que además corta la compilación al pasarse de max_ms; usa
+    # los puntos de medición por fase del compilador (ver parser.parse) y,
+    # dentro del léxico y el sintáctico, compile_stats.CHECK_EVERY
+    max_ms: float | None = None
+    _phase_start: float = field(default=0.0, repr=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._phase_start = time.perf_counter()
+        with super().phase(name):
+            yield
+        if self.max_ms is not None and self.total_ms > self.max_ms:
+            raise CompileTimeExceeded(
+                f"La compilacion tardo mas de {self.max_ms:g} ms (fase {name}, {self.total_ms:.0f} ms)"
+            )
+
+    def progress_check(self) -> Callable[[str], None] | None:
+        return self._check if self.max_ms is not None else None
+
+    def _check(self, name: str) -> None:
+        # Las fases ya terminadas más lo que lleva la actual
+        elapsed = self.total_ms + (time.perf_counter() - self._phase_start) * 1e3
+        if elapsed > self.max_ms:
+            raise CompileTimeExceeded(f"La compilacion tardo mas de {self.max_ms:g} ms (fase {name}, {elapsed:.0f} ms)")
+
+
+def check_source(code: str, limits: SandboxLimits) -> None:
+    # max_source_bytes; también lo usa el servidor con los programas que ya tiene compilados
+    if limits.max_source_bytes is not None:
+        size = len(code.encode("utf-8"))
+        if size > limits.max_source_bytes:
+            raise SourceTooLarge(f"El codigo mide {size} bytes; el limite es {limits.max_source_bytes}")
+
+
+def check_compile_ms(elapsed_ms: float, limits: SandboxLimits) -> None:
+    # max_compile_ms contra una compilación ya terminada (o la que hizo el caché del servidor)
+    if limits.max_compile_ms is not None and elapsed_ms > limits.max_compile_ms:
+        raise CompileTimeExceeded(f"La compilacion tardo mas de {limits.max_compile_ms:g} ms ({elapsed_ms:.0f} ms)")
+
+
+def compile_program(code: str, limits: SandboxLimits, check_bounds: bool = True, lexer=None, frontend: str = "ply",
+                    stats: CompileDeadline | None = None):
+    # stats: para además obtener las mediciones por fase (su max_ms se toma de limits)
+    import parser as patito_parser
+
+    check_source(code, limits)
+    if stats is not None:
+        stats.max_ms = limits.max_compile_ms
+    elif limits.max_compile_ms is not None:
+        stats = CompileDeadline(track_memory=False, max_ms=limits.max_compile_ms)
+    start = time.perf_counter()
+    program = patito_parser.compile_program(code, check_bounds=check_bounds, lexer=lexer, frontend=frontend,
+                                            stats=stats)
+    # Lo que queda fuera de las fases (congelar el programa) también cuenta
+    check_compile_ms((time.perf_counter() - start) * 1e3, limits)
+    return program
@@ -15,6 +15,7 @@ reserved = {
     'sino':     'SINO',
     'nula':     'NULA',
     'return':   'RETURN',
+    'lee':      'LEE',
 }
 
 # Lista de tokens (incluye reservadas + símbolos + literales)
@@ -96,4 +97,6 @@ def t_newline(t):
 def t_error(t):
     raise SyntaxError(f"Carácter ilegal '{t.value[0]}' en línea {t.lexer.lineno}")
 
-lexer = lex.lex()
+# Las expresiones ya validadas se cargan de lextab.py (se regenera con
+# 'python parser.py' después de cambiar una regla)
+lexer = lex.lex(optimize=True, lextab='lextab')
@@ -0,0 +1,273 @@
+# Análisis semántico sobre el AST.
+# Construye el directorio de funciones y las tablas de variables (reservando
+# las direcciones de globales, parámetros y locales), resuelve cada nombre y
+# anota el tipo de cada expresión. Recorre el árbol en el mismo orden en que
+# el parser reducía las producciones, así el primer error es el mismo de antes.
+
+from typing import List
+
+from ast_nodes import (
+    Assign, AssignIndex, Binary, Block, Call, CallStmt, Const, Function, If, Index,
+    Letrero, Print, Program, Read, Return, Unary, Var, VarGroup, While, deep_nesting,
+)
+from cube_semantic import result_type, TIPO_BOOL, TIPO_ENTERO, TIPO_ERROR, TIPO_FLOTANTE
+from intermediate import alloc_global, alloc_local
+from memory import SEG_LOCAL, memory_manager
+from tabla_symbolos import FunctionDirectory, FunctionInfo, SemanticError, VariableInfo, VariableTable
+
+RELATIONAL_OPS = ('>', '<', '>=', '<=', '!=', '==')
+
+
+class SemanticAnalyzer:
+    def __init__(self) -> None:
+        self.func_dir = FunctionDirectory()
+        self.global_var_table = VariableTable()
+        # Función en contexto (para resolver ámbito local); None = global
+        self.current_func: FunctionInfo | None = None
+        # Línea del último estatuto revisado
+        self.line = 0
+        self._stmt = {
+            Assign: self._assign,
+            AssignIndex: self._assign_index,
+            If: self._if,
+            While: self._while,
+            Print: self._print,
+            Read: self._read,
+            Return: self._return,
+            CallStmt: self._call_stmt,
+            Block: self._block,
+        }
+        self._expr = {
+            Const: self._const,
+            Var: self._var,
+            Index: self._index,
+            Call: self._call_expr,
+            Unary: self._unary,
+            Binary: self._binary,
+        }
+
+    def analyze(self, program: Program) -> None:
+        program.arrays = self._declare_vars(self.global_var_table, program.vars, alloc_global)
+        with deep_nesting():
+            for fn in program.functions:
+                self._function(fn)
+            self._statements(program.body)
+
+    #  Declaraciones
+
+    def _declare_vars(self, var_table: VariableTable, groups: List[VarGroup], alloc) -> List[VariableInfo]:
+        # Reserva direcciones (rangos contiguos para arreglos) y regresa los arreglos declarados.
+        # Solo se declara el primer grupo: la gramática acepta más (', b : flotante;')
+        # pero nunca se registraron, y declararlos cambiaría el tamaño de los ERA.
+        arrays = []
+        for group in groups[:1]:
+            self.line = group.line
+            for var_name, dim in group.names:
+                if dim is not None and dim <= 0:
+                    raise SemanticError(f"El arreglo '{var_name}' debe tener tamaño positivo")
+                addr = alloc(group.tipo, dim or 1)
+                var_table.add_variable(var_name, group.tipo, addr, is_param=False, dim=dim)
+                if dim is not None:
+                    arrays.append(var_table.lookup(var_name))
+        return arrays
+
+    def _function(self, fn: Function) -> None:
+        self.line = fn.line
+        # Los locales empiezan de cero en cada función
+        memory_manager.reset_locals()
+
+        # Crear entrada de funci?n (lanza error si ya exist?a)
+        func_info = self.func_dir.add_function(fn.name, fn.return_type)
+
+        # Registrar par?metros
+        for param_name, param_type in fn.params:
+            addr = alloc_local(param_type)
+            func_info.add_parameter(param_name, param_type, addr)
+
+        self.current_func = func_info
+        fn.info = func_info
+        fn.arrays = self._declare_vars(func_info.var_table, fn.vars, alloc_local)
+        self._statements(fn.body)
+        # El tamaño se publica en FunctionInfo hasta generar el ENDFUNC (ver codegen)
+        fn.locals_usage = memory_manager.get_usage(SEG_LOCAL)
+        self.current_func = None
+
+    #  Búsqueda de nombres
+
+    def _lookup_var_info(self, name: str) -> VariableInfo:
+        if self.current_func:
+            info = self.current_func.var_table.lookup(name)
+            if info:
+                return info
+        info = self.global_var_table.lookup(name)
+        if info is None:
+            raise SemanticError(f"Variable '{name}' no declarada.")
+        return info
+
+    def _lookup_scalar(self, name: str) -> VariableInfo:
+        info = self._lookup_var_info(name)
+        if info.dim is not None:
+            raise SemanticError(f"'{name}' es un arreglo; se debe usar con indice")
+        return info
+
+    def _array_element(self, name: str, index_type: str) -> VariableInfo:
+        info = self._lookup_var_info(name)
+        if info.dim is None:
+            raise SemanticError(f"'{name}' no es un arreglo")
+        if index_type != TIPO_ENTERO:
+            raise SemanticError(f"El indice de '{name}' debe ser entero, se obtuvo {index_type}")
+        return info
+
+    #  Estatutos
+
+    def _statements(self, body) -> None:
+        for stmt in body:
+            self.line = stmt.line
+            self._stmt[type(stmt)](stmt)
+
+    def _assign(self, s: Assign) -> None:
+        expr_type = self._expr[type(s.value)](s.value)
+        var_info = self._lookup_scalar(s.name)
+        var_type = var_info.var_type
+
+        # Verificamos tipos con el cubo semántico
+        if result_type(var_type, '=', expr_type) == TIPO_ERROR:
+            raise SemanticError(
+                f"Type-mismatch en asignación a '{s.name}': "
+                f"no se puede asignar {expr_type} a {var_type}"
+            )
+        s.info = var_info
+
+    def _assign_index(self, s: AssignIndex) -> None:
+        index_type = self._expr[type(s.index)](s.index)
+        expr_type = self._expr[type(s.value)](s.value)
+        var_info = self._array_element(s.name, index_type)
+
+        if result_type(var_info.var_type, '=', expr_type) == TIPO_ERROR:
+            raise SemanticError(
+                f"Type-mismatch en asignación a '{s.name}[]': "
+                f"no se puede asignar {expr_type} a {var_info.var_type}"
+            )
+        s.info = var_info
+
+    def _if(self, s: If) -> None:
+        if self._expr[type(s.cond)](s.cond) != TIPO_BOOL:
+            raise SemanticError("La condicion de 'si' debe ser de tipo bool")
+        self._statements(s.then)
+        if s.orelse is not None:
+            self._statements(s.orelse)
+
+    def _while(self, s: While) -> None:
+        if self._expr[type(s.cond)](s.cond) != TIPO_BOOL:
+            raise SemanticError("La condicion de 'mientras' debe ser de tipo bool")
+        self._statements(s.body)
+
+    def _print(self, s: Print) -> None:
+        for item in s.items:
+            if type(item) is not Letrero:
+                self._expr[type(item)](item)
+
+    def _read(self, s: Read) -> None:
+        for target in s.targets:
+            if type(target) is Var:
+                info = self._lookup_scalar(target.name)
+                if info.var_type not in (TIPO_ENTERO, TIPO_FLOTANTE):
+                    raise SemanticError(
+                        f"Solo se pueden leer variables numericas ('{target.name}' es {info.var_type})"
+                    )
+            else:
+                index_type = self._expr[type(target.index)](target.index)
+                info = self._array_element(target.name, index_type)
+            target.info = info
+            target.tipo = info.var_type
+
+    def _return(self, s: Return) -> None:
+        expr_type = self._expr[type(s.value)](s.value) if s.value is not None else None
+        if self.current_func is None:
+            raise SemanticError("'return' solo es v?lido dentro de una funci?n")
+
+        func_info = self.current_func
+        ret_type = func_info.return_type
+        if s.value is None:  # RETURN PUNTO_Y_COMA (sin expresi?n)
+            if ret_type != 'nula':
+                raise SemanticError(f"La funci?n '{func_info.name}' debe regresar {ret_type}")
+            return
+        if ret_type == 'nula':
+            raise SemanticError("Funciones 'nula' no deben regresar valor")
+        if expr_type != ret_type:
+            raise SemanticError(f"Tipo de retorno invalido: se esperaba {ret_type}, se obtuvo {expr_type}")
+
+    def _call_stmt(self, s: CallStmt) -> None:
+        self._call(s.call)
+
+    def _block(self, s: Block) -> None:
+        self._statements(s.body)
+
+    #  Expresiones (cada una regresa su tipo)
+
+    def _const(self, e: Const) -> str:
+        return e.tipo
+
+    def _var(self, e: Var) -> str:
+        info = self._lookup_scalar(e.name)
+        e.info = info
+        e.tipo = info.var_type
+        return e.tipo
+
+    def _index(self, e: Index) -> str:
+        index_type = self._expr[type(e.index)](e.index)
+        info = self._array_element(e.name, index_type)
+        e.info = info
+        e.tipo = info.var_type
+        return e.tipo
+
+    def _call(self, c: Call) -> str:
+        arg_types = [self._expr[type(arg)](arg) for arg in c.args]
+        func_info = self.func_dir.get_function(c.name)
+        if not func_info:
+            raise SemanticError(f"Funcion '{c.name}' no declarada")
+
+        expected_params = func_info.parameters
+        if len(arg_types) != len(expected_params):
+            raise SemanticError(
+                f"Funcion '{c.name}' espera {len(expected_params)} argumentos, recibi? {len(arg_types)}"
+            )
+        for idx, (arg_type, (_pname, ptype, _paddr)) in enumerate(zip(arg_types, expected_params), start=1):
+            if arg_type != ptype:
+                raise SemanticError(f"Argumento {idx} de '{c.name}' debe ser {ptype}, se recibi? {arg_type}")
+        c.func = func_info
+        c.tipo = func_info.return_type
+        return c.tipo
+
+    def _call_expr(self, c: Call) -> str:
+        # llamada: usar valor de retorno si no es 'nula'
+        if self._call(c) == 'nula':
+            raise SemanticError("Llamada a función 'nula' no puede usarse en expresiones")
+        return c.tipo
+
+    def _unary(self, e: Unary) -> str:
+        tipo = self._expr[type(e.operand)](e.operand)
+        if e.op == '-' and tipo not in (TIPO_ENTERO, TIPO_FLOTANTE):
+            raise SemanticError(f"No se puede aplicar signo '-' a tipo {tipo}")
+        e.tipo = tipo
+        return tipo
+
+    def _binary(self, e: Binary) -> str:
+        # Las cadenas a + b + c ... cuelgan por la derecha; se recorren sin
+        # recursión para no depender del límite de Python en expresiones largas
+        chain = []
+        node = e
+        while type(node) is Binary:
+            chain.append(node)
+            self._expr[type(node.left)](node.left)
+            node = node.right
+        right_type = self._expr[type(node)](node)
+        for node in reversed(chain):
+            left_type = node.left.tipo
+            res_type = result_type(left_type, node.op, right_type)
+            if res_type == TIPO_ERROR:
+                kind = "relacional" if node.op in RELATIONAL_OPS else "aritmética"
+                raise SemanticError(f"Operación {kind} inválida: {left_type} {node.op} {right_type}")
+            node.tipo = res_type
+            right_type = res_type
+        return right_type
@@ -14,18 +14,20 @@ class SemanticError(Exception):
 class VariableInfo:
     name: str
     var_type: str         # "entero", "flotante", "bool", "letrero", etc.
-    address: int          # dirección virtual
+    address: int          # dirección virtual (la primera casilla si es arreglo)
     is_param: bool = False
+    dim: int | None = None  # número de casillas si es arreglo; None si es escalar
 
 
 class VariableTable:
     def __init__(self) -> None:
         self._vars: Dict[str, VariableInfo] = {}
 
-    def add_variable(self, name: str, var_type: str, address: int, is_param: bool = False) -> None:
+    def add_variable(self, name: str, var_type: str, address: int, is_param: bool = False,
+                     dim: int | None = None) -> None:
         if name in self._vars:
             raise SemanticError(f"Variable '{name}' declarada más de una vez en el mismo ámbito.")
-        self._vars[name] = VariableInfo(name=name, var_type=var_type, address=address, is_param=is_param)
+        self._vars[name] = VariableInfo(name=name, var_type=var_type, address=address, is_param=is_param, dim=dim)
 
     def lookup(self, name: str) -> Optional[VariableInfo]:
         return self._vars.get(name)
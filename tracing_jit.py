@@ -0,0 +1,298 @@
+# JIT de trazas para ciclos calientes de VirtualMachine.
+# La VM avisa cada vez que ejecuta un GOTO hacia atras (regreso de un ciclo;
+# en un ciclo rotado por pgo.py es el salto de una comparacion + GOTOF).
+# Cuando un ciclo se vuelve caliente se graba una iteracion (los cuadruplos
+# que realmente se ejecutan), se compila a una funcion de Python con guardas
+# sobre el resultado de cada GOTOF y sobre los tipos de las variables que
+# entran al ciclo, y se ejecuta esa funcion hasta que una guarda falla.
+
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from intermediate import FUSED_BRANCHES
+from memory import ARRAY_TYPECODES, SegmentLayout
+
+
+BINARY_OPS = ('+', '-', '*', '/', '>', '<', '>=', '<=', '!=', '==')
+# Operadores que se pueden grabar; cualquier otro cancela la traza
+TRACEABLE_OPS = set(BINARY_OPS) | set(FUSED_BRANCHES) | {
+    'UMINUS', '=', 'PRINT', 'GOTOF', 'GOTO', 'VER', 'LOADIDX', 'STOREIDX', 'READ',
+}
+
+DEFAULT_THRESHOLD = 50
+MAX_TRACE_LENGTH = 1000
+
+# Una entrada grabada: (ip, resultado del GOTOF o None)
+TraceStep = Tuple[int, bool | None]
+
+
+class TracingJit:
+    def __init__(self, quads: List[Tuple[Any, Any, Any, Any]], const_by_addr: Dict[int, Any],
+                 layout: SegmentLayout, threshold: int = DEFAULT_THRESHOLD):
+        self.quads = quads
+        self.const_by_addr = const_by_addr
+        self.layout = layout
+        self.threshold = threshold
+        # Cabecera de ciclo -> veces que se regresó a ella
+        self.counters: Dict[int, int] = {}
+        # Cabecera de ciclo -> traza compilada
+        self.traces: Dict[int, Callable[[Dict[int, Any], Dict[int, Any]], int]] = {}
+        # Ciclos que no se pueden grabar (llamadas, ciclos anidados, etc.)
+        self.blacklist: Set[int] = set()
+        # Cabecera -> ip de salida normal del ciclo (después del GOTO de regreso)
+        self.loop_exits: Dict[int, int] = {}
+        # (cabecera, ip de salida) -> salidas laterales por esa guarda
+        self.side_exits: Dict[Tuple[int, int], int] = {}
+
+    def back_edge(self, vm, header: int) -> int:
+        #Se llama desde el GOTO hacia atras; regresa el ip donde debe seguir la VM
+        trace = self.traces.get(header)
+        if trace is not None:
+            return self._enter(vm, header, trace)
+        if header in self.blacklist:
+            return header
+        count = self.counters.get(header, 0) + 1
+        self.counters[header] = count
+        if count < self.threshold:
+            return header
+
+        ip, steps, entry_types = self._record(vm, header)
+        if steps is None:
+            self.blacklist.add(header)
+            return ip
+        self.loop_exits[header] = steps[-1][0] + 1
+        trace = self._compile(vm, header, steps, entry_types)
+        self.traces[header] = trace
+        return self._enter(vm, header, trace)
+
+    def _enter(self, vm, header: int, trace) -> int:
+        exit_ip = trace(vm.global_mem, vm.frames[-1])
+        if exit_ip == header:
+            # Falló una guarda de tipo: se descarta y se vuelve a grabar más tarde
+            self._discard(header)
+        elif exit_ip != self.loop_exits[header]:
+            # Salida lateral (el si/sino tomó el otro camino); si se repite mucho
+            # el camino grabado ya no es el común y se vuelve a grabar
+            key = (header, exit_ip)
+            count = self.side_exits.get(key, 0) + 1
+            self.side_exits[key] = count
+            if count >= self.threshold:
+                self._discard(header)
+        return exit_ip
+
+    def _discard(self, header: int) -> None:
+        del self.traces[header]
+        self.counters[header] = 0
+        for key in [k for k in self.side_exits if k[0] == header]:
+            del self.side_exits[key]
+
+    #  Grabación
+
+    def _record(self, vm, header: int):
+        #Ejecuta una iteración del ciclo grabando los cuadruplos; si algo no se puede
+        #grabar regresa (ip actual, None, None) con la VM en un estado consistente.
+        steps: List[TraceStep] = []
+        entry_types: Dict[int, type] = {}
+        written: Set[int] = set()
+        ip = header
+        const_min = self.layout.const_min
+
+        def read(addr: int) -> Any:
+            val = vm._get_val(addr)
+            if addr < const_min and addr not in written and addr not in entry_types:
+                entry_types[addr] = type(val)
+            return val
+
+        while True:
+            if len(steps) >= MAX_TRACE_LENGTH:
+                return ip, None, None
+            op, a1, a2, res = self.quads[ip]
+            if op not in TRACEABLE_OPS:
+                return ip, None, None
+
+            if op in BINARY_OPS:
+                v1, v2 = read(a1), read(a2)
+                out = _apply(op, v1, v2)
+                vm._write(res, out)
+                written.add(res)
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'UMINUS':
+                vm._write(res, -read(a1))
+                written.add(res)
+                steps.append((ip, None))
+                ip += 1
+            elif op == '=':
+                vm._write(res, read(a1))
+                written.add(res)
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'PRINT':
+                print(read(a1))
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'READ':
+                vm._write(res, vm._read_value(res))
+                written.add(res)
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'VER':
+                if not 0 <= read(a1) < res:
+                    # La VM reporta el error al ejecutar el VER
+                    return ip, None, None
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'LOADIDX':
+                buf = vm._which_mem(a1)[a1]
+                vm._write(res, buf[read(a2)])
+                written.add(res)
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'STOREIDX':
+                buf = vm._which_mem(res)[res]
+                val = read(a1)
+                buf[read(a2)] = val if buf.typecode == 'd' else int(val)
+                steps.append((ip, None))
+                ip += 1
+            elif op == 'GOTOF':
+                cond = read(a1)
+                taken = not cond
+                steps.append((ip, taken))
+                ip = int(res) if taken else ip + 1
+            elif op in FUSED_BRANCHES:
+                # Comparación + GOTOF de pgo.py; hacia atrás cierra un ciclo rotado
+                taken = not _apply(FUSED_BRANCHES[op], read(a1), read(a2))
+                target = int(res)
+                steps.append((ip, taken))
+                if taken and target <= ip:
+                    if target == header:
+                        return header, steps, entry_types
+                    return ip, None, None
+                ip = target if taken else ip + 1
+            else:  # GOTO
+                target = int(res)
+                if target == header:
+                    steps.append((ip, None))
+                    return header, steps, entry_types
+                if target < ip:
+                    # Regreso de otro ciclo (anidado): no se graba
+                    return ip, None, None
+                ip = target
+
+    #  Compilación
+
+    def _compile(self, vm, header: int, steps: List[TraceStep], entry_types: Dict[int, type]):
+        names: Dict[int, str] = {}
+        const_min, local_min = self.layout.const_min, self.layout.local_min
+
+        def ref(addr: int) -> str:
+            if addr >= const_min:
+                return repr(self.const_by_addr[addr])
+            if addr not in names:
+                names[addr] = f"x{len(names)}"
+            return names[addr]
+
+        # Cuerpo: (sentencia, None) o (condición de salida, ip de salida)
+        body: List[Tuple[str, int | None]] = []
+        written: List[int] = []
+        for ip, taken in steps:
+            op, a1, a2, res = self.quads[ip]
+            if op in BINARY_OPS:
+                body.append((f"{ref(res)} = {ref(a1)} {op} {ref(a2)}", None))
+            elif op == 'UMINUS':
+                body.append((f"{ref(res)} = -{ref(a1)}", None))
+            elif op == '=':
+                body.append((f"{ref(res)} = {ref(a1)}", None))
+            elif op == 'PRINT':
+                body.append((f"print({ref(a1)})", None))
+            elif op == 'READ':
+                body.append((f"{ref(res)} = _read({res})", None))
+            elif op == 'VER':
+                # Fuera de rango: se sale y la VM reporta el error
+                body.append((f"not 0 <= {ref(a1)} < {res}", ip))
+            elif op == 'LOADIDX':
+                # El buffer del arreglo se carga una vez y se modifica en su lugar
+                body.append((f"{ref(res)} = {ref(a1)}[{ref(a2)}]", None))
+            elif op == 'STOREIDX':
+                value = ref(a1)
+                if ARRAY_TYPECODES[self.layout.type_of(res)] != 'd':
+                    value = f"int({value})"
+                body.append((f"{ref(res)}[{ref(a2)}] = {value}", None))
+            elif op == 'GOTOF':
+                # Guarda: si el GOTOF toma el otro camino se sale de la traza
+                if taken:
+                    body.append((f"{ref(a1)}", ip + 1))
+                else:
+                    body.append((f"not {ref(a1)}", int(res)))
+            elif op in FUSED_BRANCHES:
+                cond = f"{ref(a1)} {FUSED_BRANCHES[op]} {ref(a2)}"
+                if taken:
+                    body.append((cond, ip + 1))
+                else:
+                    body.append((f"not ({cond})", int(res)))
+            if (op in BINARY_OPS or op in ('UMINUS', '=', 'READ')) and res not in written:
+                written.append(res)
+
+        def mem(addr: int) -> str:
+            return "g" if addr < local_min else "f"
+
+        writeback = "; ".join(f"{mem(a)}[{a}] = {names[a]}" for a in written) or "pass"
+        carried = [a for a in entry_types if a in written]
+        invariant = [a for a in entry_types if a not in written]
+
+        # Los tipos grabados se pasan por nombre (T0, T1, ...) al espacio de la traza
+        type_names: Dict[type, str] = {}
+        for t in entry_types.values():
+            type_names.setdefault(t, f"T{len(type_names)}")
+
+        def type_check(addrs: List[int]) -> str:
+            return " or ".join(f"type({names[a]}) is not {type_names[entry_types[a]]}" for a in addrs)
+
+        lines = ["def trace(g, f):"]
+        for addr, name in names.items():
+            lines.append(f"    {name} = {mem(addr)}.get({addr}, 0)")
+        if invariant:
+            lines.append(f"    if {type_check(invariant)}:")
+            lines.append(f"        return {header}")
+        # La memoria se actualiza al salir, también si la traza lanza una excepción
+        # (división entre cero, fin de la entrada de 'lee'): la VM ve los valores vivos
+        lines.append("    try:")
+        lines.append("        while True:")
+        if carried:
+            # Las variables que cambian dentro del ciclo se revisan en cada vuelta
+            lines.append(f"            if {type_check(carried)}:")
+            lines.append(f"                return {header}")
+        for stmt, exit_ip in body:
+            if exit_ip is None:
+                lines.append(f"            {stmt}")
+            else:
+                lines.append(f"            if {stmt}:")
+                lines.append(f"                return {exit_ip}")
+        lines.append("    finally:")
+        lines.append(f"        {writeback}")
+
+        namespace: Dict[str, Any] = {name: t for t, name in type_names.items()}
+        namespace["_read"] = vm._read_value
+        exec(compile("\n".join(lines) + "\n", f"<traza {header}>", "exec"), namespace)
+        return namespace["trace"]
+
+
+def _apply(op: str, v1: Any, v2: Any) -> Any:
+    if op == '+':
+        return v1 + v2
+    if op == '-':
+        return v1 - v2
+    if op == '*':
+        return v1 * v2
+    if op == '/':
+        return v1 / v2
+    if op == '>':
+        return v1 > v2
+    if op == '<':
+        return v1 < v2
+    if op == '>=':
+        return v1 >= v2
+    if op == '<=':
+        return v1 <= v2
+    if op == '!=':
+        return v1 != v2
+    return v1 == v2
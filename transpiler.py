@@ -0,0 +1,237 @@
+# Traductor de cuadruplos a Python.
+# Reconstruye la estructura del programa a partir de los saltos que genera
+# el parser (mientras -> while, si/sino -> if/else, funciones -> def con
+# variables locales), genera codigo fuente de Python y lo carga con
+# compile/exec. Es un motor alterno a VirtualMachine con la misma salida.
+
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, List, Set, Tuple
+
+from input_reader import BufferedNumberReader
+from memory import ARRAY_TYPECODES, SegmentLayout, memory_manager
+from tabla_symbolos import FunctionDirectory
+from VM_Patito import PatitoRuntimeError, read_number
+
+
+BINARY_OPS = ('+', '-', '*', '/', '>', '<', '>=', '<=', '!=', '==')
+
+
+def _address_operands(quad: Tuple[Any, Any, Any, Any]) -> List[int]:
+    # Solo estos campos son direcciones; los demás son indices de cuadruplo o nombres
+    op, a1, a2, res = quad
+    if op in BINARY_OPS:
+        return [a1, a2, res]
+    if op in ('UMINUS', '='):
+        return [a1, res]
+    if op in ('LOADIDX', 'STOREIDX'):
+        return [a1, a2, res]
+    if op in ('PRINT', 'PARAMETER', 'GOTOF', 'VER') or (op == 'RETURN' and a1 is not None):
+        return [a1]
+    if op in ('RETVAL', 'ALLOC', 'READ'):
+        return [res]
+    return []
+
+
+class TranspileError(Exception):
+    """Los cuadruplos no tienen la forma estructurada que genera el parser."""
+
+
+class PythonTranspiler:
+    def __init__(
+        self,
+        quads: List[Tuple[Any, Any, Any, Any]],
+        const_table_map: Dict[Tuple[str, Any], int],
+        func_dir: FunctionDirectory,
+        recursion_limit: int = 10000,
+        layout: SegmentLayout | None = None,
+        input_stream: BinaryIO | None = None,
+    ):
+        self.quads = list(quads)
+        self.input_stream = input_stream
+        self.layout = layout or memory_manager.layout
+        self.func_dir = func_dir
+        self.const_by_addr: Dict[int, Any] = {addr: val for (typ, val), addr in const_table_map.items()}
+        self.recursion_limit = recursion_limit
+        # Cabeceras de ciclo: ip del inicio de la condicion -> ip del GOTO de regreso
+        self._loops: Dict[int, int] = {}
+        for i, (op, _a1, _a2, res) in enumerate(self.quads):
+            if op == 'GOTO' and res is not None and res <= i:
+                self._loops[res] = i
+        self._globals: Set[int] = set()
+        self.source = self._generate()
+
+    #  Operandos
+
+    def _name(self, addr: int) -> str:
+        if addr >= self.layout.const_min:
+            return repr(self.const_by_addr[addr])
+        if addr >= self.layout.local_min:
+            return f"v{addr}"
+        self._globals.add(addr)
+        return f"g{addr}"
+
+    @staticmethod
+    def _func_name(name: str) -> str:
+        return f"f_{name}"
+
+    #  Reconstrucción de estructuras
+
+    def _emit_range(self, start: int, end: int, lines: List[str], depth: int,
+                    loop_head: int | None = None, loop_exit: int | None = None) -> None:
+        pad = "    " * depth
+        body_start = len(lines)
+        pending_args: List[str] = []
+        ip = start
+        while ip < end:
+            if ip in self._loops and ip != loop_head:
+                back = self._loops[ip]
+                if back >= end:
+                    raise TranspileError(f"Ciclo en {ip} cruza el bloque que termina en {end}")
+                lines.append(f"{pad}while True:")
+                self._emit_range(ip, back, lines, depth + 1, loop_head=ip, loop_exit=back + 1)
+                ip = back + 1
+                continue
+
+            op, a1, a2, res = self.quads[ip]
+
+            if op in BINARY_OPS:
+                lines.append(f"{pad}{self._name(res)} = {self._name(a1)} {op} {self._name(a2)}")
+            elif op == 'UMINUS':
+                lines.append(f"{pad}{self._name(res)} = -{self._name(a1)}")
+            elif op == '=':
+                lines.append(f"{pad}{self._name(res)} = {self._name(a1)}")
+            elif op == 'PRINT':
+                lines.append(f"{pad}print({self._name(a1)})")
+            elif op == 'READ':
+                lines.append(f"{pad}{self._name(res)} = _read({self.layout.type_of(res)!r})")
+            elif op == 'ALLOC':
+                typecode = ARRAY_TYPECODES[self.layout.type_of(res)]
+                lines.append(f"{pad}{self._name(res)} = _array({typecode!r}, bytes({8 * a1}))")
+            elif op == 'VER':
+                idx = self._name(a1)
+                lines.append(f"{pad}if not 0 <= {idx} < {res}:")
+                lines.append(f"{pad}    raise _PatitoRuntimeError(f'Indice {{{idx}}} fuera de rango (0..{res - 1})')")
+            elif op == 'LOADIDX':
+                lines.append(f"{pad}{self._name(res)} = {self._name(a1)}[{self._name(a2)}]")
+            elif op == 'STOREIDX':
+                value = self._name(a1)
+                if ARRAY_TYPECODES[self.layout.type_of(res)] != 'd':
+                    value = f"int({value})"
+                lines.append(f"{pad}{self._name(res)}[{self._name(a2)}] = {value}")
+            elif op == 'ERA':
+                pending_args = []
+            elif op == 'PARAMETER':
+                pending_args.append(self._name(a1))
+            elif op == 'GOSUB':
+                call = f"{self._func_name(a1)}({', '.join(pending_args)})"
+                pending_args = []
+                nxt = self.quads[ip + 1] if ip + 1 < len(self.quads) else None
+                if nxt is not None and nxt[0] == 'RETVAL' and nxt[1] == a1:
+                    lines.append(f"{pad}{self._name(nxt[3])} = {call}")
+                    ip += 1
+                else:
+                    lines.append(f"{pad}{call}")
+            elif op == 'RETURN':
+                lines.append(f"{pad}return {self._name(a1)}" if a1 is not None else f"{pad}return")
+            elif op == 'GOTOF':
+                cond = self._name(a1)
+                target = int(res)
+                if loop_exit is not None and target == loop_exit:
+                    lines.append(f"{pad}if not {cond}:")
+                    lines.append(f"{pad}    break")
+                elif ip < target <= end:
+                    lines.append(f"{pad}if {cond}:")
+                    last_op, _, _, last_res = self.quads[target - 1]
+                    if last_op == 'GOTO' and target - 1 > ip and last_res is not None and target < last_res <= end:
+                        # si/sino: el GOTO al final del "entonces" brinca el "sino"
+                        self._emit_range(ip + 1, target - 1, lines, depth + 1)
+                        lines.append(f"{pad}else:")
+                        self._emit_range(target, int(last_res), lines, depth + 1)
+                        ip = int(last_res)
+                        continue
+                    self._emit_range(ip + 1, target, lines, depth + 1)
+                    ip = target
+                    continue
+                else:
+                    raise TranspileError(f"GOTOF en {ip} salta fuera de su bloque ({target})")
+            elif op == 'GOTO':
+                # Un GOTO al final del bloque actual no hace nada
+                if res is None or int(res) != end:
+                    raise TranspileError(f"GOTO sin estructura en {ip} -> {res}")
+            elif op in ('ENDFUNC', 'END'):
+                break
+            else:
+                raise TranspileError(f"Operador no soportado en {ip}: {op}")
+            ip += 1
+
+        if len(lines) == body_start:
+            lines.append(f"{pad}pass")
+
+    def _emit_function(self, name: str, params: List[str], start: int, end: int) -> List[str]:
+        body: List[str] = []
+        self._globals = set()
+        self._emit_range(start, end, body, 1)
+        # Locales y temporales en 0, igual que la lectura por omisión de la VM
+        used: Set[str] = set()
+        for quad in self.quads[start:end]:
+            for operand in _address_operands(quad):
+                if self.layout.local_min <= operand < self.layout.const_min:
+                    used.add(f"v{operand}")
+        header = [f"def {name}({', '.join(params)}):"]
+        if self._globals:
+            header.append("    global " + ", ".join(f"g{addr}" for addr in sorted(self._globals)))
+        for var in sorted(used - set(params)):
+            header.append(f"    {var} = 0")
+        return header + body
+
+    def _find(self, op_name: str, start: int) -> int:
+        for i in range(start, len(self.quads)):
+            if self.quads[i][0] == op_name:
+                return i
+        return len(self.quads)
+
+    def _generate(self) -> str:
+        if not self.quads or self.quads[0][0] != 'GOTO':
+            raise TranspileError("El programa debe iniciar con el GOTO a 'inicio'")
+        main_start = int(self.quads[0][3])
+        all_globals: Set[int] = set()
+        chunks: List[List[str]] = []
+
+        for finfo in self.func_dir.all_functions().values():
+            start = finfo.start_quad
+            end = self._find('ENDFUNC', start)
+            params = [f"v{paddr}" for _pname, _ptype, paddr in finfo.parameters]
+            chunks.append(self._emit_function(self._func_name(finfo.name), params, start, end))
+            all_globals |= self._globals
+
+        chunks.append(self._emit_function("_inicio", [], main_start, self._find('END', main_start)))
+        all_globals |= self._globals
+
+        lines = [f"g{addr} = 0" for addr in sorted(all_globals)]
+        for chunk in chunks:
+            lines.append("")
+            lines.extend(chunk)
+        return "\n".join(lines) + "\n"
+
+    #  Ejecución
+
+    def run(self):
+        code = compile(self.source, "<patito>", "exec")
+        reader = BufferedNumberReader(self.input_stream)
+        namespace: Dict[str, Any] = {
+            "_array": array,
+            "_PatitoRuntimeError": PatitoRuntimeError,
+            "_read": lambda tipo: read_number(reader, tipo),
+        }
+        exec(code, namespace)
+        old_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(old_limit, self.recursion_limit))
+        try:
+            namespace["_inicio"]()
+        finally:
+            sys.setrecursionlimit(old_limit)
+        return {
+            "global": {int(k[1:]): v for k, v in namespace.items() if k.startswith("g") and k[1:].isdigit()},
+            "top_frame": {},
+        }
@@ -0,0 +1,106 @@
+# Ganchos para observar una corrida de VirtualMachine sin copiar su ciclo.
+#   class Contador(Hooks):
+#       def on_call(self, vm, name, call_ip): ...
+#   VirtualMachine.from_program(program, hooks=[Contador()]).run()
+# Solo se llaman los métodos que la subclase sobreescribe. Si alguno es del
+# ciclo (on_quad, on_call, on_return, on_print, on_memory_write) la VM usa su
+# ciclo instrumentado (VirtualMachine._execute_checked, sin JIT); si no, corre
+# su ciclo normal sin ninguna revisión por cuádruplo. on_start, on_error y
+# on_finish se llaman una vez por corrida y no cambian de ciclo.
+# Sobre esta interfaz están profiler.Profiler, quad_coverage.Coverage y vm_trace.Tracer.
+
+from math import gcd
+from typing import Any, Callable, List, Sequence
+
+# Ganchos que se llaman desde el ciclo de ejecución
+LOOP_HOOKS = ("on_quad", "on_call", "on_return", "on_print", "on_memory_write")
+
+
+class Hooks:
+    # Cada cuántos cuádruplos ejecutados se llama on_quad (None = nunca)
+    quad_every: int | None = 1
+
+    def on_start(self, vm) -> None:
+        """Antes del primer cuádruplo."""
+
+    def on_error(self, vm, error: BaseException) -> None:
+        """Si la corrida termina con una excepción (antes de on_finish); vm.ip
+        es el cuádruplo donde ocurrió."""
+
+    def on_finish(self, vm) -> None:
+        """Al terminar la corrida, también si termina con error."""
+
+    def on_quad(self, vm, ip: int) -> None:
+        """Antes de ejecutar el cuádruplo ip."""
+
+    def on_call(self, vm, name: str, call_ip: int) -> None:
+        """Al entrar a una función; call_stack y frames ya incluyen la llamada."""
+
+    def on_return(self, vm, name: str, value: Any) -> None:
+        """Al salir de una función con su valor de retorno (None si no regresó nada)."""
+
+    def on_print(self, vm, value: Any) -> None:
+        """Después de que 'escribe' imprime un valor."""
+
+    def on_memory_write(self, vm, addr: int, value: Any) -> None:
+        """Después de escribir en memoria. En arreglos addr es la base más el
+        índice; en PARAMETER es del marco de la llamada en preparación."""
+
+
+def _overrides(hook: Any, name: str) -> bool:
+    method = getattr(type(hook), name, None)
+    return method is not None and method is not getattr(Hooks, name)
+
+
+def _call_all(handlers: List[Callable[..., None]]) -> Callable[..., None] | None:
+    if not handlers:
+        return None
+    if len(handlers) == 1:
+        return handlers[0]
+
+    def call_all(*args: Any) -> None:
+        for handler in handlers:
+            handler(*args)
+    return call_all
+
+
+class HookSet:
+    # Los ganchos de una VM ya combinados: un callable (o None) por evento
+    def __init__(self, hooks: Sequence[Any]) -> None:
+        self.hooks = list(hooks)
+        self.on_start = _call_all([h.on_start for h in self.hooks if _overrides(h, "on_start")])
+        self.on_error = _call_all([h.on_error for h in self.hooks if _overrides(h, "on_error")])
+        self.on_finish = _call_all([h.on_finish for h in self.hooks if _overrides(h, "on_finish")])
+        self.on_call = _call_all([h.on_call for h in self.hooks if _overrides(h, "on_call")])
+        self.on_return = _call_all([h.on_return for h in self.hooks if _overrides(h, "on_return")])
+        self.on_print = _call_all([h.on_print for h in self.hooks if _overrides(h, "on_print")])
+        self.on_memory_write = _call_all([h.on_memory_write for h in self.hooks if _overrides(h, "on_memory_write")])
+        quad = [h for h in self.hooks if _overrides(h, "on_quad") and h.quad_every]
+        # El ciclo llama on_quad cada quad_every cuádruplos; con varios ganchos
+        # de distinto periodo se usa su máximo común divisor y cada uno se
+        # llama solo en sus múltiplos
+        self.quad_every: int | None = None
+        self.on_quad: Callable[[Any, int], None] | None = None
+        if quad:
+            every = 0
+            for h in quad:
+                every = gcd(every, h.quad_every)
+            self.quad_every = every
+            if all(h.quad_every == every for h in quad):
+                self.on_quad = _call_all([h.on_quad for h in quad])
+            else:
+                self.on_quad = self._dispatch_quad(quad, every)
+        self.instrumented = any(getattr(self, name) is not None for name in LOOP_HOOKS)
+
+    @staticmethod
+    def _dispatch_quad(quad: List[Any], every: int) -> Callable[[Any, int], None]:
+        periods = [(h.on_quad, h.quad_every // every) for h in quad]
+        count = 0
+
+        def dispatch(vm: Any, ip: int) -> None:
+            nonlocal count
+            count += 1
+            for on_quad, period in periods:
+                if count % period == 0:
+                    on_quad(vm, ip)
+        return dispatch
@@ -0,0 +1,229 @@
+# Traza de ejecución en un búfer circular binario: los últimos N cuádruplos
+# ejecutados, cada uno con lo que escribió en memoria.
+#   tracer = Tracer(capacity=4096, path="traza.bin")   # se vacía a path si hay error
+#   VirtualMachine.from_program(program, hooks=[tracer]).run()
+#   tracer.dump("traza.bin")                           # o cuando se quiera
+#   python vm_trace.py traza.bin --last 50             # decodificador
+# Es un gancho de la VM (ver vm_hooks.py): on_quad anota el ip en columnas
+# binarias reservadas de antemano (array/bytearray, 'capacity' registros) y
+# on_memory_write completa el mismo registro (cada cuádruplo escribe a lo
+# más una vez). Al llenarse se sobreescribe lo más viejo; por paso no se
+# imprime ni se crea ningún objeto. Las columnas cuestan la mitad por paso
+# que empacar cada registro con struct; se empacan solo al vaciar.
+#
+# Registro en el archivo (RECORD, little-endian): ip (i), código de operación
+# (B), tipo del valor (B), dirección escrita (i, -1 = ninguna), valor (q o d
+# según el tipo).
+# Archivo: HEADER, los registros del más viejo al más nuevo y la imagen del
+# programa (program_image) para decodificarlo sin el código fuente.
+
+import argparse
+import signal
+import struct
+import sys
+import threading
+from array import array
+from typing import Any, Iterator, List, NamedTuple
+
+import program_image
+from intermediate import NO_OPERAND, OPCODES
+from vm_hooks import Hooks
+
+MAGIC = b"PATOTRZ1"
+VERSION = 1
+RECORD = struct.Struct("<iBBxxiq")
+RECORD_FLOAT = struct.Struct("<iBBxxid")
+# MAGIC, versión, tamaño de registro, registros en el archivo, cuádruplos
+# ejecutados en total, bytes de la imagen del programa
+HEADER = struct.Struct("<8sIIIQQ")
+
+# Tipo del valor escrito
+NO_VALUE, INT, FLOAT, BOOL, BIG_INT, OTHER = range(6)
+
+
+class TraceRecord(NamedTuple):
+    step: int
+    ip: int
+    op: str
+    addr: int | None
+    value: Any
+
+
+class Tracer(Hooks):
+    quad_every = 1
+
+    def __init__(self, capacity: int = 4096, path: str | None = None, dump_signal: int | None = None) -> None:
+        # capacity se redondea a potencia de 2 (el lugar de cada registro es total & mask)
+        # path: a dónde vaciar la traza si la corrida termina con error
+        # dump_signal: señal que la vacía a path sin detener la corrida (p.ej. signal.SIGUSR1)
+        if capacity <= 0:
+            raise ValueError("capacity debe ser positivo")
+        if dump_signal is not None and path is None:
+            raise ValueError("dump_signal necesita path")
+        self.capacity = 1 << (capacity - 1).bit_length()
+        self.path = path
+        self.dump_signal = dump_signal
+        n = self.capacity
+        self._mask = n - 1
+        self.ips = array('i', bytes(4 * n))
+        self.addrs = array('i', bytes(4 * n))
+        self.kinds = bytearray(n)
+        self.ints = array('q', bytes(8 * n))
+        self.floats = array('d', bytes(8 * n))
+        # Cuádruplos registrados en total; el siguiente va en total & mask
+        self.total = 0
+        # Último archivo al que se vació
+        self.dumped: str | None = None
+        self.program = None
+        self._slot = 0
+        self._previous: Any = None
+
+    # Ganchos de la VM
+
+    def on_start(self, vm) -> None:
+        self.program = vm.program
+        if self.dump_signal is not None and threading.current_thread() is threading.main_thread():
+            self._previous = signal.signal(self.dump_signal, lambda _signum, _frame: self.dump(self.path))
+
+    def on_quad(self, vm, ip: int) -> None:
+        slot = self._slot = self.total & self._mask
+        self.ips[slot] = ip
+        self.addrs[slot] = -1
+        self.kinds[slot] = NO_VALUE
+        self.total += 1
+
+    def on_memory_write(self, vm, addr: int, value: Any) -> None:
+        slot = self._slot
+        self.addrs[slot] = addr
+        kind = type(value)
+        if kind is int:
+            try:
+                self.ints[slot] = value
+                self.kinds[slot] = INT
+            except OverflowError:
+                self.kinds[slot] = BIG_INT
+        elif kind is float:
+            self.floats[slot] = value
+            self.kinds[slot] = FLOAT
+        elif kind is bool:
+            self.ints[slot] = value
+            self.kinds[slot] = BOOL
+        elif value is not None:
+            self.kinds[slot] = OTHER
+
+    def on_error(self, vm, error: BaseException) -> None:
+        if self.path is not None:
+            self.dump(self.path)
+
+    def on_finish(self, vm) -> None:
+        if self._previous is not None:
+            signal.signal(self.dump_signal, self._previous)
+            self._previous = None
+
+    # Resultados
+
+    def ordered(self) -> bytes:
+        # Los registros guardados empacados con RECORD, del más viejo al más nuevo
+        count = min(self.total, self.capacity)
+        ops = self.program.quads.ops if self.program is not None else None
+        out = bytearray(count * RECORD.size)
+        for i, slot in enumerate(range(self.total - count, self.total)):
+            slot &= self._mask
+            ip, kind = self.ips[slot], self.kinds[slot]
+            op = ops[ip] if ops is not None and 0 <= ip < len(ops) else 0
+            if kind == FLOAT:
+                RECORD_FLOAT.pack_into(out, i * RECORD.size, ip, op, kind, self.addrs[slot], self.floats[slot])
+            else:
+                value = self.ints[slot] if kind in (INT, BOOL) else 0
+                RECORD.pack_into(out, i * RECORD.size, ip, op, kind, self.addrs[slot], value)
+        return bytes(out)
+
+    def records(self) -> List[TraceRecord]:
+        return list(_decode_records(self.ordered(), self.total))
+
+    def dump(self, path: str) -> int:
+        # Escribe la traza con la imagen del programa; regresa los bytes escritos
+        records = self.ordered()
+        image = program_image.encode(self.program) if self.program is not None else b""
+        data = HEADER.pack(MAGIC, VERSION, RECORD.size, len(records) // RECORD.size, self.total, len(image))
+        with open(path, "wb") as f:
+            f.write(data + records + image)
+        self.dumped = path
+        return len(data) + len(records) + len(image)
+
+
+def _decode_records(data: bytes, total: int) -> Iterator[TraceRecord]:
+    count = len(data) // RECORD.size
+    first = total - count
+    for i in range(count):
+        ip, op, kind, addr, value = RECORD.unpack_from(data, i * RECORD.size)
+        if kind == FLOAT:
+            value = RECORD_FLOAT.unpack_from(data, i * RECORD.size)[4]
+        elif kind == BOOL:
+            value = bool(value)
+        elif kind == BIG_INT:
+            value = "<entero de mas de 64 bits>"
+        elif kind == OTHER:
+            value = "<otro valor>"
+        elif kind == NO_VALUE:
+            value = None
+        yield TraceRecord(first + i, ip, OPCODES[op], None if addr == -1 else addr, value)
+
+
+class TraceFile(NamedTuple):
+    total: int
+    records: List[TraceRecord]
+    program: Any
+
+
+def load(path: str) -> TraceFile:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError("Archivo de traza truncado")
+    magic, version, record_size, count, total, image_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError("No es una traza de Patito (o es de otra version)")
+    start = HEADER.size
+    end = start + count * RECORD.size
+    program = program_image.decode(data[end:end + image_size]) if image_size else None
+    return TraceFile(total, list(_decode_records(data[start:end], total)), program)
+
+
+def render(trace: TraceFile, last: int | None = None) -> str:
+    # Una fila por cuádruplo: paso, ip, línea, cuádruplo y lo que escribió
+    records = trace.records[-last:] if last else trace.records
+    quads = trace.program.quads if trace.program is not None else None
+    lines = [f"TRAZA: {len(records)} de {trace.total} cuadruplos ejecutados"]
+    lines.append(f"  {'paso':>10} {'ip':>6} {'linea':>5}  {'cuadruplo':<38} escritura")
+    for rec in records:
+        line = quads.lines.line_of(rec.ip) if quads is not None else 0
+        if quads is not None and rec.ip < len(quads):
+            op, a1, a2, res = quads[rec.ip]
+            text = f"({op}, {_operand(a1)}, {_operand(a2)}, {_operand(res)})"
+        else:
+            text = f"({rec.op}, ?)"
+        write = f"{rec.addr} = {rec.value}" if rec.addr is not None else ""
+        lines.append(f"  {rec.step:>10} {rec.ip:>6} {line or '-':>5}  {text:<38} {write}")
+    return "\n".join(lines)
+
+
+def _operand(value: Any) -> str:
+    return "None" if value is None or value == NO_OPERAND else str(value)
+
+
+def main(argv=None) -> None:
+    argp = argparse.ArgumentParser(description="Decodifica una traza de ejecucion de la VM Patito")
+    argp.add_argument("path", help="Archivo escrito por Tracer.dump (p.ej. con main.py --trace)")
+    argp.add_argument("--last", type=int, default=None, help="Muestra solo los ultimos N cuadruplos")
+    args = argp.parse_args(argv)
+    try:
+        trace = load(args.path)
+    except (OSError, ValueError) as e:
+        print(f"No se pudo leer la traza: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(render(trace, args.last))
+
+
+if __name__ == "__main__":
+    main()